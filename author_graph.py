@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Co-author Collaboration Graph for Robotics Paper Fetcher
+Sparse author/paper incidence and co-authorship matrices built from the library catalog
+"""
+
+from datetime import date, datetime
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+
+from library_catalog import LibraryCatalog, normalize_author
+
+
+def quarter_start(today=None):
+    """First day of the calendar quarter containing today"""
+    today = today or date.today()
+    return date(today.year, 3 * ((today.month - 1) // 3) + 1, 1)
+
+
+class CoauthorGraph:
+    """Co-authorship graph: weights[i, j] = number of papers authors i and j wrote together
+
+    The graph is derived from a papers x authors incidence matrix, so any
+    subset of papers (a category, a date window) can be re-projected
+    without touching the catalog again.
+    """
+
+    def __init__(self, author_names, normalized_names, paper_ids, published, categories, incidence):
+        self.author_names = list(author_names)
+        self.author_index = {name: i for i, name in enumerate(normalized_names)}
+        self.paper_ids = np.asarray(paper_ids, dtype=object)
+        self.published = np.asarray(published, dtype="datetime64[D]")
+        self.categories = list(categories)
+        self.incidence = sparse.csr_matrix(incidence, dtype=np.float32)
+        self._papers_by_author = None
+        self._category_masks = {}
+        self.weights = self._project(self.incidence)
+        self._communities = None
+
+    @classmethod
+    def from_catalog(cls, catalog):
+        """Load the normalized author tables and build the incidence matrix"""
+        authors = catalog.query("SELECT author_id, name, normalized_name FROM authors ORDER BY author_id")
+        author_column = {row["author_id"]: i for i, row in enumerate(authors)}
+
+        papers = catalog.query("SELECT arxiv_id, published, categories FROM papers ORDER BY rowid")
+        paper_row = {row["arxiv_id"]: i for i, row in enumerate(papers)}
+
+        rows, cols = [], []
+        for link in catalog.query("SELECT arxiv_id, author_id FROM paper_authors"):
+            i = paper_row.get(link["arxiv_id"])
+            j = author_column.get(link["author_id"])
+            if i is not None and j is not None:
+                rows.append(i)
+                cols.append(j)
+        incidence = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(len(papers), len(authors))
+        )
+        return cls(
+            [row["name"] for row in authors],
+            [row["normalized_name"] for row in authors],
+            [row["arxiv_id"] for row in papers],
+            [_parse_date(row["published"]) for row in papers],
+            [row["categories"] or "" for row in papers],
+            incidence,
+        )
+
+    @classmethod
+    def from_library(cls, output_dir):
+        with LibraryCatalog.for_library(output_dir) as catalog:
+            if catalog.count() and not catalog.query("SELECT 1 FROM paper_authors LIMIT 1"):
+                catalog.rebuild_author_index()
+            return cls.from_catalog(catalog)
+
+    @staticmethod
+    def _project(incidence):
+        """B^T B with the diagonal (papers per author) removed"""
+        weights = (incidence.T @ incidence).tocsr()
+        weights.setdiag(0)
+        weights.eliminate_zeros()
+        return weights
+
+    def _author(self, name):
+        return self.author_index.get(normalize_author(name))
+
+    @property
+    def paper_counts(self):
+        return np.asarray(self.incidence.sum(axis=0)).ravel().astype(int)
+
+    def degree(self, name=None):
+        """Number of distinct collaborators of one author, or the whole degree vector"""
+        degrees = np.diff(self.weights.indptr)
+        if name is None:
+            return degrees
+        i = self._author(name)
+        return int(degrees[i]) if i is not None else 0
+
+    def papers_of(self, name):
+        """arXiv IDs of an author's papers"""
+        i = self._author(name)
+        if i is None:
+            return []
+        if self._papers_by_author is None:
+            self._papers_by_author = self.incidence.T.tocsr()
+        matrix = self._papers_by_author
+        return list(self.paper_ids[matrix.indices[matrix.indptr[i]:matrix.indptr[i + 1]]])
+
+    def top_collaborators(self, name, k=10):
+        """Co-authors of an author ordered by number of shared papers"""
+        i = self._author(name)
+        if i is None:
+            return []
+        start, end = self.weights.indptr[i], self.weights.indptr[i + 1]
+        neighbours = self.weights.indices[start:end]
+        shared = self.weights.data[start:end]
+        order = np.argsort(-shared, kind="stable")[:k]
+        return [(self.author_names[neighbours[j]], int(shared[j])) for j in order]
+
+    def most_connected(self, k=10):
+        """Authors with the most distinct collaborators"""
+        degrees = self.degree()
+        k = min(k, len(degrees))
+        if k <= 0:
+            return []
+        top = np.argpartition(-degrees, k - 1)[:k]
+        top = top[np.argsort(-degrees[top], kind="stable")]
+        return [(self.author_names[i], int(degrees[i])) for i in top]
+
+    def communities(self, max_iterations=20):
+        """Community label per author via label propagation on the weighted graph
+
+        Each round, every author adopts the label with the highest total edge
+        weight among its neighbours (its own label counts once, which keeps
+        the synchronous update from oscillating). Computed once and cached.
+        """
+        if self._communities is None:
+            self._communities = _label_propagation(self.weights, max_iterations)
+        return self._communities
+
+    def community_stats(self, labels=None, paper_mask=None, min_size=2):
+        """Size, paper count and leading authors of each community, largest first"""
+        labels = self.communities() if labels is None else labels
+        incidence = self.incidence if paper_mask is None else self.incidence[paper_mask]
+        active = np.asarray(incidence.sum(axis=0)).ravel()
+
+        # Papers of a community = papers with at least one member author
+        n_labels = int(labels.max()) + 1 if len(labels) else 0
+        membership = sparse.csr_matrix(
+            (np.ones(len(labels), dtype=np.float32), (np.arange(len(labels)), labels)),
+            shape=(len(labels), n_labels)
+        )
+        papers_per_group = np.asarray(((incidence @ membership) > 0).sum(axis=0)).ravel()
+        sizes = np.bincount(labels[active > 0], minlength=n_labels)
+
+        stats = []
+        for label in np.flatnonzero(sizes >= min_size):
+            members = np.flatnonzero((labels == label) & (active > 0))
+            leaders = members[np.argsort(-active[members], kind="stable")[:5]]
+            stats.append({
+                "community": int(label),
+                "authors": int(sizes[label]),
+                "papers": int(papers_per_group[label]),
+                "leading_authors": [self.author_names[i] for i in leaders],
+            })
+        stats.sort(key=lambda s: (-s["papers"], -s["authors"]))
+        return stats
+
+    def paper_mask(self, category=None, since=None, until=None):
+        """Boolean mask over papers matching a category and published date window"""
+        mask = np.ones(len(self.paper_ids), dtype=bool)
+        if category:
+            if category not in self._category_masks:
+                self._category_masks[category] = np.array(
+                    [category in cats.split(", ") for cats in self.categories], dtype=bool
+                )
+            mask &= self._category_masks[category]
+        if since:
+            mask &= self.published >= np.datetime64(since, "D")
+        if until:
+            mask &= self.published <= np.datetime64(until, "D")
+        return mask
+
+    def active_groups(self, category=None, since=None, until=None, k=10):
+        """Most active collaboration groups within a category and time window
+
+        Example: graph.active_groups("cs.RO", since=quarter_start())
+        """
+        mask = self.paper_mask(category, since, until)
+        if not mask.any():
+            return []
+        sub_weights = self._project(self.incidence[mask])
+        labels = _label_propagation(sub_weights)
+        return self.community_stats(labels, paper_mask=mask)[:k]
+
+    def connected_components(self):
+        """Number of collaboration islands and each author's component label"""
+        return csgraph.connected_components(self.weights, directed=False)
+
+
+def _label_propagation(weights, max_iterations=20):
+    n = weights.shape[0]
+    labels = np.arange(n)
+    if n == 0:
+        return labels
+    adjacency = (weights + sparse.identity(n, dtype=np.float32, format="csr")).tocsr()
+    for _ in range(max_iterations):
+        one_hot = sparse.csr_matrix(
+            (np.ones(n, dtype=np.float32), (np.arange(n), labels)), shape=(n, n)
+        )
+        scores = (adjacency @ one_hot).tocsr()
+        new_labels = np.asarray(scores.argmax(axis=1)).ravel()
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+    # Compact labels to 0..k-1
+    _, labels = np.unique(labels, return_inverse=True)
+    return labels
+
+
+def _parse_date(value):
+    try:
+        return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
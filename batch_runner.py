@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Batch Runner for Robotics Paper Fetcher
+Runs saved queries concurrently under one rate limiter, deduplicating papers across queries
+"""
+
+import os
+import csv
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import arxiv
+
+from library_catalog import LibraryCatalog, parse_arxiv_id, record_from_result
+from library_layout import paper_file
+from materialize import materialize_papers, paper_id_for, select_papers, summary_template
+from query_cache import QueryCache
+from text_store import text_exists, write_text
+
+SAVED_QUERIES_FILENAME = "saved_queries.json"
+DEFAULT_MAX_RESULTS = 100
+PAGE_SIZE = 100
+# arXiv asks automated clients for one request every three seconds
+API_INTERVAL_SECONDS = 3.0
+MAX_WORKERS = 4
+
+_local = threading.local()
+
+
+class RateLimiter:
+    """Spaces calls to wait() at least `interval` seconds apart, across all threads"""
+
+    def __init__(self, interval=API_INTERVAL_SECONDS):
+        self.interval = interval
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def build_search_query(categories=(), terms=""):
+    """arXiv query for some categories and a free-text title/abstract search"""
+    queries = []
+    if categories:
+        queries.append("(" + " OR ".join(f"cat:{category}" for category in categories) + ")")
+    if terms and terms.strip():
+        queries.append(f'(ti:"{terms.strip()}" OR abs:"{terms.strip()}")')
+    return " AND ".join(queries) if queries else "cat:cs.RO"
+
+
+def search_query(saved):
+    """Query string of a saved query: its raw arXiv query, or one built from categories and terms"""
+    return saved.get("query") or build_search_query(saved.get("categories", ()), saved.get("terms", ""))
+
+
+def load_saved_queries(output_dir):
+    """Saved queries of a library: [{"name", "query" or "categories"/"terms", "max_results"}, ...]"""
+    try:
+        with open(os.path.join(output_dir, SAVED_QUERIES_FILENAME), "r", encoding="utf-8") as f:
+            return json.load(f).get("queries", [])
+    except (OSError, ValueError):
+        return []
+
+
+def save_query(output_dir, saved):
+    """Add or replace (by name) a saved query"""
+    queries = [query for query in load_saved_queries(output_dir) if query["name"] != saved["name"]]
+    queries.append(saved)
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, SAVED_QUERIES_FILENAME)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"queries": queries}, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def _client():
+    """This thread's API client, kept so pooled threads reuse its connection between runs"""
+    if getattr(_local, "client", None) is None:
+        # The shared limiter does the spacing, not the client
+        _local.client = arxiv.Client(page_size=PAGE_SIZE, delay_seconds=0)
+    return _local.client
+
+
+def collect_results(cache, queries, limiter, progress_callback=None, should_stop=None, pool=None,
+                    watermarks=None, refresh=False):
+    """Run saved queries concurrently; returns ({arxiv_id: (newest result, [query names])}, {query name: newest submission})
+
+    With watermarks ({query name: ISO submission time}) each query stops
+    at the first result submitted no later than its watermark: results
+    come newest first, so an incremental run reads only what is new. A
+    query with a watermark is read until it reaches it rather than up to
+    max_results, so a busy day cannot leave a gap below the cap.
+    """
+    log = progress_callback or (lambda message: None)
+    watermarks = watermarks or {}
+    found, newest = {}, {}
+    lock = threading.Lock()
+
+    def run(saved):
+        name = saved["name"]
+        max_results = None if watermarks.get(name) else saved.get("max_results", DEFAULT_MAX_RESULTS)
+        search = arxiv.Search(query=search_query(saved), sort_by=arxiv.SortCriterion.SubmittedDate,
+                              max_results=max_results)
+        matched = 0
+        for result in cache.results(_client(), search, refresh=refresh, limiter=limiter):
+            if should_stop and should_stop():
+                break
+            submitted = result.published.isoformat()
+            if watermarks.get(name) and submitted <= watermarks[name]:
+                break
+            arxiv_id, version = parse_arxiv_id(result.entry_id)
+            with lock:
+                held, names = found.setdefault(arxiv_id, (result, []))
+                if (version or 0) > (parse_arxiv_id(held.entry_id)[1] or 0):
+                    found[arxiv_id] = (result, names)
+                names.append(name)
+                newest[name] = max(newest.get(name, ""), submitted)
+            matched += 1
+        log(f"[BATCH] {name}: {matched} {'new ' if watermarks.get(name) else ''}results")
+
+    if pool is None:
+        with ThreadPoolExecutor(max_workers=max(1, min(MAX_WORKERS, len(queries)))) as own_pool:
+            # list() re-raises the first failure of any query
+            list(own_pool.map(run, queries))
+    else:
+        list(pool.map(run, queries))
+    return found, newest
+
+
+def run_batch(output_dir, queries, progress_callback=None, should_stop=None, download=True,
+              pool=None, limiter=None, watermarks=None, refresh=False):
+    """Run saved queries as one job; returns counts (results, unique, new, downloaded) and watermarks
+
+    Results are merged by arXiv ID before anything is written, so a paper
+    matched by several queries is cataloged, templated and downloaded
+    once and tagged with every query that found it. New papers get a
+    summary template; PDFs go through the materialize step, which skips
+    papers already held. A long-running caller passes its own thread pool
+    and limiter so connections and request spacing carry over between runs.
+    """
+    log = progress_callback or (lambda message: None)
+    limiter = limiter or RateLimiter()
+    summary_dir = os.path.join(output_dir, "summaries")
+    with LibraryCatalog.for_library(output_dir) as catalog:
+        cache = QueryCache(catalog)
+        found, newest = collect_results(cache, queries, limiter, log, should_stop, pool, watermarks, refresh)
+        total = sum(len(names) for _, names in found.values())
+        log(f"[BATCH] {total} results from {len(queries)} queries, {len(found)} unique papers "
+            f"({cache.hits} pages cached, {cache.fetches} fetched)")
+
+        records, new = [], 0
+        for arxiv_id, (result, names) in found.items():
+            existing = catalog.get_paper(arxiv_id)
+            record = record_from_result(result, existing["paper_id"] if existing else None)
+            record["paper_id"] = paper_id_for(record)
+            summary_path = paper_file(summary_dir, f"{record['paper_id']}_summary.md")
+            if not text_exists(summary_path):
+                write_text(summary_path, summary_template(record))
+            new += existing is None
+            records.append(record)
+        catalog.upsert_papers(records)
+        for record in records:
+            catalog.record_version(record["arxiv_id"], record["version"], record["paper_id"])
+        by_query = {}
+        for arxiv_id, (_, names) in found.items():
+            for name in names:
+                by_query.setdefault(name, []).append(arxiv_id)
+        for name, arxiv_ids in by_query.items():
+            catalog.tag_papers(name, arxiv_ids)
+        if records:
+            write_batch_csv(os.path.join(output_dir, "metadata.csv"), catalog, records, found)
+    log(f"[BATCH] Cataloged {len(records)} papers ({new} new)")
+
+    downloaded = 0
+    if download and not (should_stop and should_stop()):
+        papers = select_papers(output_dir, [record["arxiv_id"] for record in records])
+        if papers:
+            log(f"[BATCH] Downloading {len(papers)} PDFs")
+            downloaded = materialize_papers(output_dir, papers, progress_callback=log, should_stop=should_stop,
+                                            limiter=limiter)
+    return {"results": total, "unique": len(found), "new": new, "downloaded": downloaded, "watermarks": newest}
+
+
+def _csv_flag(value):
+    # Empty cells read back as unknown, so a re-import keeps what the catalog knows
+    return "" if value is None else bool(value)
+
+
+def write_batch_csv(path, catalog, records, found):
+    """metadata.csv for a batch run, with the queries that matched each paper
+
+    Pages, encryption and extraction come from the catalog, which may know
+    them from an earlier download; unknown values are left empty.
+    """
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["ID", "Title", "Authors", "Published", "PDF_URL", "arXiv_URL", "Abstract",
+                         "Pages", "Encrypted", "Text_Extracted", "Queries"])
+        for record in records:
+            abstract = record["abstract"] or ""
+            stored = catalog.get_paper(record["arxiv_id"]) or {}
+            writer.writerow([
+                record["paper_id"], record["title"], record["authors"], record["published"], record["pdf_url"],
+                record["entry_url"], abstract[:500] + "..." if len(abstract) > 500 else abstract,
+                "" if stored.get("pages") is None else stored["pages"],
+                _csv_flag(stored.get("encrypted")), _csv_flag(stored.get("text_extracted")),
+                "; ".join(sorted(set(found[record["arxiv_id"]][1]))),
+            ])
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Bibliography Export for Robotics Paper Fetcher
+Streams catalog records to BibTeX, RIS and EndNote files in constant memory
+"""
+
+import re
+
+from library_catalog import LibraryCatalog, paper_filter, split_authors
+
+EXPORT_FORMATS = {
+    "bibtex": {"extension": ".bib", "label": "BibTeX"},
+    "ris": {"extension": ".ris", "label": "RIS"},
+    "endnote": {"extension": ".enw", "label": "EndNote"},
+}
+
+EXPORT_COLUMNS = ["arxiv_id", "version", "title", "authors", "published",
+                  "categories", "entry_url", "pdf_url", "abstract"]
+
+BIBTEX_SPECIAL_RE = re.compile(r"([&%$#_{}])")
+
+
+def _bibtex_escape(value):
+    return BIBTEX_SPECIAL_RE.sub(r"\\\1", " ".join(str(value or "").split()))
+
+
+def _abs_url(paper):
+    return paper.get("entry_url") or f"https://arxiv.org/abs/{paper['arxiv_id']}"
+
+
+def bibtex_key(paper):
+    """Citation key: first author's surname + year + arXiv ID, unique without tracking state"""
+    authors = split_authors(paper.get("authors"))
+    surname = re.sub(r"[^A-Za-z]", "", authors[0].split()[-1]).lower() if authors else "anon"
+    year = (paper.get("published") or "")[:4]
+    return f"{surname or 'anon'}{year}_{paper['arxiv_id'].replace('/', '_')}"
+
+
+def format_bibtex(paper):
+    categories = [c for c in (paper.get("categories") or "").split(", ") if c]
+    fields = [
+        ("title", "{" + _bibtex_escape(paper.get("title")) + "}"),
+        ("author", " and ".join(_bibtex_escape(a) for a in split_authors(paper.get("authors")))),
+        ("year", (paper.get("published") or "")[:4]),
+        ("eprint", paper["arxiv_id"]),
+        ("archivePrefix", "arXiv"),
+        ("primaryClass", categories[0] if categories else ""),
+        ("url", _abs_url(paper)),
+        ("abstract", _bibtex_escape(paper.get("abstract"))),
+    ]
+    body = ",\n".join(f"  {name} = {{{value}}}" for name, value in fields if value)
+    return f"@misc{{{bibtex_key(paper)},\n{body}\n}}\n\n"
+
+
+def format_ris(paper):
+    lines = ["TY  - PREP"]
+    lines.append(f"TI  - {' '.join((paper.get('title') or '').split())}")
+    lines.extend(f"AU  - {author}" for author in split_authors(paper.get("authors")))
+    if paper.get("published"):
+        lines.append(f"PY  - {paper['published'][:4]}")
+        lines.append(f"DA  - {paper['published'].replace('-', '/')}")
+    lines.append(f"UR  - {_abs_url(paper)}")
+    if paper.get("pdf_url"):
+        lines.append(f"L1  - {paper['pdf_url']}")
+    lines.append(f"M1  - arXiv:{paper['arxiv_id']}")
+    lines.extend(f"KW  - {c}" for c in (paper.get("categories") or "").split(", ") if c)
+    if paper.get("abstract"):
+        lines.append(f"AB  - {' '.join(paper['abstract'].split())}")
+    lines.append("ER  - ")
+    return "\n".join(lines) + "\n\n"
+
+
+def format_endnote(paper):
+    lines = ["%0 Electronic Article"]
+    lines.append(f"%T {' '.join((paper.get('title') or '').split())}")
+    lines.extend(f"%A {author}" for author in split_authors(paper.get("authors")))
+    if paper.get("published"):
+        lines.append(f"%D {paper['published'][:4]}")
+    lines.append("%J arXiv")
+    lines.append(f"%M arXiv:{paper['arxiv_id']}")
+    lines.append(f"%U {_abs_url(paper)}")
+    lines.extend(f"%K {c}" for c in (paper.get("categories") or "").split(", ") if c)
+    if paper.get("abstract"):
+        lines.append(f"%X {' '.join(paper['abstract'].split())}")
+    return "\n".join(lines) + "\n\n"
+
+
+FORMATTERS = {
+    "bibtex": format_bibtex,
+    "ris": format_ris,
+    "endnote": format_endnote,
+}
+
+
+def export_papers(catalog, output_path, fmt, query=None, category=None, since=None,
+                  until=None, chunk_size=500, progress_callback=None, cancel_event=None):
+    """Stream matching catalog papers to output_path; returns the number written
+
+    Records are pulled from the catalog chunk_size at a time and written
+    straight to the file, so memory use does not grow with the export size.
+    """
+    formatter = FORMATTERS[fmt]
+    where, params = paper_filter(query, category, since, until)
+    total = catalog.count(where, params)
+    written = 0
+    with open(output_path, "w", encoding="utf-8", newline="\n") as f:
+        for paper in catalog.iter_papers(EXPORT_COLUMNS, where, params, chunk_size):
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            f.write(formatter(paper))
+            written += 1
+            if progress_callback and written % chunk_size == 0:
+                progress_callback(written, total)
+    if progress_callback:
+        progress_callback(written, total)
+    return written
+
+
+def export_library(output_dir, output_path, fmt, **filters):
+    """Open the catalog of a library directory and export it"""
+    with LibraryCatalog.for_library(output_dir) as catalog:
+        return export_papers(catalog, output_path, fmt, **filters)
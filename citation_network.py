@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Citation Network for Robotics Paper Fetcher
+Parses reference sections from extracted text and links them to papers in the local library
+"""
+
+import os
+import re
+import json
+from concurrent.futures import ProcessPoolExecutor
+from xml.sax.saxutils import escape
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+
+from library_catalog import LibraryCatalog, title_hash, normalize_title
+from library_layout import paper_file
+from text_store import read_text, text_exists
+
+NETWORK_FILENAME = "citation_network.npz"
+
+REFERENCE_HEADING_RE = re.compile(
+    r"^\s*(?:\d{1,2}\.?|[IVX]{1,4}\.)?\s*(references|bibliography|works cited|literature cited)\s*:?\s*$",
+    re.IGNORECASE | re.MULTILINE
+)
+PAGE_MARKER_RE = re.compile(r"^--- Page \d+ ---$", re.MULTILINE)
+BRACKET_REF_RE = re.compile(r"(?:^|\s)\[\d{1,3}\]\s")
+NUMBERED_REF_RE = re.compile(r"\n\s*\d{1,3}\.\s+(?=[A-Z])")
+ARXIV_REF_RE = re.compile(
+    r"(?:arxiv\s*(?:preprint)?\s*:?\s*|arxiv\.org/(?:abs|pdf)/)"
+    r"([a-z\-]+(?:\.[A-Z]{2})?/\d{7}|\d{4}\.\d{4,5})",
+    re.IGNORECASE
+)
+QUOTED_TITLE_RE = re.compile(r"[\"“”]([^\"“”]{15,300})[\"“”]")
+
+# Shorter candidates ("Introduction", "In Proc. ICRA") match too many unrelated titles
+MIN_TITLE_WORDS = 3
+
+_worker_title_index = None
+
+
+def extract_reference_section(text):
+    """Return the text following the last References/Bibliography heading"""
+    if not text:
+        return ""
+    text = PAGE_MARKER_RE.sub("", text)
+    headings = list(REFERENCE_HEADING_RE.finditer(text))
+    if headings:
+        return text[headings[-1].end():]
+    # Some extractions glue the heading onto the first entry: "References [1] ..."
+    inline = None
+    for inline in re.finditer(r"references\s*(?=\[1\]|1\.\s)", text, re.IGNORECASE):
+        pass
+    return text[inline.end():] if inline else ""
+
+
+def split_references(section):
+    """Split a reference section into individual entries"""
+    if not section.strip():
+        return []
+    # Undo hyphenation at line breaks before joining lines
+    section = re.sub(r"(\w)-\n(\w)", r"\1\2", section)
+
+    if len(BRACKET_REF_RE.findall(section)) >= 2:
+        parts = BRACKET_REF_RE.split(section)
+    elif len(NUMBERED_REF_RE.findall(section)) >= 2:
+        parts = NUMBERED_REF_RE.split(section)
+    else:
+        parts = re.split(r"\n\s*\n", section)
+        if len(parts) < 2:
+            parts = section.split("\n")
+    return [" ".join(part.split()) for part in parts if len(part.strip()) > 20]
+
+
+def reference_title_candidates(reference):
+    """Yield normalized-title hashes for the substrings of a reference that could be a title"""
+    candidates = [m.group(1) for m in QUOTED_TITLE_RE.finditer(reference)]
+    segments = [s.strip() for s in re.split(r"\.\s+", reference) if s.strip()]
+    candidates.extend(segments)
+    # Titles containing a period ("... v2. A study") span two segments
+    candidates.extend(f"{a}. {b}" for a, b in zip(segments, segments[1:]))
+
+    seen = set()
+    for candidate in candidates:
+        if len(normalize_title(candidate).split()) < MIN_TITLE_WORDS:
+            continue
+        key = title_hash(candidate)
+        if key and key not in seen:
+            seen.add(key)
+            yield key
+
+
+def match_references(text, title_index):
+    """Return the set of library arXiv IDs cited by a paper's extracted text"""
+    cited = set()
+    for reference in split_references(extract_reference_section(text)):
+        for match in ARXIV_REF_RE.finditer(reference):
+            cited.add(match.group(1))
+        for key in reference_title_candidates(reference):
+            arxiv_id = title_index.get(key)
+            if arxiv_id:
+                cited.add(arxiv_id)
+                break
+    return cited
+
+
+def _init_worker(title_index):
+    global _worker_title_index
+    _worker_title_index = title_index
+
+
+def _scan_paper(task):
+    arxiv_id, text_path = task
+    text = read_text(text_path)
+    if text is None:
+        return arxiv_id, []
+    return arxiv_id, sorted(match_references(text, _worker_title_index))
+
+
+class CitationNetwork:
+    """Sparse citation graph: adjacency[i, j] == 1 when paper i cites paper j"""
+
+    def __init__(self, node_ids, adjacency, titles=None):
+        self.node_ids = list(node_ids)
+        self.index = {arxiv_id: i for i, arxiv_id in enumerate(self.node_ids)}
+        self.adjacency = sparse.csr_matrix(adjacency, dtype=np.int8)
+        self.titles = titles or {}
+        self._cited_by = None
+        self._in_degree = None
+
+    @property
+    def cited_by_matrix(self):
+        """Transposed adjacency in CSR form, so row i lists the papers citing i"""
+        if self._cited_by is None:
+            self._cited_by = self.adjacency.T.tocsr()
+        return self._cited_by
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    @property
+    def edge_count(self):
+        return int(self.adjacency.nnz)
+
+    def in_degree(self, arxiv_id=None):
+        """Citation count of one paper, or the in-degree vector of every paper"""
+        if self._in_degree is None:
+            self._in_degree = np.diff(self.cited_by_matrix.indptr)
+        if arxiv_id is None:
+            return self._in_degree
+        i = self.index.get(arxiv_id)
+        return int(self._in_degree[i]) if i is not None else 0
+
+    def most_cited(self, k=10):
+        """Top-k papers by local in-degree"""
+        degrees = self.in_degree()
+        k = min(k, len(degrees))
+        if k <= 0:
+            return []
+        top = np.argpartition(-degrees, k - 1)[:k]
+        top = top[np.argsort(-degrees[top], kind="stable")]
+        return [(self.node_ids[i], int(degrees[i])) for i in top if degrees[i] > 0]
+
+    def references(self, arxiv_id):
+        i = self.index.get(arxiv_id)
+        if i is None:
+            return []
+        row = self.adjacency.indices[self.adjacency.indptr[i]:self.adjacency.indptr[i + 1]]
+        return [self.node_ids[j] for j in row]
+
+    def cited_by(self, arxiv_id):
+        i = self.index.get(arxiv_id)
+        if i is None:
+            return []
+        matrix = self.cited_by_matrix
+        row = matrix.indices[matrix.indptr[i]:matrix.indptr[i + 1]]
+        return [self.node_ids[j] for j in row]
+
+    def co_citation(self, arxiv_id, k=10):
+        """Papers most often cited together with arxiv_id"""
+        i = self.index.get(arxiv_id)
+        if i is None:
+            return []
+        matrix = self.cited_by_matrix
+        citing = matrix.indices[matrix.indptr[i]:matrix.indptr[i + 1]]
+        if len(citing) == 0:
+            return []
+        counts = np.asarray(self.adjacency[citing].sum(axis=0)).ravel()
+        counts[i] = 0
+        nonzero = np.flatnonzero(counts)
+        order = nonzero[np.argsort(-counts[nonzero], kind="stable")][:k]
+        return [(self.node_ids[j], int(counts[j])) for j in order]
+
+    def shortest_path(self, source_id, target_id, directed=False):
+        """Shortest chain of citations between two papers, or [] if unconnected"""
+        source = self.index.get(source_id)
+        target = self.index.get(target_id)
+        if source is None or target is None:
+            return []
+        if source == target:
+            return [source_id]
+        _, predecessors = csgraph.breadth_first_order(
+            self.adjacency, source, directed=directed, return_predecessors=True
+        )
+        if predecessors[target] < 0:
+            return []
+        path = [target]
+        while path[-1] != source:
+            path.append(predecessors[path[-1]])
+        return [self.node_ids[i] for i in reversed(path)]
+
+    def save(self, path):
+        """Persist the adjacency structure as a compressed .npz file"""
+        np.savez_compressed(
+            path,
+            indptr=self.adjacency.indptr,
+            indices=self.adjacency.indices,
+            shape=np.array(self.adjacency.shape),
+            node_ids=np.array(self.node_ids, dtype=str),
+        )
+
+    @classmethod
+    def load(cls, path, titles=None):
+        with np.load(path, allow_pickle=False) as data:
+            indices = data["indices"]
+            adjacency = sparse.csr_matrix(
+                (np.ones(len(indices), dtype=np.int8), indices, data["indptr"]),
+                shape=tuple(data["shape"])
+            )
+            return cls(data["node_ids"].tolist(), adjacency, titles)
+
+    def _export_nodes(self, include_isolated):
+        degrees = self.in_degree()
+        out_degrees = np.diff(self.adjacency.indptr)
+        for i, arxiv_id in enumerate(self.node_ids):
+            if include_isolated or degrees[i] or out_degrees[i]:
+                yield i, arxiv_id, int(degrees[i])
+
+    def _export_edges(self):
+        coo = self.adjacency.tocoo()
+        for i, j in zip(coo.row, coo.col):
+            yield self.node_ids[i], self.node_ids[j]
+
+    def export_graphml(self, path, include_isolated=False):
+        """Write the network as GraphML for Gephi/Cytoscape/networkx"""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            f.write('<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+            f.write('  <key id="title" for="node" attr.name="title" attr.type="string"/>\n')
+            f.write('  <key id="in_degree" for="node" attr.name="in_degree" attr.type="int"/>\n')
+            f.write('  <graph id="citations" edgedefault="directed">\n')
+            for _, arxiv_id, degree in self._export_nodes(include_isolated):
+                f.write(f'    <node id="{escape(arxiv_id)}">'
+                        f'<data key="title">{escape(self.titles.get(arxiv_id, ""))}</data>'
+                        f'<data key="in_degree">{degree}</data></node>\n')
+            for source, target in self._export_edges():
+                f.write(f'    <edge source="{escape(source)}" target="{escape(target)}"/>\n')
+            f.write('  </graph>\n</graphml>\n')
+
+    def export_json(self, path, include_isolated=False):
+        """Write the network as node-link JSON (d3-force, networkx.node_link_graph)"""
+        data = {
+            "directed": True,
+            "nodes": [
+                {"id": arxiv_id, "title": self.titles.get(arxiv_id, ""), "in_degree": degree}
+                for _, arxiv_id, degree in self._export_nodes(include_isolated)
+            ],
+            "links": [{"source": s, "target": t} for s, t in self._export_edges()],
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+
+def build_citation_network(catalog, text_dir, workers=None, progress_callback=None):
+    """Build the citation network for every catalog paper with extracted text
+
+    Reference parsing runs in a process pool; each worker gets the title
+    index once and resolves references with dictionary lookups only.
+    """
+    node_ids, titles, title_index, tasks = [], {}, {}, []
+    for paper in catalog.iter_papers(columns=["arxiv_id", "paper_id", "title", "title_hash"]):
+        node_ids.append(paper["arxiv_id"])
+        titles[paper["arxiv_id"]] = paper["title"]
+        if paper["title_hash"]:
+            title_index.setdefault(paper["title_hash"], paper["arxiv_id"])
+        if paper["paper_id"]:
+            text_path = paper_file(text_dir, f"{paper['paper_id']}_text.txt")
+            if text_exists(text_path):
+                tasks.append((paper["arxiv_id"], text_path))
+
+    index = {arxiv_id: i for i, arxiv_id in enumerate(node_ids)}
+    rows, cols = [], []
+
+    def collect(results):
+        for done, (arxiv_id, cited) in enumerate(results, start=1):
+            source = index[arxiv_id]
+            for cited_id in cited:
+                target = index.get(cited_id)
+                if target is not None and target != source:
+                    rows.append(source)
+                    cols.append(target)
+            if progress_callback and done % 500 == 0:
+                progress_callback(done, len(tasks))
+
+    if workers == 1 or len(tasks) < 200:
+        _init_worker(title_index)
+        collect(map(_scan_paper, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(title_index,)) as executor:
+            collect(executor.map(_scan_paper, tasks, chunksize=64))
+    if progress_callback:
+        progress_callback(len(tasks), len(tasks))
+
+    adjacency = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int8), (rows, cols)),
+        shape=(len(node_ids), len(node_ids))
+    )
+    adjacency.sum_duplicates()
+    adjacency.data[:] = 1
+    return CitationNetwork(node_ids, adjacency, titles)
+
+
+def build_library_network(output_dir, workers=None, progress_callback=None):
+    """Sync the catalog from metadata.csv, build the network and save it next to the catalog"""
+    with LibraryCatalog.for_library(output_dir) as catalog:
+        catalog.import_metadata_csv(os.path.join(output_dir, "metadata.csv"))
+        network = build_citation_network(
+            catalog, os.path.join(output_dir, "extracted_text"),
+            workers=workers, progress_callback=progress_callback
+        )
+    network.save(os.path.join(output_dir, NETWORK_FILENAME))
+    return network
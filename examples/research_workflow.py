@@ -12,36 +12,41 @@ This example shows:
 
 import sys
 import os
-import json
-from datetime import datetime, timedelta
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def daily_research_routine():
+def daily_research_routine(library_dir="papers"):
     """
     Example: Daily 10-minute research routine
     """
     print("🌅 Starting daily research routine...")
     
-    # Search for latest papers in your research area
-    search_config = {
-        "query": "robotic manipulation OR grasping OR dexterous manipulation",
-        "categories": ["cs.RO", "cs.AI", "cs.LG"],
-        "max_results": 20,
-        "date_filter": True,
-        "start_date": (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d"),
-        "ai_analysis": True,
-        "ai_task": "summarize"
-    }
-    
-    print(f"🔍 Searching for papers with query: {search_config['query']}")
-    print(f"📅 Date range: {search_config['start_date']} to today")
-    
-    # This would integrate with your main fetcher
-    # results = fetch_papers(**search_config)
+    try:
+        from batch_runner import load_saved_queries, save_query
+        from research_daemon import ResearchDaemon
+    except ImportError:
+        print("❌ The daily routine requires the arxiv package: pip install arxiv")
+        return
     
-    print("✅ Daily routine complete! Check papers/summaries/ for new insights.")
+    # Search for latest papers in your research area
+    if not load_saved_queries(library_dir):
+        save_query(library_dir, {
+            "name": "manipulation",
+            "categories": ["cs.RO", "cs.AI", "cs.LG"],
+            "terms": "dexterous manipulation",
+            "max_results": 20,
+        })
+    queries = load_saved_queries(library_dir)
+    print(f"🔍 Running saved queries: {', '.join(query['name'] for query in queries)}")
+    
+    # One incremental run: only papers submitted since the last run are fetched
+    stats = ResearchDaemon(library_dir, progress_callback=print).run_once()
+    if stats is None:
+        print(f"📭 No saved queries in {library_dir}; nothing to run.")
+        return
+    print(f"✅ Daily routine complete! {stats['new']} new papers; check {library_dir}/summaries/ for new insights.")
+    print("⏰ To run this after every arXiv announcement, leave `python main.py --daemon` running.")
 
 def weekly_trend_analysis():
     """
@@ -140,46 +145,42 @@ def research_proposal_prep():
         for paper in papers:
             print(f"  • {paper}")
 
-def collaboration_discovery():
+def collaboration_discovery(library_dir="papers", focus_author=None):
     """
     Example: Finding potential collaborators and research groups
     """
     print("🤝 Discovering collaboration opportunities...")
     
-    # Analyze author networks and institutional affiliations
-    research_areas = ["robotics", "manipulation", "AI"]
+    try:
+        from author_graph import CoauthorGraph, quarter_start
+    except ImportError:
+        print("❌ Collaboration analysis requires numpy and scipy: pip install numpy scipy")
+        return
     
-    # Mock collaboration opportunities
-    opportunities = {
-        "active_researchers": [
-            "OpenAI Robotics Team - Emergent behavior analysis",
-            "Zhejiang University - Knowledge-enhanced RL",
-            "SUSTECH - Meta-learning for robotics"
-        ],
-        "emerging_groups": [
-            "Vision-Language-Action research groups",
-            "Embodied AI laboratories",
-            "Foundation models for robotics"
-        ],
-        "conference_hotspots": [
-            "ICRA 2025 - Manipulation workshops",
-            "RSS 2025 - Learning sessions", 
-            "CoRL 2025 - Foundation model tracks"
-        ]
-    }
+    # Analyze author networks from the library catalog
+    graph = CoauthorGraph.from_library(library_dir)
+    if not graph.author_names:
+        print(f"📭 No authors in the catalog yet. Fetch papers into '{library_dir}' first.")
+        return
+    
+    print(f"📚 {len(graph.paper_ids)} papers, {len(graph.author_names)} authors")
     
-    print("🌟 Collaboration Opportunities:")
-    print("\n👥 Active Researchers:")
-    for researcher in opportunities["active_researchers"]:
-        print(f"  • {researcher}")
+    print("\n👥 Most Connected Researchers:")
+    for name, collaborators in graph.most_connected(5):
+        print(f"  • {name} ({collaborators} co-authors)")
     
-    print("\n🏛️ Emerging Research Groups:")
-    for group in opportunities["emerging_groups"]:
-        print(f"  • {group}")
+    focus_author = focus_author or graph.most_connected(1)[0][0]
+    print(f"\n🤝 Top Collaborators of {focus_author}:")
+    for name, shared in graph.top_collaborators(focus_author, 5):
+        print(f"  • {name} ({shared} shared papers)")
     
-    print("\n🎤 Conference Opportunities:")
-    for conf in opportunities["conference_hotspots"]:
-        print(f"  • {conf}")
+    print("\n🏛️ Most Active Groups in cs.RO This Quarter:")
+    groups = graph.active_groups("cs.RO", since=quarter_start(), k=5)
+    if not groups:
+        print("  • No cs.RO papers this quarter")
+    for group in groups:
+        print(f"  • {', '.join(group['leading_authors'][:3])} "
+              f"({group['authors']} authors, {group['papers']} papers)")
 
 def main():
     """
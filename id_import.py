@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+ID List Import for Robotics Paper Fetcher
+Resolves files of arXiv IDs through the API's id_list in large batches
+"""
+
+import re
+
+import arxiv
+
+from library_catalog import LibraryCatalog, parse_arxiv_id, record_from_result
+
+# IDs per API request; each batch is one request
+ID_BATCH_SIZE = 200
+
+# An identifier with a real YYMM (month 01-12), not running on into more digits
+_ID = (r"(?P<id>\d{2}(?:0[1-9]|1[0-2])\.\d{4,5}|[a-z\-]+(?:\.[A-Z]{2})?/\d{2}(?:0[1-9]|1[0-2])\d{3})"
+       r"(?:v(?P<version>\d+))?(?!\d|\.\d)")
+# Where an ID is named as one: arXiv:ID, arxiv.org/abs|pdf/ID, eprint = {ID}
+_CONTEXT = r"(?i:arxiv:\s*|arxiv\.org/(?:abs|pdf)/|eprint\s*=\s*[{\"]\s*)"
+# In lists and CSV files, a bare ID must stand on its own: not inside a DOI, URL or longer number
+TEXT_ID_RE = re.compile(rf"(?:{_CONTEXT}|(?<![\w./])){_ID}")
+CONTEXT_ID_RE = re.compile(rf"{_CONTEXT}{_ID}")
+_BIBTEX_ENTRY_RE = re.compile(r"^\s*@\w+\s*\{", re.MULTILINE)
+
+
+def find_ids(text):
+    """arXiv IDs in text, in order, without repeats
+
+    BibTeX is read for IDs named as such (eprint fields, arXiv: notes,
+    arxiv.org URLs) only, since its DOIs and page ranges look like IDs;
+    other text also yields IDs that stand on their own.
+    """
+    pattern = CONTEXT_ID_RE if _BIBTEX_ENTRY_RE.search(text) else TEXT_ID_RE
+    ids = {}
+    for match in pattern.finditer(text):
+        # The first mention of a paper decides which version is asked for
+        ids.setdefault(match.group("id"), text[match.start("id"):match.end()])
+    return list(ids.values())
+
+
+def read_id_file(path):
+    """arXiv IDs found in a file (plain lists, CSV exports, URLs, BibTeX...), in order, without repeats"""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return find_ids(f.read())
+
+
+def split_known(catalog, ids):
+    """(IDs not yet in the catalog, number already there); versions are ignored for the check"""
+    new, known = [], 0
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        bases = [parse_arxiv_id(value)[0] for value in chunk]
+        placeholders = ", ".join("?" * len(bases))
+        held = {row[0] for row in catalog.query(f"SELECT arxiv_id FROM papers WHERE arxiv_id IN ({placeholders})",
+                                                tuple(bases))}
+        for value, base in zip(chunk, bases):
+            if base in held:
+                known += 1
+            else:
+                new.append(value)
+    return new, known
+
+
+def resolve_ids(ids, client=None, batch_size=ID_BATCH_SIZE):
+    """Yield arxiv.Results for a list of IDs, batch_size IDs per API request"""
+    client = client or arxiv.Client(page_size=batch_size)
+    for start in range(0, len(ids), batch_size):
+        batch = ids[start:start + batch_size]
+        yield from client.results(arxiv.Search(id_list=batch, max_results=len(batch)))
+
+
+def import_ids(output_dir, ids, progress_callback=None, download=True):
+    """Catalog the papers behind a list of IDs and download their PDFs; returns (cataloged, downloaded)
+
+    IDs already in the catalog are skipped before anything is requested.
+    PDFs go through the materialize step, like papers found by search
+    in metadata-only mode.
+    """
+    log = progress_callback or (lambda message: None)
+    with LibraryCatalog.for_library(output_dir) as catalog:
+        ids, known = split_known(catalog, ids)
+        if known:
+            log(f"[SKIP] {known} IDs are already in the catalog")
+        log(f"[SEARCH] Resolving {len(ids)} IDs in {-(-len(ids) // ID_BATCH_SIZE)} API requests")
+        cataloged, pending = [], []
+        for result in resolve_ids(ids):
+            pending.append(record_from_result(result))
+            if len(pending) >= ID_BATCH_SIZE:
+                catalog.upsert_papers(pending)
+                cataloged.extend(record["arxiv_id"] for record in pending)
+                pending = []
+                log(f"[OK] Cataloged {len(cataloged)}/{len(ids)} papers")
+        catalog.upsert_papers(pending)
+        cataloged.extend(record["arxiv_id"] for record in pending)
+    if len(cataloged) < len(ids):
+        log(f"[!] {len(ids) - len(cataloged)} IDs were not found on arXiv")
+    if not download or not cataloged:
+        return len(cataloged), 0
+
+    from materialize import materialize_papers, select_papers
+    return len(cataloged), materialize_papers(output_dir, select_papers(output_dir, cataloged), progress_callback=log)
@@ -0,0 +1,569 @@
+#!/usr/bin/env python3
+"""
+Library Catalog for Robotics Paper Fetcher
+SQLite-backed index of every paper in a research library
+"""
+
+import os
+import re
+import csv
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from datetime import datetime
+
+CATALOG_FILENAME = "catalog.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    arxiv_id TEXT PRIMARY KEY,
+    version INTEGER,
+    paper_id TEXT,
+    title TEXT NOT NULL,
+    title_hash TEXT,
+    authors TEXT,
+    published TEXT,
+    categories TEXT,
+    pdf_url TEXT,
+    entry_url TEXT,
+    abstract TEXT,
+    pages INTEGER,
+    encrypted INTEGER,
+    text_extracted INTEGER,
+    added TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_papers_title_hash ON papers(title_hash);
+CREATE INDEX IF NOT EXISTS idx_papers_published ON papers(published);
+CREATE INDEX IF NOT EXISTS idx_papers_paper_id ON papers(paper_id);
+CREATE INDEX IF NOT EXISTS idx_papers_title ON papers(title);
+CREATE INDEX IF NOT EXISTS idx_papers_pages ON papers(pages);
+CREATE TABLE IF NOT EXISTS authors (
+    author_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    normalized_name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS paper_authors (
+    arxiv_id TEXT NOT NULL,
+    author_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (arxiv_id, author_id)
+);
+CREATE INDEX IF NOT EXISTS idx_paper_authors_author ON paper_authors(author_id);
+CREATE TABLE IF NOT EXISTS paper_versions (
+    arxiv_id TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    paper_id TEXT,
+    seen TEXT,
+    PRIMARY KEY (arxiv_id, version)
+);
+CREATE TABLE IF NOT EXISTS minhash_signatures (
+    arxiv_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    PRIMARY KEY (arxiv_id, kind)
+);
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    kind TEXT NOT NULL,
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    arxiv_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_lsh_buckets ON lsh_buckets(kind, band, bucket);
+CREATE TABLE IF NOT EXISTS duplicates (
+    arxiv_id TEXT PRIMARY KEY,
+    duplicate_of TEXT NOT NULL,
+    similarity REAL,
+    kind TEXT,
+    detected TEXT
+);
+CREATE TABLE IF NOT EXISTS reading_status (
+    arxiv_id TEXT PRIMARY KEY,
+    starred INTEGER NOT NULL DEFAULT 0,
+    read INTEGER NOT NULL DEFAULT 0,
+    updated TEXT
+);
+CREATE TABLE IF NOT EXISTS topics (
+    topic INTEGER PRIMARY KEY,
+    label TEXT,
+    top_terms TEXT,
+    updated TEXT
+);
+CREATE TABLE IF NOT EXISTS paper_topics (
+    arxiv_id TEXT NOT NULL,
+    topic INTEGER NOT NULL,
+    weight REAL NOT NULL,
+    PRIMARY KEY (arxiv_id, topic)
+);
+CREATE INDEX IF NOT EXISTS idx_paper_topics_topic ON paper_topics(topic);
+CREATE TABLE IF NOT EXISTS pdf_cache (
+    sha256 TEXT PRIMARY KEY,
+    size INTEGER,
+    pages INTEGER,
+    encrypted INTEGER,
+    text_extracted INTEGER,
+    page_offsets TEXT,
+    errors TEXT,
+    updated TEXT
+);
+CREATE TABLE IF NOT EXISTS pdf_files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS quarantine (
+    path TEXT PRIMARY KEY,
+    original_path TEXT,
+    sha256 TEXT,
+    arxiv_id TEXT,
+    reason TEXT NOT NULL,
+    quarantined TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_quarantine_arxiv_id ON quarantine(arxiv_id);
+CREATE TABLE IF NOT EXISTS text_store (
+    key TEXT PRIMARY KEY,
+    frame_offset INTEGER NOT NULL,
+    frame_length INTEGER NOT NULL,
+    codec TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    updated TEXT
+);
+CREATE TABLE IF NOT EXISTS library_files (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    size INTEGER,
+    mtime_ns INTEGER,
+    inode INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_library_files_kind ON library_files(kind);
+CREATE TABLE IF NOT EXISTS library_dirs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS query_pages (
+    key TEXT PRIMARY KEY,
+    query_key TEXT NOT NULL,
+    page_offset INTEGER NOT NULL,
+    results TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    fetched REAL NOT NULL,
+    expires REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_query_pages_query ON query_pages(query_key);
+CREATE TABLE IF NOT EXISTS paper_queries (
+    arxiv_id TEXT NOT NULL,
+    query_name TEXT NOT NULL,
+    first_seen TEXT,
+    PRIMARY KEY (arxiv_id, query_name)
+);
+CREATE INDEX IF NOT EXISTS idx_paper_queries_query ON paper_queries(query_name);
+CREATE TABLE IF NOT EXISTS catalog_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+PAPER_COLUMNS = [
+    "arxiv_id", "version", "paper_id", "title", "title_hash", "authors",
+    "published", "categories", "pdf_url", "entry_url", "abstract",
+    "pages", "encrypted", "text_extracted", "added"
+]
+
+# New-style (2506.19146v1) and old-style (cs.RO/0601001v2) arXiv identifiers
+ARXIV_ID_RE = re.compile(
+    r"(?P<id>\d{4}\.\d{4,5}|[a-z\-]+(?:\.[A-Z]{2})?/\d{7})(?:v(?P<version>\d+))?"
+)
+
+
+def catalog_path(output_dir):
+    """Return the catalog location for a library directory"""
+    return os.path.join(output_dir, CATALOG_FILENAME)
+
+
+def parse_arxiv_id(value):
+    """Split an arXiv URL, file prefix or identifier into (base_id, version)"""
+    if not value:
+        return None, None
+    match = ARXIV_ID_RE.search(str(value))
+    if not match:
+        return None, None
+    version = match.group("version")
+    return match.group("id"), int(version) if version else None
+
+
+def normalize_title(title):
+    """Normalize a title for matching: lowercase ASCII words separated by single spaces"""
+    if not title:
+        return ""
+    text = unicodedata.normalize("NFKD", str(title))
+    text = text.encode("ascii", "ignore").decode("ascii").lower()
+    text = re.sub(r"[^a-z0-9]+", " ", text)
+    return text.strip()
+
+
+def title_hash(title):
+    """Stable short hash of a normalized title, used as the title index key"""
+    normalized = normalize_title(title)
+    if not normalized:
+        return None
+    return hashlib.blake2b(normalized.encode("ascii"), digest_size=8).hexdigest()
+
+
+def normalize_author(name):
+    """Normalize an author name for indexing: 'José  García-López' -> 'jose garcia lopez'"""
+    return normalize_title(name)
+
+
+def split_authors(authors):
+    """Split the comma-joined author string stored in metadata.csv and the catalog"""
+    if not authors:
+        return []
+    return [name.strip() for name in str(authors).split(",") if name.strip()]
+
+
+def paper_filter(query=None, category=None, since=None, until=None):
+    """Build a (where, params) pair for iter_papers/count from common UI filters"""
+    clauses, params = [], []
+    if query and query.strip():
+        pattern = f"%{query.strip()}%"
+        clauses.append("(title LIKE ? OR abstract LIKE ? OR authors LIKE ?)")
+        params.extend([pattern, pattern, pattern])
+    if category:
+        clauses.append("(', ' || COALESCE(categories, '') || ',') LIKE ?")
+        params.append(f"%, {category},%")
+    if since:
+        clauses.append("published >= ?")
+        params.append(str(since))
+    if until:
+        clauses.append("published <= ?")
+        params.append(str(until))
+    return " AND ".join(clauses) or None, tuple(params)
+
+
+def record_from_result(result, paper_id=None, pdf_info=None):
+    """Build a catalog record from an arxiv.Result"""
+    arxiv_id, version = parse_arxiv_id(result.entry_id)
+    pdf_info = pdf_info or {}
+    return {
+        "arxiv_id": arxiv_id,
+        "version": version,
+        "paper_id": paper_id,
+        "title": result.title,
+        "authors": ", ".join(a.name for a in result.authors),
+        "published": result.published.strftime("%Y-%m-%d"),
+        "categories": ", ".join(result.categories),
+        "pdf_url": result.pdf_url,
+        "entry_url": result.entry_id,
+        "abstract": result.summary,
+        "pages": _int_or_none(pdf_info.get("pages")),
+        "encrypted": _bool_or_none(pdf_info.get("encrypted")),
+        "text_extracted": _bool_or_none(pdf_info.get("text_extracted")),
+    }
+
+
+def _int_or_none(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _bool_or_none(value):
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in ("true", "1", "yes"):
+            return 1
+        if lowered in ("false", "0", "no"):
+            return 0
+        return None
+    if value is None:
+        return None
+    return int(bool(value))
+
+
+class LibraryCatalog:
+    """Thread-safe SQLite catalog of papers in a research library"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    @classmethod
+    def for_library(cls, output_dir):
+        """Open (or create) the catalog belonging to a library directory
+
+        A new catalog is seeded from the library's metadata.csv so that
+        libraries fetched before the catalog existed work immediately, and
+        records the library's folder layout (sharded unless flat files exist).
+        Opening an existing catalog re-reads its layout, so a migration run
+        by another process (main.py --migrate-layout) is picked up.
+        """
+        created = not os.path.exists(catalog_path(output_dir))
+        catalog = cls(catalog_path(output_dir))
+        if not catalog.count():
+            catalog.import_metadata_csv(os.path.join(output_dir, "metadata.csv"))
+        # Imported here: library_layout builds on this module
+        from library_layout import ensure_layout, reload_layout
+        if created:
+            ensure_layout(catalog, output_dir)
+        else:
+            reload_layout(catalog, output_dir)
+        return catalog
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def execute(self, sql, params=()):
+        """Run a write statement under the catalog lock and commit"""
+        with self._lock:
+            cursor = self.conn.execute(sql, params)
+            self.conn.commit()
+            return cursor
+
+    def query(self, sql, params=()):
+        """Run a read query and return all rows"""
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def upsert_papers(self, records):
+        """Insert or update paper records in a single transaction"""
+        rows = []
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        for record in records:
+            if not record.get("arxiv_id") or not record.get("title"):
+                continue
+            row = {column: record.get(column) for column in PAPER_COLUMNS}
+            row["title_hash"] = row["title_hash"] or title_hash(row["title"])
+            row["added"] = row["added"] or now
+            rows.append(row)
+        if not rows:
+            return 0
+
+        # Keep existing values when an update does not know a field (e.g. pages from CSV)
+        updates = ", ".join(
+            f"{column} = COALESCE(excluded.{column}, papers.{column})"
+            for column in PAPER_COLUMNS if column not in ("arxiv_id", "added", "abstract")
+        )
+        # metadata.csv truncates abstracts, so never replace a longer one
+        updates += (
+            ", abstract = CASE WHEN length(COALESCE(excluded.abstract, '')) >= "
+            "length(COALESCE(papers.abstract, '')) THEN excluded.abstract ELSE papers.abstract END"
+        )
+        sql = (
+            f"INSERT INTO papers ({', '.join(PAPER_COLUMNS)}) "
+            f"VALUES ({', '.join(':' + c for c in PAPER_COLUMNS)}) "
+            f"ON CONFLICT(arxiv_id) DO UPDATE SET {updates}"
+        )
+        with self._lock:
+            with self.conn:
+                self.conn.executemany(sql, rows)
+                self._index_authors(rows)
+                self._touch()
+        return len(rows)
+
+    def _touch(self):
+        """Record that paper data changed, so derived files (snapshots, indexes) can tell they are stale"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO catalog_meta (key, value) VALUES ('papers_modified', ?)",
+            (datetime.now().isoformat(),)
+        )
+
+    def get_meta(self, key, default=None):
+        rows = self.query("SELECT value FROM catalog_meta WHERE key = ?", (key,))
+        return rows[0][0] if rows else default
+
+    def set_meta(self, key, value):
+        self.execute("INSERT OR REPLACE INTO catalog_meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _index_authors(self, rows):
+        """Refresh the author table and paper/author links for freshly upserted rows"""
+        for row in rows:
+            names = split_authors(row.get("authors"))
+            if not names:
+                continue
+            self.conn.execute("DELETE FROM paper_authors WHERE arxiv_id = ?", (row["arxiv_id"],))
+            for position, name in enumerate(names):
+                normalized = normalize_author(name)
+                if not normalized:
+                    continue
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO authors (name, normalized_name) VALUES (?, ?)",
+                    (name, normalized)
+                )
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO paper_authors (arxiv_id, author_id, position) "
+                    "SELECT ?, author_id, ? FROM authors WHERE normalized_name = ?",
+                    (row["arxiv_id"], position, normalized)
+                )
+
+    def record_version(self, arxiv_id, version, paper_id):
+        """Remember which local files hold a given arXiv version"""
+        if version is None:
+            return
+        self.execute(
+            "INSERT OR REPLACE INTO paper_versions (arxiv_id, version, paper_id, seen) VALUES (?, ?, ?, ?)",
+            (arxiv_id, version, paper_id, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        )
+
+    def versions(self, arxiv_id):
+        """Known versions of a paper as (version, paper_id), oldest first"""
+        rows = self.query(
+            "SELECT version, paper_id FROM paper_versions WHERE arxiv_id = ? ORDER BY version",
+            (arxiv_id,)
+        )
+        return [(row[0], row[1]) for row in rows]
+
+    def set_reading_status(self, arxiv_id, starred=None, read=None):
+        """Star/unstar or mark a paper read/unread; None leaves a flag unchanged"""
+        self.execute(
+            "INSERT INTO reading_status (arxiv_id, starred, read, updated) VALUES (?, COALESCE(?, 0), COALESCE(?, 0), ?) "
+            "ON CONFLICT(arxiv_id) DO UPDATE SET starred = COALESCE(?, starred), read = COALESCE(?, read), "
+            "updated = excluded.updated",
+            (arxiv_id, _bool_or_none(starred), _bool_or_none(read), datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+             _bool_or_none(starred), _bool_or_none(read))
+        )
+
+    def starred_ids(self):
+        return [row[0] for row in self.query("SELECT arxiv_id FROM reading_status WHERE starred = 1")]
+
+    def read_ids(self):
+        return [row[0] for row in self.query("SELECT arxiv_id FROM reading_status WHERE read = 1")]
+
+    def tag_papers(self, query_name, arxiv_ids):
+        """Record that a saved query matched some papers (first match time is kept)"""
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO paper_queries (arxiv_id, query_name, first_seen) VALUES (?, ?, ?)",
+                    [(arxiv_id, query_name, now) for arxiv_id in arxiv_ids]
+                )
+
+    def query_tags(self, arxiv_id):
+        """Names of the saved queries that matched a paper"""
+        rows = self.query("SELECT query_name FROM paper_queries WHERE arxiv_id = ? ORDER BY query_name", (arxiv_id,))
+        return [row[0] for row in rows]
+
+    def rebuild_author_index(self):
+        """Re-derive the author tables from every paper's author string"""
+        with self._lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM paper_authors")
+                self.conn.execute("DELETE FROM authors")
+                rows = self.conn.execute("SELECT arxiv_id, authors FROM papers").fetchall()
+                self._index_authors([dict(row) for row in rows])
+
+    def papers_by_author(self, name):
+        """arXiv IDs of papers written by an author, newest first"""
+        rows = self.query(
+            "SELECT p.arxiv_id FROM paper_authors pa "
+            "JOIN authors a ON a.author_id = pa.author_id "
+            "JOIN papers p ON p.arxiv_id = pa.arxiv_id "
+            "WHERE a.normalized_name = ? ORDER BY p.published DESC",
+            (normalize_author(name),)
+        )
+        return [row[0] for row in rows]
+
+    def upsert_paper(self, record):
+        return self.upsert_papers([record])
+
+    def get_paper(self, arxiv_id):
+        rows = self.query("SELECT * FROM papers WHERE arxiv_id = ?", (arxiv_id,))
+        return dict(rows[0]) if rows else None
+
+    def has_paper(self, arxiv_id):
+        return bool(self.query("SELECT 1 FROM papers WHERE arxiv_id = ?", (arxiv_id,)))
+
+    def count(self, where=None, params=()):
+        sql = "SELECT COUNT(*) FROM papers"
+        if where:
+            sql += f" WHERE {where}"
+        return self.query(sql, params)[0][0]
+
+    def iter_papers(self, columns=None, where=None, params=(), chunk_size=1000):
+        """Yield papers as dicts, fetching chunk_size rows at a time (keyset paging on rowid)"""
+        selected = ", ".join(columns) if columns else "*"
+        condition = f"AND ({where})" if where else ""
+        last_rowid = 0
+        while True:
+            rows = self.query(
+                f"SELECT rowid AS _rowid, {selected} FROM papers "
+                f"WHERE rowid > ? {condition} ORDER BY rowid LIMIT ?",
+                (last_rowid, *params, chunk_size)
+            )
+            if not rows:
+                return
+            for row in rows:
+                record = dict(row)
+                last_rowid = record.pop("_rowid")
+                yield record
+            if len(rows) < chunk_size:
+                return
+
+    def page_papers(self, columns=None, where=None, params=(), order_by="rowid", descending=False,
+                    offset=0, limit=100):
+        """One page of papers in a given order, for lists that show a window of the library"""
+        if order_by not in PAPER_COLUMNS and order_by != "rowid":
+            raise ValueError(f"Cannot sort papers by {order_by}")
+        selected = ", ".join(columns) if columns else "*"
+        direction = "DESC" if descending else "ASC"
+        sql = f"SELECT {selected} FROM papers"
+        if where:
+            sql += f" WHERE {where}"
+        # rowid breaks ties so pages never overlap, and lets a column index serve the sort
+        sql += f" ORDER BY {order_by} {direction}, rowid {direction} LIMIT ? OFFSET ?"
+        return [dict(row) for row in self.query(sql, (*params, limit, offset))]
+
+    def import_metadata_csv(self, csv_path):
+        """Load a metadata.csv written by fetch_papers into the catalog"""
+        if not os.path.exists(csv_path):
+            return 0
+        records = []
+        with open(csv_path, "r", newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                entry_url = row.get("arXiv_URL", "")
+                arxiv_id, version = parse_arxiv_id(entry_url)
+                if not arxiv_id:
+                    continue
+                # Older fetches wrote a running number as the ID, newer ones the paper_id itself
+                paper_id = row.get("ID", "").strip() or None
+                if paper_id and paper_id.isdigit():
+                    paper_id = f"{int(paper_id):03d}_{entry_url.rstrip('/').split('/')[-1]}"
+                records.append({
+                    "arxiv_id": arxiv_id,
+                    "version": version,
+                    "paper_id": paper_id,
+                    "title": row.get("Title"),
+                    "authors": row.get("Authors"),
+                    "published": row.get("Published"),
+                    "pdf_url": row.get("PDF_URL"),
+                    "entry_url": entry_url,
+                    "abstract": row.get("Abstract"),
+                    "pages": _int_or_none(row.get("Pages")),
+                    "encrypted": _bool_or_none(row.get("Encrypted")),
+                    "text_extracted": _bool_or_none(row.get("Text_Extracted")),
+                })
+        # The catalog owns paper IDs: its files and summaries are named after them
+        named = {row[0] for row in self.query("SELECT arxiv_id FROM papers WHERE paper_id IS NOT NULL")}
+        for record in records:
+            if record["arxiv_id"] in named:
+                record["paper_id"] = None
+        return self.upsert_papers(records)
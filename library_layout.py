@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Library Layout for Robotics Paper Fetcher
+Shards library folders by arXiv ID prefix and keeps a catalog index of the files in them
+"""
+
+import os
+import re
+import threading
+
+from library_catalog import CATALOG_FILENAME, LibraryCatalog
+
+# Folders holding one or more files per paper
+LIBRARY_DIRS = ("pdfs", "summaries", "extracted_text", "ai_analysis")
+
+LAYOUT_FLAT = "flat"
+LAYOUT_SHARDED = "sharded"
+# Files whose name carries no arXiv ID
+MISC_SHARD = "misc"
+
+# YYMM of new-style (2506.19146) and old-style (0601001) identifiers
+_SHARD_RE = re.compile(r"(?<!\d)(\d{4})(?:\.\d{4,5}|\d{3})(?!\d)")
+
+_layouts = {}
+_layouts_lock = threading.Lock()
+
+
+def shard_for(filename):
+    """Shard folder for a paper file: the YYMM prefix of its arXiv ID"""
+    match = _SHARD_RE.search(os.path.basename(filename))
+    return match.group(1) if match else MISC_SHARD
+
+
+def library_root(path):
+    """Library directory holding a paper file, in either layout"""
+    directory = os.path.dirname(os.path.abspath(path))
+    while os.path.basename(directory) not in LIBRARY_DIRS:
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return os.path.dirname(os.path.dirname(os.path.abspath(path)))
+        directory = parent
+    return os.path.dirname(directory)
+
+
+def _flat_files(directory):
+    try:
+        with os.scandir(directory) as entries:
+            return [entry.path for entry in entries if entry.is_file()]
+    except OSError:
+        return []
+
+
+def infer_layout(output_dir, catalog=None, ignore=()):
+    """Layout of a library with none recorded: flat only if the pipeline already wrote flat files
+
+    Summaries, text and AI notes at the top of their folders mean a flat
+    library; a PDF at the top of pdfs/ counts only once it is indexed or
+    named after a cataloged paper. PDFs copied in by hand (and any paths
+    in ignore) do not, so they cannot switch sharding off.
+    """
+    ignore = {os.path.abspath(path) for path in ignore}
+    for dirname in LIBRARY_DIRS:
+        if dirname != "pdfs" and any(os.path.abspath(path) not in ignore for path in _flat_files(os.path.join(output_dir, dirname))):
+            return LAYOUT_FLAT
+    if catalog is not None:
+        for path in _flat_files(os.path.join(output_dir, "pdfs")):
+            if os.path.abspath(path) in ignore:
+                continue
+            name = os.path.basename(path)
+            if catalog.query("SELECT 1 FROM library_files WHERE path = ?", (f"pdfs/{name}",)) or \
+                    catalog.query("SELECT 1 FROM papers WHERE paper_id = ?", (os.path.splitext(name)[0],)):
+                return LAYOUT_FLAT
+    return LAYOUT_SHARDED
+
+
+def library_layout(output_dir):
+    """Layout of a library as recorded in its catalog (inferred, without recording, until it has one)"""
+    key = os.path.abspath(output_dir)
+    with _layouts_lock:
+        if key in _layouts:
+            return _layouts[key]
+    if not os.path.exists(os.path.join(output_dir, CATALOG_FILENAME)):
+        # Cached until the catalog is created and records its own
+        layout = infer_layout(output_dir)
+        with _layouts_lock:
+            _layouts[key] = layout
+        return layout
+    with LibraryCatalog(os.path.join(output_dir, CATALOG_FILENAME)) as catalog:
+        return ensure_layout(catalog, output_dir)
+
+
+def ensure_layout(catalog, output_dir, ignore=()):
+    """The layout recorded in a library's catalog; one is inferred and recorded if there is none yet
+
+    New catalogs record theirs when created (LibraryCatalog.for_library),
+    so inference only decides for libraries cataloged before that.
+    """
+    layout = catalog.get_meta("library_layout")
+    if layout is None:
+        layout = infer_layout(output_dir, catalog, ignore)
+        catalog.set_meta("library_layout", layout)
+    with _layouts_lock:
+        _layouts[os.path.abspath(output_dir)] = layout
+    return layout
+
+
+def reload_layout(catalog, output_dir):
+    """Drop the cached layout in favour of the catalog's, which another process may have migrated"""
+    layout = catalog.get_meta("library_layout")
+    with _layouts_lock:
+        if layout is None:
+            # Left to ensure_layout, so callers that must ignore some files still can
+            _layouts.pop(os.path.abspath(output_dir), None)
+        else:
+            _layouts[os.path.abspath(output_dir)] = layout
+    return layout
+
+
+def _set_layout(catalog, output_dir, layout):
+    catalog.set_meta("library_layout", layout)
+    with _layouts_lock:
+        _layouts[os.path.abspath(output_dir)] = layout
+
+
+def paper_file(directory, filename):
+    """Path of a paper file inside one of the library folders (pdfs, extracted_text, ...)"""
+    if library_layout(os.path.dirname(os.path.abspath(directory))) == LAYOUT_SHARDED:
+        return os.path.join(directory, shard_for(filename), filename)
+    return os.path.join(directory, filename)
+
+
+def library_key(output_dir, path):
+    """Path of a library file relative to the library, with / separators (the index key)"""
+    return os.path.relpath(os.path.abspath(path), os.path.abspath(output_dir)).replace(os.sep, "/")
+
+
+def index_file(catalog, output_dir, path):
+    """Record (or refresh) one library file in the directory index"""
+    stat = os.stat(path)
+    relative = library_key(output_dir, path)
+    catalog.execute(
+        "INSERT OR REPLACE INTO library_files (path, kind, size, mtime_ns, inode) VALUES (?, ?, ?, ?, ?)",
+        (relative, relative.split("/", 1)[0], stat.st_size, stat.st_mtime_ns, stat.st_ino)
+    )
+
+
+def unindex_file(catalog, output_dir, path):
+    catalog.execute("DELETE FROM library_files WHERE path = ?", (library_key(output_dir, path),))
+
+
+def walk_folder(directory):
+    """Files under a library folder, one level of shards deep"""
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return
+    for entry in entries:
+        if entry.is_file():
+            yield entry
+        elif entry.is_dir():
+            with os.scandir(entry.path) as shard:
+                for child in shard:
+                    if child.is_file():
+                        yield child
+
+
+def reindex_library(catalog, output_dir, progress_callback=None):
+    """Rebuild the directory index from disk; returns the number of files indexed"""
+    rows = []
+    for dirname in LIBRARY_DIRS:
+        for entry in walk_folder(os.path.join(output_dir, dirname)):
+            stat = entry.stat()
+            rows.append((library_key(output_dir, entry.path), dirname, stat.st_size, stat.st_mtime_ns, entry.inode()))
+        if progress_callback:
+            progress_callback(f"Indexed {dirname}/ ({len(rows)} files so far)")
+    with catalog._lock:
+        with catalog.conn:
+            catalog.conn.execute("DELETE FROM library_files")
+            # Folder mtimes are recorded by the next scan, which then skips unchanged folders
+            catalog.conn.execute("DELETE FROM library_dirs")
+            catalog.conn.executemany(
+                "INSERT OR REPLACE INTO library_files (path, kind, size, mtime_ns, inode) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            catalog.conn.execute(
+                "INSERT OR REPLACE INTO catalog_meta (key, value) VALUES ('files_indexed', '1')"
+            )
+    return len(rows)
+
+
+def _ensure_index(catalog, output_dir):
+    # Libraries from before the index get one full walk, after which it is kept up to date
+    if catalog.get_meta("files_indexed") is None:
+        reindex_library(catalog, output_dir)
+
+
+def list_library_files(catalog, output_dir, kind="pdfs", suffix=".pdf"):
+    """(absolute path, size) of the indexed files of one kind, in name order"""
+    _ensure_index(catalog, output_dir)
+    rows = catalog.query(
+        "SELECT path, size FROM library_files WHERE kind = ? AND path LIKE ?",
+        (kind, f"%{suffix}")
+    )
+    files = [(os.path.join(output_dir, *row["path"].split("/")), row["size"]) for row in rows]
+    files.sort(key=lambda item: os.path.basename(item[0]))
+    return files
+
+
+def library_totals(catalog, output_dir, kind="pdfs", suffix=".pdf"):
+    """(file count, total bytes) of one kind of library file, from the index"""
+    _ensure_index(catalog, output_dir)
+    count, size = catalog.query(
+        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM library_files WHERE kind = ? AND path LIKE ?",
+        (kind, f"%{suffix}")
+    )[0]
+    return count, size
+
+
+def migrate_library(output_dir, progress_callback=None):
+    """Move a flat library into arXiv-prefix shards; returns the number of files moved
+
+    Each move is a rename, so an interrupted migration is finished by
+    running it again. Extraction cache paths and packed text keys are
+    rewritten to match the new locations.
+    """
+    moved = 0
+    with LibraryCatalog.for_library(output_dir) as catalog:
+        for dirname in LIBRARY_DIRS:
+            directory = os.path.join(output_dir, dirname)
+            try:
+                entries = [entry for entry in os.scandir(directory) if entry.is_file()]
+            except OSError:
+                continue
+            for entry in entries:
+                target_dir = os.path.join(directory, shard_for(entry.name))
+                os.makedirs(target_dir, exist_ok=True)
+                target = os.path.join(target_dir, entry.name)
+                os.replace(entry.path, target)
+                catalog.execute("UPDATE pdf_files SET path = ? WHERE path = ?",
+                                (os.path.realpath(target), os.path.realpath(entry.path)))
+                moved += 1
+                if progress_callback and moved % 1000 == 0:
+                    progress_callback(f"Moved {moved} files")
+        _migrate_packed_keys(catalog)
+        _set_layout(catalog, output_dir, LAYOUT_SHARDED)
+        reindex_library(catalog, output_dir, progress_callback)
+    return moved
+
+
+def _migrate_packed_keys(catalog):
+    """Point packed text frames at their sharded paths"""
+    rows = catalog.query("SELECT key FROM text_store")
+    updates = []
+    for row in rows:
+        parts = row["key"].split("/")
+        if len(parts) == 2 and parts[0] in LIBRARY_DIRS:
+            updates.append((f"{parts[0]}/{shard_for(parts[1])}/{parts[1]}", row["key"]))
+    if updates:
+        with catalog._lock:
+            with catalog.conn:
+                catalog.conn.executemany("UPDATE text_store SET key = ? WHERE key = ?", updates)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Library Scanner for Robotics Paper Fetcher
+Keeps the directory index in step with the disk, re-listing only folders that changed
+"""
+
+import os
+import time
+import threading
+
+from library_catalog import LibraryCatalog
+from library_layout import LIBRARY_DIRS, library_totals
+
+# A folder modified this recently is listed again next scan: a file added
+# within the same mtime tick would not move the recorded value
+RACY_WINDOW_NS = 2 * 10**9
+
+
+def _indexed(catalog, folder_key):
+    """{key: (size, mtime_ns, inode)} of the index rows directly inside a folder"""
+    rows = catalog.query(
+        "SELECT path, size, mtime_ns, inode FROM library_files WHERE path > ? AND path < ?",
+        (folder_key + "/", folder_key + "0")  # "0" sorts right after "/"
+    )
+    depth = folder_key.count("/") + 1
+    return {row["path"]: (row["size"], row["mtime_ns"], row["inode"])
+            for row in rows if row["path"].count("/") == depth}
+
+
+def _list_folder(catalog, folder, folder_key, kind, upserts, deletes):
+    """Compare one folder's files with the index; returns its sub-folders"""
+    known = _indexed(catalog, folder_key)
+    subfolders = []
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                subfolders.append(entry.name)
+                continue
+            if not entry.is_file():
+                continue
+            key = f"{folder_key}/{entry.name}"
+            stat = entry.stat()
+            current = (stat.st_size, stat.st_mtime_ns, entry.inode())
+            if known.pop(key, None) != current:
+                upserts.append((key, kind, *current))
+    deletes.extend(known)
+    return subfolders
+
+
+def scan_library(catalog, output_dir, full=False):
+    """Bring the directory index up to date with the disk; returns (changed keys, removed keys)
+
+    Adding, removing or renaming a file touches its folder's mtime, so
+    folders whose mtime matches the last scan are skipped without listing:
+    rescanning an unchanged library stats its shard folders, not its files.
+    full=True lists and stats every file (e.g. after in-place edits).
+    """
+    recorded = {row["path"]: row["mtime_ns"] for row in catalog.query("SELECT path, mtime_ns FROM library_dirs")}
+    now = time.time_ns()
+    upserts, deletes, dir_rows, gone_dirs = [], [], [], []
+
+    def visit(folder, folder_key, kind):
+        """Scan a folder if it changed; returns its sub-folder names, or None when unchanged"""
+        try:
+            mtime = os.stat(folder).st_mtime_ns
+        except OSError:
+            gone_dirs.append(folder_key)
+            deletes.extend(_indexed(catalog, folder_key))
+            return []
+        if not full and recorded.get(folder_key) == mtime:
+            return None
+        subfolders = _list_folder(catalog, folder, folder_key, kind, upserts, deletes)
+        # Recently modified folders are recorded as unseen so they are listed again
+        dir_rows.append((folder_key, mtime if now - mtime > RACY_WINDOW_NS else -1))
+        return subfolders
+
+    for kind in LIBRARY_DIRS:
+        top = os.path.join(output_dir, kind)
+        known_shards = {key.split("/", 1)[1] for key in recorded if key.startswith(kind + "/")}
+        subfolders = visit(top, kind, kind)
+        if subfolders is None:
+            # Unchanged top folder: the same shard folders as last time
+            subfolders = known_shards
+        else:
+            for name in known_shards - set(subfolders):
+                gone_dirs.append(f"{kind}/{name}")
+                deletes.extend(_indexed(catalog, f"{kind}/{name}"))
+        for name in subfolders:
+            visit(os.path.join(top, name), f"{kind}/{name}", kind)
+
+    with catalog._lock:
+        with catalog.conn:
+            catalog.conn.executemany(
+                "INSERT OR REPLACE INTO library_files (path, kind, size, mtime_ns, inode) VALUES (?, ?, ?, ?, ?)",
+                upserts
+            )
+            catalog.conn.executemany("DELETE FROM library_files WHERE path = ?", [(key,) for key in deletes])
+            catalog.conn.executemany("DELETE FROM library_dirs WHERE path = ?", [(key,) for key in gone_dirs])
+            catalog.conn.executemany("INSERT OR REPLACE INTO library_dirs (path, mtime_ns) VALUES (?, ?)", dir_rows)
+            catalog.conn.execute("INSERT OR REPLACE INTO catalog_meta (key, value) VALUES ('files_indexed', '1')")
+    return [row[0] for row in upserts], deletes
+
+
+def scan_in_background(output_dir, on_done, full=False):
+    """Scan on a daemon thread with its own catalog connection
+
+    on_done(stats) is called on that thread with papers, bytes (PDF totals),
+    changed and removed, or with error when the scan failed; GUI callers
+    hand it to the Tk thread with root.after.
+    """
+    def run():
+        try:
+            with LibraryCatalog.for_library(output_dir) as catalog:
+                changed, removed = scan_library(catalog, output_dir, full)
+                papers, size = library_totals(catalog, output_dir)
+            on_done({"papers": papers, "bytes": size, "changed": len(changed), "removed": len(removed)})
+        except Exception as e:
+            on_done({"error": str(e)})
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Columnar Library Snapshot for Robotics Paper Fetcher
+Writes the full catalog to Arrow IPC / Parquet for fast, memory-mapped analytics
+"""
+
+import os
+import csv
+from datetime import datetime
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+from library_catalog import LibraryCatalog, split_authors
+from library_layout import list_library_files
+
+SNAPSHOT_FILENAME = "library_snapshot.arrow"
+PARQUET_FILENAME = "library_snapshot.parquet"
+
+SNAPSHOT_COLUMNS = ["arxiv_id", "version", "paper_id", "title", "authors", "published",
+                    "categories", "pdf_url", "entry_url", "abstract", "pages",
+                    "encrypted", "text_extracted"]
+
+if ARROW_AVAILABLE:
+    SNAPSHOT_SCHEMA = pa.schema([
+        ("arxiv_id", pa.string()),
+        ("version", pa.int16()),
+        ("paper_id", pa.string()),
+        ("title", pa.string()),
+        ("authors", pa.list_(pa.string())),
+        ("published", pa.date32()),
+        ("categories", pa.list_(pa.string())),
+        ("primary_category", pa.string()),
+        ("pdf_url", pa.string()),
+        ("entry_url", pa.string()),
+        ("abstract", pa.string()),
+        ("pages", pa.int32()),
+        ("encrypted", pa.bool_()),
+        ("text_extracted", pa.bool_()),
+        ("text_bytes", pa.int64()),
+    ])
+
+
+def _require_arrow():
+    if not ARROW_AVAILABLE:
+        raise ImportError("pyarrow is required for library snapshots: pip install pyarrow")
+
+
+def _parse_date(value):
+    try:
+        return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+
+
+def _flag(value):
+    return None if value is None else bool(value)
+
+
+def _text_sizes(catalog, text_dir):
+    """Uncompressed size of every extracted text file by file name, from the directory index and the pack"""
+    output_dir = os.path.dirname(os.path.abspath(text_dir))
+    sizes = {os.path.basename(path): size
+             for path, size in list_library_files(catalog, output_dir, "extracted_text", "_text.txt")}
+    if catalog.get_meta("text_store") == "pack":
+        # Packed frames win, as they do when the text is read
+        for row in catalog.query("SELECT key, size FROM text_store WHERE key LIKE 'extracted_text/%'"):
+            sizes[row["key"].rsplit("/", 1)[-1]] = row["size"]
+    return sizes
+
+
+def _record_batch(papers, text_sizes):
+    categories = [[c for c in (p["categories"] or "").split(", ") if c] for p in papers]
+    columns = {
+        "arxiv_id": [p["arxiv_id"] for p in papers],
+        "version": [p["version"] for p in papers],
+        "paper_id": [p["paper_id"] for p in papers],
+        "title": [p["title"] for p in papers],
+        "authors": [split_authors(p["authors"]) for p in papers],
+        "published": [_parse_date(p["published"]) for p in papers],
+        "categories": categories,
+        "primary_category": [cats[0] if cats else None for cats in categories],
+        "pdf_url": [p["pdf_url"] for p in papers],
+        "entry_url": [p["entry_url"] for p in papers],
+        "abstract": [p["abstract"] for p in papers],
+        "pages": [p["pages"] for p in papers],
+        "encrypted": [_flag(p["encrypted"]) for p in papers],
+        "text_extracted": [_flag(p["text_extracted"]) for p in papers],
+        "text_bytes": [text_sizes.get(f"{p['paper_id']}_text.txt") if p["paper_id"] else None for p in papers],
+    }
+    return pa.RecordBatch.from_pydict(columns, schema=SNAPSHOT_SCHEMA)
+
+
+def _iter_batches(catalog, text_dir, chunk_size):
+    text_sizes = _text_sizes(catalog, text_dir)
+    chunk = []
+    for paper in catalog.iter_papers(SNAPSHOT_COLUMNS, chunk_size=chunk_size):
+        chunk.append(paper)
+        if len(chunk) == chunk_size:
+            yield _record_batch(chunk, text_sizes)
+            chunk = []
+    if chunk:
+        yield _record_batch(chunk, text_sizes)
+
+
+def write_snapshot(catalog, text_dir, arrow_path=None, parquet_path=None, chunk_size=5000):
+    """Write the catalog as an Arrow IPC file and/or Parquet file, one record batch per chunk
+
+    Returns the number of papers written.
+    """
+    _require_arrow()
+    schema = SNAPSHOT_SCHEMA.with_metadata(
+        {"papers_modified": catalog.get_meta("papers_modified", "")}
+    )
+    arrow_writer = parquet_writer = None
+    rows = 0
+    try:
+        if arrow_path:
+            arrow_writer = ipc.new_file(arrow_path + ".tmp", schema)
+        if parquet_path:
+            parquet_writer = pq.ParquetWriter(parquet_path + ".tmp", schema, compression="zstd")
+        for batch in _iter_batches(catalog, text_dir, chunk_size):
+            rows += batch.num_rows
+            if arrow_writer:
+                arrow_writer.write_batch(batch)
+            if parquet_writer:
+                parquet_writer.write_batch(batch)
+    finally:
+        if arrow_writer:
+            arrow_writer.close()
+        if parquet_writer:
+            parquet_writer.close()
+    # Swap in atomically so readers never map a half-written file
+    for path in (arrow_path, parquet_path):
+        if path:
+            os.replace(path + ".tmp", path)
+    return rows
+
+
+def write_library_snapshot(output_dir, parquet=False):
+    """Snapshot a library directory's catalog next to it"""
+    with LibraryCatalog.for_library(output_dir) as catalog:
+        return write_snapshot(
+            catalog,
+            os.path.join(output_dir, "extracted_text"),
+            arrow_path=os.path.join(output_dir, SNAPSHOT_FILENAME),
+            parquet_path=os.path.join(output_dir, PARQUET_FILENAME) if parquet else None,
+        )
+
+
+def load_snapshot(path, columns=None):
+    """Load a snapshot as a pyarrow Table
+
+    Arrow IPC files are memory-mapped, so column scans read straight from
+    the page cache without copying or parsing.
+    """
+    _require_arrow()
+    if path.endswith(".parquet"):
+        return pq.read_table(path, columns=columns, memory_map=True)
+    table = ipc.open_file(pa.memory_map(path, "r")).read_all()
+    return table.select(columns) if columns else table
+
+
+def snapshot_is_current(output_dir):
+    """True when the Arrow snapshot was written after the catalog's last paper update"""
+    _require_arrow()
+    snapshot = os.path.join(output_dir, SNAPSHOT_FILENAME)
+    if not os.path.exists(snapshot):
+        return False
+    try:
+        metadata = ipc.open_file(pa.memory_map(snapshot, "r")).schema.metadata or {}
+    except pa.ArrowInvalid:
+        return False
+    with LibraryCatalog.for_library(output_dir) as catalog:
+        modified = catalog.get_meta("papers_modified", "")
+    return metadata.get(b"papers_modified", b"").decode() == modified
+
+
+def load_library_table(output_dir, columns=None):
+    """Library as a memory-mapped pyarrow Table, rewriting the snapshot first when stale
+
+    Returns None without pyarrow or a catalog. The rewrite scans the whole
+    catalog, so call this off the Tk thread.
+    """
+    if not (ARROW_AVAILABLE and os.path.exists(os.path.join(output_dir, "catalog.db"))):
+        return None
+    if not snapshot_is_current(output_dir):
+        write_library_snapshot(output_dir)
+    snapshot = os.path.join(output_dir, SNAPSHOT_FILENAME)
+    return load_snapshot(snapshot, columns) if os.path.exists(snapshot) else None
+
+
+def load_library_frame(output_dir, columns=None):
+    """Library as a pandas DataFrame, from the snapshot when current, otherwise metadata.csv"""
+    import pandas as pd
+
+    table = load_library_table(output_dir, columns)
+    if table is not None:
+        return table.to_pandas()
+    metadata_file = os.path.join(output_dir, "metadata.csv")
+    if os.path.exists(metadata_file):
+        return pd.read_csv(metadata_file)
+    return pd.DataFrame()
+
+
+def export_csv(catalog, output_path, chunk_size=1000):
+    """Stream the catalog to CSV with full abstracts; returns the number of rows"""
+    rows = 0
+    with open(output_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(SNAPSHOT_COLUMNS)
+        for paper in catalog.iter_papers(SNAPSHOT_COLUMNS, chunk_size=chunk_size):
+            writer.writerow([paper[column] for column in SNAPSHOT_COLUMNS])
+            rows += 1
+    return rows
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Library Watcher for Robotics Paper Fetcher
+Ingests PDFs dropped into pdfs/ (inotify on Linux, polling elsewhere) in debounced batches
+"""
+
+import os
+import re
+import sys
+import time
+import struct
+import select
+import threading
+
+from library_catalog import LibraryCatalog, parse_arxiv_id
+from library_layout import ensure_layout, index_file, paper_file, unindex_file
+from library_scanner import scan_library
+from pdf_extraction import PDF_AVAILABLE, ExtractionCache, extract_pdf
+from pdf_supervisor import EXTRACTION_TIMEOUT, EXTRACTION_MEMORY_MB, ExtractionFailed, quarantine_pdf
+
+try:
+    import ctypes
+    import ctypes.util
+    _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    INOTIFY_AVAILABLE = sys.platform.startswith("linux") and hasattr(_libc, "inotify_init1")
+except (ImportError, OSError):
+    INOTIFY_AVAILABLE = False
+
+# A file must be quiet this long before it is ingested (downloads and copies land in pieces)
+DEBOUNCE_SECONDS = 2.0
+BATCH_SIZE = 25
+POLL_SECONDS = 5.0
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF
+_EVENT_HEADER = struct.Struct("iIII")
+
+# The arXiv stamp PDFs carry in the margin, which extracts ahead of the title
+_ARXIV_STAMP_RE = re.compile(r"^arXiv:\S+\s+\[[^\]]*\]\s+\d{1,2}\s+\w{3}\s+\d{4}\s*")
+
+
+class _Inotify:
+    """Minimal inotify binding: watch folders, read (folder, name, mask) events"""
+
+    def __init__(self):
+        self.fd = _libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.folders = {}
+
+    def add(self, folder):
+        wd = _libc.inotify_add_watch(self.fd, os.fsencode(folder), _WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"cannot watch {folder}")
+        self.folders[wd] = folder
+
+    def read(self, timeout):
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events, offset = [], 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            folder = self.folders.get(wd)
+            if mask & _IN_IGNORED:
+                self.folders.pop(wd, None)
+            events.append((folder, name, mask))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+def _is_pdf(name):
+    return name.lower().endswith(".pdf")
+
+
+def guess_title(text, fallback):
+    """Title of a paper from the first lines of its extracted text"""
+    for line in (text or "").split("\n")[:10]:
+        line = _ARXIV_STAMP_RE.sub("", line.strip())
+        if 10 < len(line) < 200 and not line.startswith("--- Page"):
+            return line
+    return fallback
+
+
+def ingest_pdfs(output_dir, paths, removed=(), progress_callback=None,
+                timeout=EXTRACTION_TIMEOUT, memory_mb=EXTRACTION_MEMORY_MB):
+    """Run dropped PDFs through the library pipeline; returns the number of papers cataloged
+
+    Each PDF is moved to its shard folder (if the library is sharded),
+    indexed, extracted through the cache and upserted into the catalog
+    under the arXiv ID in its file name ("local:<name>" when there is
+    none). Removed paths are dropped from the directory index. The
+    semantic index then folds in the new papers when numpy is available.
+    """
+    log = progress_callback or (lambda message: None)
+    pdf_dir = os.path.join(output_dir, "pdfs")
+    text_dir = os.path.join(output_dir, "extracted_text")
+    records = []
+    with LibraryCatalog.for_library(output_dir) as catalog:
+        # Fix the layout before computing targets; the dropped files themselves must not decide it
+        ensure_layout(catalog, output_dir, ignore=paths)
+        cache = ExtractionCache(catalog)
+        for path in removed:
+            unindex_file(catalog, output_dir, path)
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            name = os.path.basename(path)
+            stem = name[:-4]
+            target = paper_file(pdf_dir, name)
+            if os.path.abspath(target) != os.path.abspath(path) and not os.path.exists(target):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(path, target)
+                unindex_file(catalog, output_dir, path)
+                path = target
+            index_file(catalog, output_dir, path)
+
+            arxiv_id, version = parse_arxiv_id(stem)
+            try:
+                result = extract_pdf(path, cache, paper_file(text_dir, f"{stem}_text.txt"),
+                                     extract_text=PDF_AVAILABLE, timeout=timeout, memory_mb=memory_mb)
+            except ExtractionFailed as e:
+                quarantine_pdf(catalog, path, e.reason, arxiv_id=arxiv_id, sha256=e.sha256)
+                log(f"[QUARANTINE] {name}: {e.reason}")
+                continue
+
+            existing = catalog.get_paper(arxiv_id) if arxiv_id else None
+            records.append({
+                "arxiv_id": arxiv_id or f"local:{stem}",
+                "version": version,
+                # A paper already cataloged keeps its own file and title
+                "paper_id": None if existing and existing["paper_id"] else stem,
+                "title": existing["title"] if existing else guess_title(result["text"], stem),
+                "pages": result["pages"],
+                "encrypted": result["encrypted"],
+                "text_extracted": bool(result["text"] or result["page_offsets"]),
+            })
+            log(f"[OK] Ingested {name} ({result['pages'] or '?'} pages{', cached' if result['cached'] else ''})")
+        catalog.upsert_papers(records)
+
+    if records:
+        try:
+            from semantic_search import update_library_index
+            indexed = update_library_index(output_dir)
+            if indexed:
+                log(f"[SEARCH] Added {indexed} papers to the semantic index")
+        except ImportError:
+            pass
+    return len(records)
+
+
+class LibraryWatcher:
+    """Watch a library's pdfs/ folder and pass new, changed or removed PDFs to on_batch
+
+    on_batch(paths, removed) runs on the watcher thread once a file has
+    been quiet for `debounce` seconds, with at most batch_size paths at a
+    time. inotify is used on Linux; elsewhere (or when it fails) pdfs/ is
+    polled through the incremental library scan. Both start with a
+    catch-up scan for PDFs that arrived while nothing was watching.
+    """
+
+    def __init__(self, output_dir, on_batch, on_error=None, debounce=DEBOUNCE_SECONDS,
+                 batch_size=BATCH_SIZE, poll_interval=POLL_SECONDS, use_inotify=True):
+        self.output_dir = output_dir
+        self.pdf_dir = os.path.join(output_dir, "pdfs")
+        self.on_batch = on_batch
+        self.on_error = on_error
+        self.debounce = debounce
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify and INOTIFY_AVAILABLE
+        self.backend = None
+        self._pending = {}
+        self._removed = set()
+        # (inode, size, mtime) of the files last handed to on_batch, to recognize the ingester's own moves
+        self._handed = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        """Stop watching; with a timeout, returns False if a batch is still being ingested"""
+        self._stop.set()
+        if self._thread:
+            # The thread is a daemon and exits on its own once its batch is done
+            self._thread.join(timeout)
+            return not self._thread.is_alive()
+        return True
+
+    def _queue(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        self._pending[path] = (time.monotonic(), stat.st_size, stat.st_mtime_ns)
+        self._removed.discard(path)
+
+    def _forget(self, path):
+        self._pending.pop(path, None)
+        self._removed.add(path)
+
+    def _catch_up(self, sweep=False):
+        """Queue PDFs changed since the last scan; sweep also queues indexed PDFs never extracted"""
+        with LibraryCatalog.for_library(self.output_dir) as catalog:
+            changed, removed = scan_library(catalog, self.output_dir)
+            keys = set(changed)
+            if sweep:
+                root = os.path.realpath(self.output_dir)
+                extracted = {row[0] for row in catalog.query("SELECT path FROM pdf_files")}
+                for row in catalog.query("SELECT path FROM library_files WHERE kind = 'pdfs'"):
+                    if os.path.join(root, *row[0].split("/")) not in extracted:
+                        keys.add(row[0])
+        for key in keys:
+            if key.startswith("pdfs/") and _is_pdf(key):
+                self._queue(os.path.join(self.output_dir, *key.split("/")))
+        for key in removed:
+            if key.startswith("pdfs/"):
+                self._forget(os.path.join(self.output_dir, *key.split("/")))
+
+    def _flush(self):
+        """Hand quiet files to on_batch; files still growing wait another debounce period"""
+        now = time.monotonic()
+        ready = []
+        # Events from the previous hand-off were read before this flush
+        self._handed = {}
+        for path, (seen, size, mtime) in list(self._pending.items()):
+            if now - seen < self.debounce:
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                del self._pending[path]
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime):
+                self._pending[path] = (now, stat.st_size, stat.st_mtime_ns)
+                continue
+            ready.append(path)
+            self._handed[path] = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        removed, self._removed = sorted(self._removed), set()
+        if not ready and not removed:
+            return
+        ready.sort()
+        for start in range(0, max(len(ready), 1), self.batch_size):
+            if start and self._stop.is_set():
+                # Left for the catch-up scan of the next watcher
+                break
+            batch = ready[start:start + self.batch_size]
+            for path in batch:
+                del self._pending[path]
+            try:
+                self.on_batch(batch, removed if start == 0 else [])
+            except Exception as e:
+                if self.on_error:
+                    self.on_error(e)
+
+    def _watch_tree(self, inotify):
+        inotify.add(self.pdf_dir)
+        for entry in os.scandir(self.pdf_dir):
+            if entry.is_dir():
+                inotify.add(entry.path)
+
+    def _handle(self, inotify, folder, name, mask):
+        if mask & _IN_Q_OVERFLOW:
+            # Events were dropped: the incremental scan finds what they were
+            self._catch_up()
+            return
+        if folder is None or not name:
+            return
+        path = os.path.join(folder, name)
+        if mask & _IN_ISDIR:
+            if mask & (_IN_CREATE | _IN_MOVED_TO):
+                # A new shard, possibly moved in with files already inside
+                inotify.add(path)
+                for entry in os.scandir(path):
+                    if entry.is_file() and _is_pdf(entry.name) and not self._own_move(entry.path, _IN_MOVED_TO):
+                        self._queue(entry.path)
+            return
+        if not _is_pdf(name):
+            return
+        if mask & (_IN_MOVED_FROM | _IN_MOVED_TO) and self._own_move(path, mask):
+            return
+        if mask & (_IN_CLOSE_WRITE | _IN_MOVED_TO):
+            self._queue(path)
+        elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+            self._forget(path)
+
+    def _own_move(self, path, mask):
+        """True for the rename of a just-handed file into its shard, which the ingester has already indexed"""
+        if mask & _IN_MOVED_FROM:
+            return path in self._handed
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        return path not in self._handed and (stat.st_ino, stat.st_size, stat.st_mtime_ns) in self._handed.values()
+
+    def _run(self):
+        os.makedirs(self.pdf_dir, exist_ok=True)
+        inotify = None
+        if self.use_inotify:
+            try:
+                inotify = _Inotify()
+                self._watch_tree(inotify)
+            except OSError as e:
+                if inotify:
+                    inotify.close()
+                inotify = None
+                if self.on_error:
+                    self.on_error(e)
+        self.backend = "inotify" if inotify else "polling"
+        swept = False
+        next_poll = time.monotonic() + self.poll_interval
+        try:
+            while not self._stop.is_set():
+                # One failed pass (a locked catalog, a folder removed mid-scan) must not end the watch
+                try:
+                    if not swept:
+                        self._catch_up(sweep=True)
+                        swept = True
+                    if inotify:
+                        for folder, name, mask in inotify.read(0.5):
+                            self._handle(inotify, folder, name, mask)
+                    else:
+                        self._stop.wait(min(0.5, max(0.0, next_poll - time.monotonic())))
+                        if time.monotonic() >= next_poll:
+                            self._catch_up()
+                            next_poll = time.monotonic() + self.poll_interval
+                    self._flush()
+                except Exception as e:
+                    if self.on_error:
+                        self.on_error(e)
+                    self._stop.wait(self.poll_interval)
+        finally:
+            if inotify:
+                inotify.close()
@@ -23,6 +23,11 @@ Examples:
     python main.py --cli              # Run command-line interface
     python main.py --gui              # Explicitly launch GUI
     python main.py --install         # Run installation script
+    python main.py --similar 2506.19146            # Papers similar to a library paper
+    python main.py --similar "tactile grasping"    # Papers similar to free text
+    python main.py --pack-text                      # Compress text and summaries into one pack file
+    python main.py --migrate-layout                 # Shard a flat library by arXiv ID prefix
+    python main.py --daemon                         # Run saved queries after each arXiv announcement
     
 For more information, visit: https://github.com/yourusername/robotics_paper_fetcher
         """
@@ -46,6 +51,135 @@ For more information, visit: https://github.com/yourusername/robotics_paper_fetc
         help='Run the installation script'
     )
     
+    parser.add_argument(
+        '--similar',
+        metavar='QUERY',
+        help='Find library papers similar to an arXiv ID or free-text query'
+    )
+    
+    parser.add_argument(
+        '--build-index',
+        action='store_true',
+        help='Build or update the offline semantic search index'
+    )
+    
+    parser.add_argument(
+        '--reading-list',
+        action='store_true',
+        help='Write a prioritized reading list (reading_list.md/.csv) for the library'
+    )
+    
+    parser.add_argument(
+        '--migrate-layout',
+        action='store_true',
+        help='Move a flat library into folders sharded by arXiv ID prefix (YYMM)'
+    )
+    
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Watch the library for PDFs dropped into pdfs/ and catalog them (Ctrl+C to stop)'
+    )
+    
+    parser.add_argument(
+        '--harvest',
+        action='store_true',
+        help='Harvest paper metadata (no PDFs) into the catalog over OAI-PMH, resuming an interrupted harvest'
+    )
+    
+    parser.add_argument(
+        '--harvest-from',
+        metavar='YYYY-MM-DD',
+        help='Harvest only records changed on or after this date'
+    )
+    
+    parser.add_argument(
+        '--harvest-until',
+        metavar='YYYY-MM-DD',
+        help='Harvest only records changed on or before this date'
+    )
+    
+    parser.add_argument(
+        '--categories',
+        nargs='+',
+        default=['cs.RO', 'cs.AI', 'eess.SY'],
+        metavar='CAT',
+        help='arXiv categories to harvest (default: cs.RO cs.AI eess.SY)'
+    )
+    
+    parser.add_argument(
+        '--materialize',
+        nargs='*',
+        metavar='ARXIV_ID',
+        help='Download PDFs for papers cataloged without one: the given IDs, else starred and top-ranked papers'
+    )
+    
+    parser.add_argument(
+        '--min-score',
+        type=float,
+        metavar='SCORE',
+        help='Reading-list score (0-1) a paper needs for --materialize (default: 0.5)'
+    )
+    
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='Run every saved query of the library (saved_queries.json) as one deduplicated job'
+    )
+    
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Keep running and fetch new papers for every saved query on a schedule'
+    )
+    
+    parser.add_argument(
+        '--schedule',
+        default='5 20 * * 0-4',
+        metavar='CRON',
+        help='Cron-style schedule for --daemon, in US Eastern time (default: "5 20 * * 0-4", '
+             'just after arXiv\'s announcements)'
+    )
+    
+    parser.add_argument(
+        '--import-ids',
+        metavar='FILE',
+        help='Fetch the papers listed in a file of arXiv IDs (text, CSV or BibTeX), skipping cataloged ones'
+    )
+    
+    parser.add_argument(
+        '--metadata-only',
+        action='store_true',
+        help='With --import-ids, --batch or --daemon, catalog the papers without downloading their PDFs'
+    )
+    
+    parser.add_argument(
+        '--pack-text',
+        action='store_true',
+        help='Move extracted text, summaries and AI notes into a compressed pack file'
+    )
+    
+    parser.add_argument(
+        '--unpack-text',
+        action='store_true',
+        help='Restore packed text files to plain files and stop packing'
+    )
+    
+    parser.add_argument(
+        '--library',
+        default='papers',
+        metavar='DIR',
+        help='Research library directory (default: papers)'
+    )
+    
+    parser.add_argument(
+        '--top',
+        type=int,
+        default=10,
+        metavar='N',
+        help='Number of results for --similar and --reading-list (default: 10)'
+    )
+    
     parser.add_argument(
         '--version', 
         action='version',
@@ -65,6 +199,148 @@ For more information, visit: https://github.com/yourusername/robotics_paper_fetc
             sys.exit(1)
         return
     
+    # Handle library layout migration
+    if args.migrate_layout:
+        from library_layout import migrate_library
+        print(f"📁 Sharding {args.library} by arXiv ID prefix...")
+        moved = migrate_library(args.library, progress_callback=print)
+        print(f"✅ Moved {moved} files into shards")
+        return
+    
+    # Handle watching the library for dropped PDFs
+    if args.watch:
+        import time
+        from library_watcher import LibraryWatcher, ingest_pdfs
+        
+        def on_batch(paths, removed):
+            ingested = ingest_pdfs(args.library, paths, removed, progress_callback=print)
+            if ingested:
+                print(f"✅ Cataloged {ingested} PDFs")
+        
+        watcher = LibraryWatcher(args.library, on_batch, on_error=lambda e: print(f"❌ {e}")).start()
+        print(f"👀 Watching {os.path.join(args.library, 'pdfs')} for new PDFs (Ctrl+C to stop)...")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            watcher.stop()
+        return
+    
+    # Handle bulk metadata harvesting
+    if args.harvest:
+        from oai_harvest import harvest_metadata
+        print(f"🌾 Harvesting {' '.join(args.categories)} metadata into {args.library}...")
+        try:
+            stored = harvest_metadata(args.library, args.categories, args.harvest_from, args.harvest_until,
+                                      progress_callback=print)
+        except KeyboardInterrupt:
+            print("⏸️  Harvest interrupted; run again to resume from the last page")
+            return
+        print(f"✅ Stored {stored} records")
+        return
+    
+    # Handle downloading PDFs for metadata-only papers
+    if args.materialize is not None:
+        from materialize import MIN_SCORE, materialize_papers, select_papers
+        if args.materialize:
+            papers = select_papers(args.library, args.materialize, min_score=args.min_score)
+        else:
+            papers = select_papers(args.library, starred=True, min_score=args.min_score or MIN_SCORE)
+        print(f"📥 Downloading {len(papers)} PDFs into {args.library}...")
+        downloaded = materialize_papers(args.library, papers, progress_callback=print)
+        print(f"✅ Downloaded {downloaded} PDFs")
+        return
+    
+    # Handle batch runs of saved queries
+    if args.batch:
+        from batch_runner import SAVED_QUERIES_FILENAME, load_saved_queries, run_batch
+        queries = load_saved_queries(args.library)
+        if not queries:
+            print(f"📭 No saved queries in {os.path.join(args.library, SAVED_QUERIES_FILENAME)}")
+            sys.exit(1)
+        print(f"🗂️  Running {len(queries)} saved queries: {', '.join(q['name'] for q in queries)}")
+        stats = run_batch(args.library, queries, progress_callback=print, download=not args.metadata_only)
+        print(f"✅ {stats['unique']} unique papers ({stats['new']} new) from {stats['results']} results, "
+              f"{stats['downloaded']} PDFs downloaded")
+        return
+    
+    # Handle the scheduled research daemon
+    if args.daemon:
+        import signal
+        from research_daemon import CronSchedule, ResearchDaemon
+        try:
+            schedule = CronSchedule(args.schedule)
+        except ValueError as e:
+            print(f"❌ Invalid schedule: {e}")
+            sys.exit(1)
+        daemon = ResearchDaemon(args.library, schedule, download=not args.metadata_only, progress_callback=print)
+        signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+        print(f"⏰ Running saved queries of {args.library} on schedule \"{args.schedule}\" (Ctrl+C to stop)...")
+        try:
+            daemon.run_forever()
+        except KeyboardInterrupt:
+            daemon.stop()
+        print(f"👋 Daemon stopped after {daemon.runs} runs")
+        return
+    
+    # Handle importing a list of arXiv IDs
+    if args.import_ids:
+        from id_import import import_ids, read_id_file
+        ids = read_id_file(args.import_ids)
+        print(f"📋 Importing {len(ids)} arXiv IDs from {args.import_ids}...")
+        cataloged, downloaded = import_ids(args.library, ids, progress_callback=print,
+                                           download=not args.metadata_only)
+        print(f"✅ Cataloged {cataloged} papers, downloaded {downloaded} PDFs")
+        return
+    
+    # Handle the compressed text store
+    if args.pack_text or args.unpack_text:
+        from text_store import ZSTD_AVAILABLE, open_store
+        store = open_store(args.library)
+        if args.unpack_text:
+            restored = store.unpack(progress_callback=print)
+            print(f"✅ Restored {restored} text files")
+            return
+        print(f"🗜️  Packing text files with {'zstd' if ZSTD_AVAILABLE else 'lzma (pip install zstandard for faster packing)'}...")
+        packed = store.pack(progress_callback=print)
+        reclaimed = store.compact()
+        print(f"✅ Packed {packed} files into {store.pack_path}"
+              + (f", reclaimed {reclaimed / 1e6:.1f} MB" if reclaimed else ""))
+        return
+    
+    # Handle reading list generation
+    if args.reading_list:
+        try:
+            from reading_list import generate_reading_list
+        except ImportError as e:
+            print(f"❌ Reading lists require numpy and scipy: {e}")
+            sys.exit(1)
+        md_path, csv_path, entries = generate_reading_list(args.library, k=args.top)
+        print(f"📚 Ranked {len(entries)} unread papers")
+        print(f"✅ Saved {md_path} and {csv_path}")
+        return
+    
+    # Handle semantic index and similarity search
+    if args.build_index or args.similar:
+        try:
+            from semantic_search import update_library_index, find_similar
+        except ImportError as e:
+            print(f"❌ Semantic search requires numpy and scipy: {e}")
+            sys.exit(1)
+        
+        if args.build_index:
+            print(f"🧠 Updating semantic index for {args.library}...")
+            indexed = update_library_index(args.library, progress_callback=print)
+            print(f"✅ Indexed {indexed} papers")
+        
+        if args.similar:
+            results = find_similar(args.library, args.similar, args.top)
+            if not results:
+                print("📭 No similar papers found. Run with --build-index first.")
+            for rank, (paper, score) in enumerate(results, 1):
+                print(f"{rank:2d}. [{score:.3f}] {paper['arxiv_id']}  {(paper.get('title') or '')[:80]}")
+        return
+    
     # Handle CLI mode
     if args.cli:
         print("🔍 Launching CLI mode...")
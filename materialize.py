@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+PDF Materializer for Robotics Paper Fetcher
+Downloads PDFs for cataloged papers that were fetched as metadata only
+"""
+
+import os
+import time
+import urllib.request
+
+from library_catalog import LibraryCatalog
+from library_layout import index_file, paper_file
+from pdf_extraction import PDF_AVAILABLE, ExtractionCache, extract_pdf
+from pdf_supervisor import EXTRACTION_TIMEOUT, EXTRACTION_MEMORY_MB, ExtractionFailed, quarantine_pdf, quarantine_reason
+from text_store import read_text, write_text
+
+# Default reading-list score a paper needs to be downloaded
+MIN_SCORE = 0.5
+# Pause between PDF downloads, as arXiv asks of automated clients
+DOWNLOAD_DELAY_SECONDS = 3.0
+DOWNLOAD_TIMEOUT = 120
+PENDING_STATUS = "**PDF Status:** Not downloaded"
+
+
+def summary_template(record, pages="N/A", pdf_status="Not downloaded"):
+    """Markdown summary template for a paper, filled in from its catalog record"""
+    return "".join([
+        f"# {record['title']}\n\n",
+        f"**Authors:** {record['authors']}\n\n",
+        f"**Published:** {record['published']}\n\n",
+        f"**arXiv URL:** {record['entry_url']}\n\n",
+        f"**Categories:** {record['categories']}\n\n",
+        f"**Pages:** {pages}\n\n",
+        f"**PDF Status:** {pdf_status}\n\n",
+        "## [LIST] Abstract\n\n",
+        f"{record['abstract']}\n\n",
+        "## [SEARCH] Summary\n\n...\n\n",
+        "## [BRAIN] What I Learned\n\n...\n\n",
+        "## 🔬 How It Can Be Improved\n\n...\n\n",
+        "## 🧪 Ideas for Extension\n\n...\n",
+    ])
+
+
+def paper_id_for(paper):
+    """File stem for a paper's PDF: its existing paper ID, else its arXiv ID and version"""
+    if paper.get("paper_id"):
+        return paper["paper_id"]
+    version = f"v{paper['version']}" if paper.get("version") else ""
+    return paper["arxiv_id"].replace("/", "_") + version
+
+
+def missing_pdfs(catalog, output_dir, arxiv_ids):
+    """Cataloged papers among arxiv_ids with no PDF in the library, in the order given"""
+    pdf_dir = os.path.join(output_dir, "pdfs")
+    papers = []
+    for arxiv_id in dict.fromkeys(arxiv_ids):
+        paper = catalog.get_paper(arxiv_id)
+        if paper and paper.get("pdf_url") and not os.path.exists(paper_file(pdf_dir, f"{paper_id_for(paper)}.pdf")):
+            papers.append(paper)
+    return papers
+
+
+def select_papers(output_dir, arxiv_ids=(), starred=False, min_score=None, top=500):
+    """Papers to materialize: given IDs, starred papers and reading-list picks scoring at least min_score
+
+    Ranking needs numpy (via reading_list); the top `top` ranked papers
+    are considered. Papers whose PDF is already held are left out.
+    """
+    wanted = list(arxiv_ids)
+    with LibraryCatalog.for_library(output_dir) as catalog:
+        if starred:
+            wanted.extend(catalog.starred_ids())
+    if min_score is not None:
+        from reading_list import rank_papers
+        wanted.extend(entry["arxiv_id"] for entry in rank_papers(output_dir, k=top) if entry["score"] >= min_score)
+    with LibraryCatalog.for_library(output_dir) as catalog:
+        return missing_pdfs(catalog, output_dir, wanted)
+
+
+def _download(url, path):
+    # Fetched aside and renamed, so pdfs/ never holds a partial file
+    temp_path = path + ".part"
+    try:
+        with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT) as response, open(temp_path, "wb") as f:
+            while True:
+                chunk = response.read(1 << 16)
+                if not chunk:
+                    break
+                f.write(chunk)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _mark_downloaded(summary_path, pages, encrypted):
+    """Fill in the page count and PDF status of a metadata-only summary template"""
+    summary = read_text(summary_path)
+    if summary and PENDING_STATUS in summary:
+        summary = summary.replace("**Pages:** N/A", f"**Pages:** {pages if pages is not None else 'N/A'}", 1)
+        summary = summary.replace(PENDING_STATUS,
+                                  f"**PDF Status:** {'Encrypted' if encrypted else 'Not encrypted'}", 1)
+        write_text(summary_path, summary)
+
+
+def materialize_papers(output_dir, papers, progress_callback=None, should_stop=None, create_txt_files=True,
+                       delay=DOWNLOAD_DELAY_SECONDS, limiter=None):
+    """Download and process the PDFs of cataloged papers; returns the number downloaded
+
+    Each PDF is stored under the paper's existing paper ID (so it lines up
+    with the summary template written at discovery), extracted through the
+    cache and its page count and text status recorded in the catalog.
+    Downloads are spaced by `delay`, or by a limiter shared with other work.
+    """
+    log = progress_callback or (lambda message: None)
+    pdf_dir = os.path.join(output_dir, "pdfs")
+    txt_dir = os.path.join(output_dir, "extracted_text")
+    summary_dir = os.path.join(output_dir, "summaries")
+    downloaded = 0
+    with LibraryCatalog.for_library(output_dir) as catalog:
+        cache = ExtractionCache(catalog)
+        for number, paper in enumerate(papers, start=1):
+            if should_stop and should_stop():
+                break
+            arxiv_id = paper["arxiv_id"]
+            reason = quarantine_reason(catalog, arxiv_id)
+            if reason:
+                log(f"[SKIP] {arxiv_id} is quarantined ({reason})")
+                continue
+            paper_id = paper_id_for(paper)
+            pdf_path = paper_file(pdf_dir, f"{paper_id}.pdf")
+            if limiter:
+                limiter.wait()
+            elif number > 1 and delay:
+                time.sleep(delay)
+            try:
+                os.makedirs(os.path.dirname(pdf_path), exist_ok=True)
+                _download(paper["pdf_url"], pdf_path)
+                index_file(catalog, output_dir, pdf_path)
+            except Exception as e:
+                log(f"[ERR] Failed to download {arxiv_id}: {str(e)[:100]}")
+                continue
+            downloaded += 1
+
+            txt_path = paper_file(txt_dir, f"{paper_id}_text.txt") if create_txt_files else None
+            try:
+                result = extract_pdf(pdf_path, cache, txt_path, extract_text=PDF_AVAILABLE,
+                                     timeout=EXTRACTION_TIMEOUT, memory_mb=EXTRACTION_MEMORY_MB)
+            except ExtractionFailed as e:
+                quarantine_pdf(catalog, pdf_path, e.reason, arxiv_id=arxiv_id, sha256=e.sha256)
+                log(f"[QUARANTINE] {arxiv_id}: {e.reason}")
+                continue
+            catalog.upsert_paper({
+                "arxiv_id": arxiv_id,
+                "title": paper["title"],
+                "paper_id": paper_id,
+                "pages": result["pages"],
+                "encrypted": result["encrypted"],
+                "text_extracted": bool(result["text"]),
+            })
+            catalog.record_version(arxiv_id, paper.get("version"), paper_id)
+            _mark_downloaded(paper_file(summary_dir, f"{paper_id}_summary.md"), result["pages"], result["encrypted"])
+            log(f"[OK] Downloaded {arxiv_id} ({number}/{len(papers)}, {result['pages'] or '?'} pages)")
+    return downloaded
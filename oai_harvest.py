@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+OAI-PMH Harvester for Robotics Paper Fetcher
+Streams arXiv metadata into the catalog with ListRecords, resuming from a checkpoint on disk
+"""
+
+import os
+import json
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+from library_catalog import LibraryCatalog, parse_arxiv_id
+
+OAI_BASE_URL = "https://oaipmh.arxiv.org/oai"
+METADATA_PREFIX = "arXiv"
+CHECKPOINT_FILENAME = "oai_harvest.json"
+DEFAULT_CATEGORIES = ("cs.RO", "cs.AI", "eess.SY")
+# Records written to the catalog per transaction
+BATCH_SIZE = 500
+REQUEST_TIMEOUT = 120
+MAX_RETRIES = 5
+# Wait when the server sends 503 without a Retry-After header
+DEFAULT_RETRY_SECONDS = 30
+
+_OAI = "{http://www.openarchives.org/OAI/2.0/}"
+_ARXIV = "{http://arxiv.org/OAI/arXiv/}"
+
+
+class HarvestError(Exception):
+    """The OAI-PMH server answered with an error other than an empty result"""
+
+    def __init__(self, code, message):
+        super().__init__(f"{code}: {message}")
+        self.code = code
+
+
+def harvest_sets(categories):
+    """OAI sets covering some categories: their archives (cs.RO -> cs), filtered locally"""
+    return sorted({category.split(".", 1)[0] for category in categories})
+
+
+def load_checkpoint(output_dir):
+    """Saved harvest state per set, or {} when nothing was harvested yet"""
+    try:
+        with open(os.path.join(output_dir, CHECKPOINT_FILENAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_checkpoint(output_dir, checkpoint):
+    # Written aside and renamed, so a crash leaves the previous checkpoint intact
+    path = os.path.join(output_dir, CHECKPOINT_FILENAME)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def _text(element, path):
+    found = element.find(path)
+    return " ".join(found.text.split()) if found is not None and found.text else None
+
+
+def record_from_oai(metadata):
+    """Build a catalog record from an arXiv-format OAI metadata element"""
+    arxiv_id, _ = parse_arxiv_id(_text(metadata, f"{_ARXIV}id"))
+    if not arxiv_id:
+        return None
+    authors = []
+    for author in metadata.iterfind(f"{_ARXIV}authors/{_ARXIV}author"):
+        name = " ".join(part for part in (_text(author, f"{_ARXIV}forenames"),
+                                          _text(author, f"{_ARXIV}keyname"),
+                                          _text(author, f"{_ARXIV}suffix")) if part)
+        if name:
+            authors.append(name)
+    return {
+        "arxiv_id": arxiv_id,
+        "title": _text(metadata, f"{_ARXIV}title"),
+        "authors": ", ".join(authors),
+        "published": _text(metadata, f"{_ARXIV}created"),
+        "categories": ", ".join((_text(metadata, f"{_ARXIV}categories") or "").split()),
+        "pdf_url": f"http://arxiv.org/pdf/{arxiv_id}",
+        "entry_url": f"http://arxiv.org/abs/{arxiv_id}",
+        "abstract": _text(metadata, f"{_ARXIV}abstract"),
+    }
+
+
+def _open(url):
+    """Open an OAI request, waiting out 503 Retry-After responses (the server's flow control)"""
+    for attempt in range(MAX_RETRIES):
+        try:
+            return urllib.request.urlopen(url, timeout=REQUEST_TIMEOUT)
+        except urllib.error.HTTPError as e:
+            if e.code != 503 or attempt == MAX_RETRIES - 1:
+                raise
+            retry_after = e.headers.get("Retry-After", "")
+            time.sleep(int(retry_after) if retry_after.isdigit() else DEFAULT_RETRY_SECONDS)
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            if attempt == MAX_RETRIES - 1:
+                raise
+            time.sleep(DEFAULT_RETRY_SECONDS)
+
+
+def list_records(url, on_record):
+    """Stream one ListRecords response; returns its resumption token (None on the last page)
+
+    on_record(datestamp, metadata) is called per record, with metadata None
+    for deleted ones. The response is parsed as it arrives and each record
+    is released once handled, so a page of abstracts never sits in memory whole.
+    """
+    token = None
+    with _open(url) as response:
+        for _, element in ET.iterparse(response):
+            if element.tag == f"{_OAI}record":
+                header = element.find(f"{_OAI}header")
+                datestamp = _text(header, f"{_OAI}datestamp")
+                deleted = header.get("status") == "deleted"
+                on_record(datestamp, None if deleted else element.find(f"{_OAI}metadata/{_ARXIV}arXiv"))
+                element.clear()
+            elif element.tag == f"{_OAI}resumptionToken":
+                token = (element.text or "").strip() or None
+            elif element.tag == f"{_OAI}error":
+                code = element.get("code")
+                if code != "noRecordsMatch":
+                    raise HarvestError(code, (element.text or "").strip())
+    return token
+
+
+def _request_url(base_url, token, oai_set, date_from, date_until):
+    if token:
+        params = {"verb": "ListRecords", "resumptionToken": token}
+    else:
+        params = {"verb": "ListRecords", "metadataPrefix": METADATA_PREFIX, "set": oai_set}
+        if date_from:
+            params["from"] = date_from
+        if date_until:
+            params["until"] = date_until
+    return f"{base_url}?{urllib.parse.urlencode(params)}"
+
+
+def harvest_metadata(output_dir, categories=DEFAULT_CATEGORIES, date_from=None, date_until=None,
+                     progress_callback=None, should_stop=None, base_url=OAI_BASE_URL):
+    """Harvest metadata of papers in some categories into the catalog; returns the number of records stored
+
+    Each archive's set is listed page by page; records in the requested
+    categories are upserted in batches, then the page's resumption token is
+    checkpointed, so an interrupted harvest resumes at the page it was on.
+    Dates (YYYY-MM-DD) select by OAI datestamp, the last metadata change.
+    No PDFs are downloaded.
+    """
+    log = progress_callback or (lambda message: None)
+    wanted = set(categories)
+    checkpoint = load_checkpoint(output_dir)
+    stored = 0
+    with LibraryCatalog.for_library(output_dir) as catalog:
+        for oai_set in harvest_sets(categories):
+            state = checkpoint.get(oai_set)
+            if not state or (state["from"], state["until"]) != (date_from, date_until) or state["complete"]:
+                state = {"from": date_from, "until": date_until, "token": None, "last_datestamp": None,
+                         "seen": 0, "stored": 0, "pages": 0, "complete": False}
+                checkpoint[oai_set] = state
+            elif state["token"]:
+                log(f"[HARVEST] Resuming {oai_set} after {state['seen']} records")
+            list_from, stored_before = date_from, state["stored"]
+
+            while not (should_stop and should_stop()):
+                url = _request_url(base_url, state["token"], oai_set, list_from, date_until)
+                batch = []
+
+                def on_record(datestamp, metadata):
+                    state["seen"] += 1
+                    state["last_datestamp"] = datestamp or state["last_datestamp"]
+                    record = record_from_oai(metadata) if metadata is not None else None
+                    if record and wanted & set(record["categories"].split(", ")):
+                        batch.append(record)
+                        if len(batch) >= BATCH_SIZE:
+                            state["stored"] += catalog.upsert_papers(batch)
+                            batch.clear()
+
+                try:
+                    token = list_records(url, on_record)
+                except HarvestError as e:
+                    if e.code != "badResumptionToken" or not state["token"]:
+                        raise
+                    # Expired token: list again from the last datestamp seen (arXiv lists in datestamp order)
+                    log(f"[HARVEST] Resumption token expired; restarting {oai_set} from {state['last_datestamp']}")
+                    state["token"], list_from = None, state["last_datestamp"] or date_from
+                    continue
+                state["stored"] += catalog.upsert_papers(batch)
+                state["pages"] += 1
+                state["token"] = token
+                state["complete"] = token is None
+                state["updated"] = datetime.now().isoformat(timespec="seconds")
+                _save_checkpoint(output_dir, checkpoint)
+                log(f"[HARVEST] {oai_set}: {state['seen']} records read, {state['stored']} in "
+                    f"{', '.join(sorted(wanted))}")
+                if state["complete"]:
+                    break
+            stored += state["stored"] - stored_before
+    return stored
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Paper List for Robotics Paper Fetcher
+A Treeview that renders only its visible rows, paged from the library catalog
+"""
+
+import os
+from tkinter import ttk
+
+from library_catalog import parse_arxiv_id
+from library_layout import library_key, paper_file
+
+# (column, heading, width, sortable)
+COLUMNS = [
+    ("arxiv_id", "arXiv ID", 110, True),
+    ("title", "Title", 380, True),
+    ("authors", "Authors", 200, True),
+    ("published", "Published", 90, True),
+    ("pages", "Pages", 60, True),
+    ("size", "Size (MB)", 80, False),
+]
+PAGE_SIZE = 200
+# Pages kept in memory while scrolling
+CACHED_PAGES = 20
+FILTER_DELAY_MS = 250
+DEFAULT_ROW_HEIGHT = 20
+
+
+class PaperListModel:
+    """Filtered, sorted rows of the library, fetched from the catalog a page at a time
+
+    Each row is joined to its own PDF through the paper ID, so the listing
+    stays right however files were added or deleted. Libraries without
+    catalog entries (PDFs but no metadata) list their PDF files instead.
+    """
+
+    def __init__(self, catalog, output_dir):
+        self.catalog = catalog
+        self.output_dir = output_dir
+        self.pdf_dir = os.path.join(output_dir, "pdfs")
+        self.filter_text = ""
+        self.sort_column = "published"
+        self.descending = True
+        self.files_only = not catalog.count()
+        self.refresh()
+
+    def refresh(self):
+        """Forget fetched pages and counts, e.g. after the library changed"""
+        self._pages = {}
+        self._count = None
+        self._files = None
+
+    def set_filter(self, text):
+        text = text.strip()
+        if text != self.filter_text:
+            self.filter_text = text
+            self.refresh()
+
+    def set_sort(self, column):
+        """Sort by a column; choosing the current column again flips the direction"""
+        if column == self.sort_column:
+            self.descending = not self.descending
+        else:
+            self.sort_column, self.descending = column, column in ("published", "pages")
+        self.refresh()
+
+    def _where(self):
+        if not self.filter_text:
+            return None, ()
+        pattern = f"%{self.filter_text}%"
+        return "(title LIKE ? OR authors LIKE ? OR arxiv_id LIKE ?)", (pattern, pattern, pattern)
+
+    def __len__(self):
+        if self._count is None:
+            if self.files_only:
+                self._count = len(self._file_rows())
+            else:
+                where, params = self._where()
+                self._count = self.catalog.count(where, params)
+        return self._count
+
+    def _file_rows(self):
+        if self._files is None:
+            needle = self.filter_text.lower()
+            # Straight from the index: an unindexed library shows nothing until its scan finishes
+            rows = self.catalog.query("SELECT path, size FROM library_files WHERE kind = 'pdfs' AND path LIKE '%.pdf'")
+            self._files = []
+            for row in rows:
+                name = row["path"].rsplit("/", 1)[-1]
+                if needle in name.lower():
+                    self._files.append({
+                        "arxiv_id": parse_arxiv_id(name)[0] or "", "title": name, "authors": "", "published": "",
+                        "pages": "", "size": row["size"],
+                        "path": os.path.join(self.output_dir, *row["path"].split("/"))
+                    })
+            if self.sort_column in ("arxiv_id", "title"):
+                self._files.sort(key=lambda row: row[self.sort_column], reverse=self.descending)
+        return self._files
+
+    def _page(self, number):
+        if number not in self._pages:
+            if len(self._pages) >= CACHED_PAGES:
+                self._pages.pop(next(iter(self._pages)))
+            if self.files_only:
+                self._pages[number] = self._file_rows()[number * PAGE_SIZE:(number + 1) * PAGE_SIZE]
+            else:
+                where, params = self._where()
+                rows = self.catalog.page_papers(
+                    ["arxiv_id", "paper_id", "title", "authors", "published", "pages"], where, params,
+                    self.sort_column, self.descending, number * PAGE_SIZE, PAGE_SIZE
+                )
+                self._attach_files(rows)
+                self._pages[number] = rows
+        return self._pages[number]
+
+    def _attach_files(self, rows):
+        """Add each row's PDF path and size (from the directory index, not the disk)"""
+        keys = {}
+        for row in rows:
+            row["path"] = paper_file(self.pdf_dir, f"{row['paper_id']}.pdf") if row["paper_id"] else None
+            row["size"] = None
+            if row["path"]:
+                keys[library_key(self.output_dir, row["path"])] = row
+        if keys:
+            placeholders = ", ".join("?" * len(keys))
+            for found in self.catalog.query(
+                    f"SELECT path, size FROM library_files WHERE path IN ({placeholders})", tuple(keys)):
+                keys[found["path"]]["size"] = found["size"]
+
+    def rows(self, offset, limit):
+        """Rows [offset, offset + limit) of the current filter and sort order"""
+        rows = []
+        for number in range(offset // PAGE_SIZE, (offset + limit - 1) // PAGE_SIZE + 1):
+            page = self._page(number)
+            start = max(offset - number * PAGE_SIZE, 0)
+            rows.extend(page[start:offset + limit - number * PAGE_SIZE])
+        return rows[:limit]
+
+
+class VirtualPaperList(ttk.Frame):
+    """Paper list that holds only as many Treeview items as fit on screen
+
+    The scrollbar and mouse wheel move a row offset into the model; every
+    move replaces the handful of visible items, so opening and scrolling
+    cost the same with a hundred papers or a hundred thousand.
+    """
+
+    def __init__(self, parent, model, on_open=None, on_change=None):
+        super().__init__(parent)
+        self.model = model
+        self.on_open = on_open
+        self.on_change = on_change
+        self.offset = 0
+        self.visible = 20
+        self.selected = None
+        self._filter_job = None
+
+        self.tree = ttk.Treeview(self, columns=[c[0] for c in COLUMNS], show="headings", selectmode="browse")
+        for column, heading, width, sortable in COLUMNS:
+            self.tree.heading(column, text=heading,
+                              command=(lambda c=column: self.sort_by(c)) if sortable else "")
+            self.tree.column(column, width=width, stretch=column == "title",
+                             anchor="w" if column in ("title", "authors") else "center")
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        try:
+            self.row_height = int(ttk.Style().lookup("Treeview", "rowheight") or DEFAULT_ROW_HEIGHT)
+        except (TypeError, ValueError):
+            self.row_height = DEFAULT_ROW_HEIGHT
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1, "units", 3))
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-1, "units", 3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(1, "units", 3))
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<Double-1>", self._on_double_click)
+        self.tree.bind("<Return>", self._on_double_click)
+        for key, step in (("<Up>", -1), ("<Down>", 1), ("<Prior>", None), ("<Next>", None)):
+            self.tree.bind(key, lambda e, step=step, key=key: self._on_key(key, step))
+        self.tree.bind("<Home>", lambda e: self._select(0))
+        self.tree.bind("<End>", lambda e: self._select(len(self.model) - 1))
+        self.render()
+
+    def render(self):
+        """Replace the visible items with rows [offset, offset + visible)"""
+        total = len(self.model)
+        self.offset = max(0, min(self.offset, total - self.visible))
+        rows = self.model.rows(self.offset, self.visible) if total else []
+        self.tree.delete(*self.tree.get_children())
+        for index, row in enumerate(rows, start=self.offset):
+            size = f"{row['size'] / (1024*1024):.2f}" if row.get("size") is not None else ""
+            self.tree.insert("", "end", iid=str(index), values=(
+                row["arxiv_id"] or "", row["title"] or "", row["authors"] or "",
+                (row["published"] or "")[:10], row["pages"] if row["pages"] is not None else "", size
+            ))
+        if self.selected is not None and self.tree.exists(str(self.selected)):
+            self.tree.selection_set(str(self.selected))
+            self.tree.focus(str(self.selected))
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.visible) / total))
+        else:
+            self.scrollbar.set(0, 1)
+        for column, heading, _, _ in COLUMNS:
+            arrow = (" ▼" if self.model.descending else " ▲") if column == self.model.sort_column else ""
+            self.tree.heading(column, text=heading + arrow)
+        if self.on_change:
+            self.on_change(total)
+
+    def scroll(self, amount, what="units", step=1):
+        rows = self.visible - 1 if what == "pages" else step
+        self.offset += amount * rows
+        self.render()
+        return "break"
+
+    def _on_scrollbar(self, action, amount, what=None):
+        if action == "moveto":
+            self.offset = int(float(amount) * len(self.model))
+            self.render()
+        else:
+            self.scroll(int(amount), what)
+
+    def _on_resize(self, event):
+        # The heading row takes about one row's height
+        visible = max(1, event.height // self.row_height - 1)
+        if visible != self.visible:
+            self.visible = visible
+            self.render()
+
+    def _on_select(self, event=None):
+        selection = self.tree.selection()
+        if selection:
+            self.selected = int(selection[0])
+
+    def _select(self, index):
+        total = len(self.model)
+        if not total:
+            return "break"
+        index = max(0, min(index, total - 1))
+        self.selected = index
+        if index < self.offset:
+            self.offset = index
+        elif index >= self.offset + self.visible:
+            self.offset = index - self.visible + 1
+        self.render()
+        return "break"
+
+    def _on_key(self, key, step):
+        current = self.selected if self.selected is not None else self.offset - 1
+        if step is None:
+            step = (self.visible - 1) * (-1 if key == "<Prior>" else 1)
+        return self._select(current + step)
+
+    def _on_double_click(self, event=None):
+        if self.on_open and self.selected is not None:
+            rows = self.model.rows(self.selected, 1)
+            if rows:
+                self.on_open(rows[0])
+
+    def sort_by(self, column):
+        self.model.set_sort(column)
+        self.offset, self.selected = 0, None
+        self.render()
+
+    def filter_later(self, text):
+        """Filter as the user types, once typing pauses"""
+        if self._filter_job:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(FILTER_DELAY_MS, self._apply_filter, text)
+
+    def _apply_filter(self, text):
+        self._filter_job = None
+        self.model.set_filter(text)
+        self.offset, self.selected = 0, None
+        self.render()
+
+    def reload(self):
+        self.model.refresh()
+        self.render()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+PDF Extraction for Robotics Paper Fetcher
+Page text extraction with a persistent cache keyed by the SHA-256 of the PDF bytes
+"""
+
+import os
+import json
+import time
+import hashlib
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+
+from pdf_probe import ProbeError, map_file, probe_pdf
+from pdf_supervisor import ExtractionFailed, TIMEOUT_PER_PAGE, run_supervised
+from text_store import read_text, text_exists, write_text
+
+try:
+    import PyPDF2
+    PDF_AVAILABLE = True
+except ImportError:
+    PDF_AVAILABLE = False
+
+PAGE_HEADER = "\n--- Page {} ---\n"
+# Documents with at least this many pages may be split across worker processes
+PARALLEL_MIN_PAGES = 100
+PAGES_PER_TASK = 20
+# Page-range workers give up this long before a supervised parse would be killed, so they are cleaned up
+DEADLINE_MARGIN = 2.0
+
+
+def file_sha256(path, data=None):
+    """SHA-256 of a file, hashed from its memory map (or an already mapped buffer)"""
+    if data is not None:
+        return hashlib.sha256(data).hexdigest()
+    with map_file(path) as data:
+        return hashlib.sha256(data).hexdigest()
+
+
+def join_pages(page_texts):
+    """Lay pages out as "--- Page N ---" blocks; returns (text, start offset of each block)"""
+    parts, offsets, position = [], [], 0
+    for number, page_text in enumerate(page_texts, 1):
+        block = f"{PAGE_HEADER.format(number)}{page_text}\n"
+        offsets.append(position)
+        parts.append(block)
+        position += len(block)
+    return "".join(parts), offsets
+
+
+def split_pages(text, offsets):
+    """Page blocks of a text laid out by join_pages"""
+    bounds = list(offsets) + [len(text)]
+    return [text[bounds[i]:bounds[i + 1]] for i in range(len(offsets))]
+
+
+class ExtractionCache:
+    """PDF facts stored in the library catalog, keyed by content hash
+
+    Files are first matched on (path, size, mtime) so unchanged PDFs are
+    never re-hashed; a moved or re-downloaded file with identical bytes
+    still hits through its digest.
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+
+    def digest(self, path, data=None):
+        path = os.path.realpath(path)
+        stat = os.stat(path)
+        rows = self.catalog.query(
+            "SELECT sha256 FROM pdf_files WHERE path = ? AND size = ? AND mtime_ns = ?",
+            (path, stat.st_size, stat.st_mtime_ns)
+        )
+        if rows:
+            return rows[0][0]
+        sha256 = file_sha256(path, data)
+        self.catalog.execute(
+            "INSERT OR REPLACE INTO pdf_files (path, size, mtime_ns, sha256) VALUES (?, ?, ?, ?)",
+            (path, stat.st_size, stat.st_mtime_ns, sha256)
+        )
+        return sha256
+
+    def get(self, sha256):
+        rows = self.catalog.query("SELECT * FROM pdf_cache WHERE sha256 = ?", (sha256,))
+        if not rows:
+            return None
+        entry = dict(rows[0])
+        entry["encrypted"] = bool(entry["encrypted"])
+        entry["text_extracted"] = bool(entry["text_extracted"])
+        entry["page_offsets"] = json.loads(entry["page_offsets"]) if entry["page_offsets"] else None
+        entry["errors"] = json.loads(entry["errors"]) if entry["errors"] else []
+        return entry
+
+    def put(self, sha256, size, pages, encrypted, page_offsets=None, errors=None):
+        self.catalog.execute(
+            "INSERT OR REPLACE INTO pdf_cache "
+            "(sha256, size, pages, encrypted, text_extracted, page_offsets, errors, updated) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (sha256, size, pages, int(bool(encrypted)), int(page_offsets is not None),
+             json.dumps(page_offsets) if page_offsets is not None else None,
+             json.dumps(errors or []), datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        )
+
+    def lookup(self, path, data=None):
+        """(sha256, cached entry or None) for a PDF on disk"""
+        sha256 = self.digest(path, data)
+        return sha256, self.get(sha256)
+
+
+def _extract_page_range(task):
+    """Worker: map the PDF again and extract pages [start, stop)"""
+    path, start, stop = task
+    texts, errors = [], []
+    with map_file(path) as data:
+        reader = PyPDF2.PdfReader(data)
+        for number in range(start, stop):
+            try:
+                texts.append(reader.pages[number].extract_text() or "")
+            except Exception as e:
+                texts.append("")
+                errors.append(f"page {number + 1}: {e}")
+    return texts, errors
+
+
+def _kill_pool(executor):
+    """Stop a process pool at once: drop queued page ranges and kill the workers busy with others"""
+    processes = list((getattr(executor, "_processes", None) or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.kill()
+    for process in processes:
+        process.join()
+
+
+def extract_pages_parallel(path, pages, workers=None, deadline=None):
+    """Extract a long document's pages in worker processes; returns (page texts in order, errors)
+
+    deadline is a time.time() value; past it, or when any range fails,
+    the pool is killed and TimeoutError (or the failure) is raised.
+    """
+    tasks = [(path, start, min(start + PAGES_PER_TASK, pages)) for start in range(0, pages, PAGES_PER_TASK)]
+    page_texts, errors = [], []
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [executor.submit(_extract_page_range, task) for task in tasks]
+        # Collected in task order, so the ranges stitch back together directly
+        for future in futures:
+            remaining = None if deadline is None else max(0.0, deadline - time.time())
+            try:
+                texts, range_errors = future.result(timeout=remaining)
+            except FutureTimeout:
+                raise TimeoutError(f"page extraction ran past its deadline ({len(page_texts)}/{pages} pages done)")
+            page_texts.extend(texts)
+            errors.extend(range_errors)
+    except BaseException:
+        _kill_pool(executor)
+        raise
+    executor.shutdown()
+    return page_texts, errors
+
+
+def parse_pdf(data, extract_text=True, skip_encrypted=True, path=None, workers=1, deadline=None):
+    """Parse a mapped PDF with PyPDF2; returns (pages, encrypted, page texts or None, errors)
+
+    PyPDF2 reads the mmap like a file, so it seeks within the mapping
+    instead of copying the document into a BytesIO as it does for paths.
+    Given the path and more than one worker (None means all cores), documents of
+    PARALLEL_MIN_PAGES or more are extracted by page range in parallel,
+    within the deadline (a time.time() value) if one is given.
+    """
+    errors = []
+    if not len(data):
+        return None, False, None, ["document: empty file"]
+    try:
+        reader = PyPDF2.PdfReader(data)
+    except Exception as e:
+        # Recorded like any other error so a broken file is not re-parsed every run
+        return None, False, None, [f"document: {e}"]
+    encrypted = reader.is_encrypted
+    try:
+        pages = len(reader.pages)
+    except Exception as e:
+        return None, encrypted, None, [f"page tree: {e}"]
+    if not extract_text or (encrypted and skip_encrypted):
+        return pages, encrypted, None, errors
+    workers = workers or os.cpu_count() or 1
+    if path and workers > 1 and pages >= PARALLEL_MIN_PAGES:
+        page_texts, errors = extract_pages_parallel(path, pages, workers, deadline)
+        return pages, encrypted, page_texts, errors
+    page_texts = []
+    for number, page in enumerate(reader.pages, 1):
+        try:
+            page_texts.append(page.extract_text() or "")
+        except Exception as e:
+            page_texts.append("")
+            errors.append(f"page {number}: {e}")
+    return pages, encrypted, page_texts, errors
+
+
+def pdf_facts(data):
+    """(pages, encrypted, errors) from the trailer and page tree, falling back to a full parse"""
+    try:
+        pages, encrypted = probe_pdf(data)
+        return pages, encrypted, []
+    except ProbeError:
+        if not PDF_AVAILABLE:
+            raise
+    pages, encrypted, _, errors = parse_pdf(data, extract_text=False)
+    return pages, encrypted, errors
+
+
+def _parse_file(path, extract_text, skip_encrypted, workers, deadline=None):
+    """Supervised worker entry point: map the file and parse it"""
+    with map_file(path) as data:
+        if extract_text:
+            return parse_pdf(data, True, skip_encrypted, path, workers, deadline)
+        pages, encrypted, errors = pdf_facts(data)
+        return pages, encrypted, None, errors
+
+
+def parse_supervised(path, data, extract_text, skip_encrypted, workers, timeout, memory_mb):
+    """parse_pdf in a child process with a timeout scaled by page count; raises ExtractionFailed"""
+    try:
+        pages, encrypted = probe_pdf(data)
+        if not extract_text or (encrypted and skip_encrypted):
+            return pages, encrypted, None, []
+    except ProbeError:
+        pages = None
+    limit = timeout + TIMEOUT_PER_PAGE * (pages or 0)
+    deadline = time.time() + max(limit - DEADLINE_MARGIN, limit / 2)
+    return run_supervised(_parse_file, (path, extract_text, skip_encrypted, workers, deadline), limit, memory_mb)
+
+
+def extract_pdf(path, cache=None, text_path=None, extract_text=True, skip_encrypted=True, workers=1,
+                timeout=None, memory_mb=None):
+    """PDF facts and (optionally) text, served from the cache when the PDF is unchanged
+
+    When text_path is given the page text is written there (or into the
+    library's text pack), and a later call finds it through the cached page
+    offsets instead of re-parsing.
+    workers > 1 (or None for all cores) splits long documents across
+    processes. With a timeout (seconds) parsing runs in a supervised child
+    process; a timeout, memory blow-up or crash is cached as an error and
+    raised as ExtractionFailed. Returns a dict with sha256, pages,
+    encrypted, text, page_offsets, errors and cached.
+    """
+    with map_file(path) as data:
+        sha256, entry = cache.lookup(path, data) if cache else (None, None)
+        if entry:
+            result = {"sha256": sha256, "pages": entry["pages"], "encrypted": entry["encrypted"],
+                      "text": None, "page_offsets": entry["page_offsets"], "errors": entry["errors"],
+                      "cached": True}
+            # Unreadable documents are not retried until their bytes change
+            if not extract_text or entry["pages"] is None or (entry["encrypted"] and skip_encrypted):
+                return result
+            if entry["text_extracted"] and text_path and text_exists(text_path):
+                result["text"] = read_text(text_path)
+                return result
+
+        size = len(data)
+        if timeout:
+            try:
+                pages, encrypted, page_texts, errors = parse_supervised(
+                    path, data, extract_text, skip_encrypted, workers, timeout, memory_mb)
+            except ExtractionFailed as e:
+                # Cached like an unreadable file so it is not retried until its bytes change
+                if cache:
+                    cache.put(sha256, size, None, False, None, [f"quarantined: {e.reason}"])
+                e.sha256 = sha256
+                raise
+        elif extract_text:
+            pages, encrypted, page_texts, errors = parse_pdf(data, extract_text, skip_encrypted, path, workers)
+        else:
+            pages, encrypted, errors = pdf_facts(data)
+            page_texts = None
+    text = offsets = None
+    if page_texts is not None:
+        text, offsets = join_pages(page_texts)
+        if text_path and text.strip():
+            write_text(text_path, text)
+        elif text_path:
+            # Nothing was written, so a cache hit could not serve this text
+            offsets = None
+    if cache:
+        cache.put(sha256, size, pages, encrypted, offsets, errors)
+    return {"sha256": sha256, "pages": pages, "encrypted": encrypted, "text": text,
+            "page_offsets": offsets, "errors": errors, "cached": False}
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+PDF Probe for Robotics Paper Fetcher
+Reads page count and encryption from the trailer and page tree without a full parse
+"""
+
+import re
+import mmap
+import zlib
+from contextlib import contextmanager
+
+_STARTXREF_RE = re.compile(rb"startxref\s+(\d+)")
+_WHITESPACE_RE = re.compile(rb"[\s\x00]*")
+_OBJ_RE = re.compile(rb"(\d+)\s+(\d+)\s+obj\b")
+_SUBSECTION_RE = re.compile(rb"(\d+)\s+(\d+)[ \t]*\r?\n?")
+_ENTRY_RE = re.compile(rb"(\d{10})\s(\d{5})\s([nf])[ \t]*\r?\n?")
+_INT_RE = re.compile(rb"\s*(\d+)")
+_STREAM_RE = re.compile(rb"\s*stream\r?\n")
+
+# Bytes searched back from the end of the file for "startxref"
+TAIL_BYTES = 2048
+
+
+class ProbeError(Exception):
+    """Raised when a PDF's structure cannot be read without a full parse"""
+
+
+def _skip_whitespace(data, pos):
+    return _WHITESPACE_RE.match(data, pos).end()
+
+
+def _read_dict(data, pos):
+    """Parse the dictionary starting at pos; returns (full bytes, top-level bytes, end position)
+
+    The top-level bytes have nested dictionaries and strings blanked out,
+    so key lookups cannot match inside them.
+    """
+    pos = _skip_whitespace(data, pos)
+    if data[pos:pos + 2] != b"<<":
+        raise ProbeError(f"expected dictionary at offset {pos}")
+    start, depth, top = pos, 0, bytearray()
+    end = len(data)
+    while pos < end:
+        two = data[pos:pos + 2]
+        if two == b"<<":
+            depth += 1
+            pos += 2
+            continue
+        if two == b">>":
+            depth -= 1
+            pos += 2
+            if depth == 0:
+                return bytes(data[start:pos]), bytes(top), pos
+            continue
+        char = data[pos:pos + 1]
+        if char == b"(":
+            # Literal string: balanced parentheses with backslash escapes
+            nesting = 0
+            while pos < end:
+                char = data[pos:pos + 1]
+                if char == b"\\":
+                    pos += 2
+                    continue
+                if char == b"(":
+                    nesting += 1
+                elif char == b")":
+                    nesting -= 1
+                    if nesting == 0:
+                        break
+                pos += 1
+            pos += 1
+            top += b" "
+            continue
+        if char == b"<":
+            close = data.find(b">", pos)
+            if close < 0:
+                break
+            pos = close + 1
+            top += b" "
+            continue
+        if depth == 1:
+            top += char
+        pos += 1
+    raise ProbeError("unterminated dictionary")
+
+
+def _ref(top, key):
+    match = re.search(rb"/" + key + rb"\s+(\d+)\s+(\d+)\s+R", top)
+    return int(match.group(1)) if match else None
+
+
+def _int(top, key):
+    match = re.search(rb"/" + key + rb"\s+(\d+)(?!\s+\d+\s+R)", top)
+    return int(match.group(1)) if match else None
+
+
+def _has_key(top, key):
+    return re.search(rb"/" + key + rb"(?![A-Za-z0-9])", top) is not None
+
+
+def _png_unpredict(raw, columns):
+    """Undo PNG row predictors (as used by xref and object streams)"""
+    row_size = columns + 1
+    previous = bytearray(columns)
+    out = bytearray()
+    for start in range(0, len(raw) - row_size + 1, row_size):
+        kind, row = raw[start], bytearray(raw[start + 1:start + row_size])
+        if kind == 1:
+            for i in range(1, columns):
+                row[i] = (row[i] + row[i - 1]) & 0xFF
+        elif kind == 2:
+            for i in range(columns):
+                row[i] = (row[i] + previous[i]) & 0xFF
+        elif kind != 0:
+            raise ProbeError(f"unsupported PNG predictor {kind}")
+        out += row
+        previous = row
+    return bytes(out)
+
+
+class _Probe:
+    """Just enough of a PDF reader to follow the xref to the catalog and page tree"""
+
+    def __init__(self, data):
+        self.data = data
+        self.entries = {}
+        self.trailer = None
+        self._object_streams = {}
+
+    def load_xref(self):
+        tail_start = max(0, len(self.data) - TAIL_BYTES)
+        matches = list(_STARTXREF_RE.finditer(self.data, tail_start))
+        if not matches:
+            raise ProbeError("startxref not found")
+        pos = int(matches[-1].group(1))
+        seen = set()
+        while pos is not None and pos not in seen:
+            seen.add(pos)
+            pos = _skip_whitespace(self.data, pos)
+            if self.data[pos:pos + 4] == b"xref":
+                top, prev = self._read_table(pos + 4)
+            else:
+                top, prev = self._read_xref_stream(pos)
+            # The newest section's trailer is the one that counts
+            if self.trailer is None:
+                self.trailer = top
+            pos = prev
+
+    def _read_table(self, pos):
+        data = self.data
+        while True:
+            pos = _skip_whitespace(data, pos)
+            if data[pos:pos + 7] == b"trailer":
+                break
+            match = _SUBSECTION_RE.match(data, pos)
+            if not match:
+                raise ProbeError(f"bad xref subsection at offset {pos}")
+            first, count = int(match.group(1)), int(match.group(2))
+            pos = match.end()
+            for number in range(first, first + count):
+                pos = _skip_whitespace(data, pos)
+                entry = _ENTRY_RE.match(data, pos)
+                if not entry:
+                    raise ProbeError(f"bad xref entry at offset {pos}")
+                pos = entry.end()
+                if entry.group(3) == b"n":
+                    self.entries.setdefault(number, (1, int(entry.group(1)), 0))
+        _, top, _ = _read_dict(data, pos + 7)
+        # Hybrid files keep object-stream entries in a separate xref stream
+        hybrid = _int(top, b"XRefStm")
+        if hybrid is not None:
+            self._read_xref_stream(hybrid)
+        return top, _int(top, b"Prev")
+
+    def _read_xref_stream(self, pos):
+        full, top, payload = self._stream_at(self.data, pos)
+        widths = re.search(rb"/W\s*\[\s*(\d+)\s+(\d+)\s+(\d+)\s*\]", top)
+        if not widths:
+            raise ProbeError("xref stream without /W")
+        widths = [int(w) for w in widths.groups()]
+        index = re.search(rb"/Index\s*\[([\d\s]+)\]", top)
+        if index:
+            numbers = [int(n) for n in index.group(1).split()]
+            sections = list(zip(numbers[0::2], numbers[1::2]))
+        else:
+            sections = [(0, _int(top, b"Size") or 0)]
+        row_size = sum(widths)
+        row = 0
+        for first, count in sections:
+            for number in range(first, first + count):
+                fields, offset = [], row * row_size
+                for width in widths:
+                    fields.append(int.from_bytes(payload[offset:offset + width], "big"))
+                    offset += width
+                row += 1
+                kind = fields[0] if widths[0] else 1
+                if kind in (1, 2):
+                    self.entries.setdefault(number, (kind, fields[1], fields[2]))
+        return top, _int(top, b"Prev")
+
+    def _stream_at(self, buffer, pos):
+        """Dictionary and decoded payload of the stream object at pos"""
+        header = _OBJ_RE.match(buffer, _skip_whitespace(buffer, pos))
+        if not header:
+            raise ProbeError(f"expected object at offset {pos}")
+        full, top, end = _read_dict(buffer, header.end())
+        stream = _STREAM_RE.match(buffer, end)
+        if not stream:
+            raise ProbeError("expected stream data")
+        start = stream.end()
+        length = _int(top, b"Length")
+        if length is None:
+            length_ref = _ref(top, b"Length")
+            length = self._resolve_int(length_ref) if length_ref is not None else None
+        if length is None:
+            length = buffer.find(b"endstream", start) - start
+        raw = bytes(buffer[start:start + length])
+
+        filters = re.findall(rb"/(\w+Decode)\b", top)
+        if filters and filters != [b"FlateDecode"]:
+            raise ProbeError(f"unsupported stream filter {filters}")
+        if filters:
+            try:
+                raw = zlib.decompress(raw)
+            except zlib.error as e:
+                raise ProbeError(f"bad stream data: {e}")
+        predictor = re.search(rb"/Predictor\s+(\d+)", full)
+        if predictor and int(predictor.group(1)) >= 10:
+            columns = re.search(rb"/Columns\s+(\d+)", full)
+            raw = _png_unpredict(raw, int(columns.group(1)) if columns else 1)
+        return full, top, raw
+
+    def _locate(self, number):
+        """(buffer, position) where the body of an object starts"""
+        entry = self.entries.get(number)
+        if entry is None:
+            raise ProbeError(f"object {number} not in xref")
+        kind, where, index = entry
+        if kind == 1:
+            header = _OBJ_RE.match(self.data, _skip_whitespace(self.data, where))
+            if not header or int(header.group(1)) != number:
+                raise ProbeError(f"xref offset of object {number} is wrong")
+            return self.data, header.end()
+
+        if where not in self._object_streams:
+            stream_entry = self.entries.get(where)
+            if not stream_entry or stream_entry[0] != 1:
+                raise ProbeError(f"object stream {where} not in xref")
+            _, top, payload = self._stream_at(self.data, stream_entry[1])
+            count, first = _int(top, b"N"), _int(top, b"First")
+            if count is None or first is None:
+                raise ProbeError(f"object stream {where} without /N or /First")
+            numbers = [int(n) for n in payload[:first].split()[:2 * count]]
+            offsets = {numbers[i]: first + numbers[i + 1] for i in range(0, len(numbers) - 1, 2)}
+            self._object_streams[where] = (payload, offsets)
+        payload, offsets = self._object_streams[where]
+        if number not in offsets:
+            raise ProbeError(f"object {number} missing from object stream {where}")
+        return payload, offsets[number]
+
+    def _resolve_dict(self, number):
+        buffer, pos = self._locate(number)
+        _, top, _ = _read_dict(buffer, pos)
+        return top
+
+    def _resolve_int(self, number):
+        buffer, pos = self._locate(number)
+        match = _INT_RE.match(buffer, pos)
+        if not match:
+            raise ProbeError(f"object {number} is not an integer")
+        return int(match.group(1))
+
+    def page_count(self):
+        root = _ref(self.trailer, b"Root")
+        if root is None:
+            raise ProbeError("trailer without /Root")
+        pages_ref = _ref(self._resolve_dict(root), b"Pages")
+        if pages_ref is None:
+            raise ProbeError("catalog without /Pages")
+        pages = self._resolve_dict(pages_ref)
+        if not re.search(rb"/Type\s*/Pages\b", pages):
+            raise ProbeError("/Pages is not a page tree node")
+        count = _int(pages, b"Count")
+        if count is None:
+            count_ref = _ref(pages, b"Count")
+            count = self._resolve_int(count_ref) if count_ref is not None else None
+        if count is None:
+            raise ProbeError("page tree without /Count")
+        return count
+
+
+def probe_pdf(data):
+    """(page count, encrypted) of a PDF held in a bytes-like object
+
+    Raises ProbeError for files whose structure needs a real parser
+    (damaged xref, unusual stream filters, encrypted object streams).
+    """
+    if data[:5] != b"%PDF-":
+        raise ProbeError("not a PDF file")
+    probe = _Probe(data)
+    probe.load_xref()
+    encrypted = _has_key(probe.trailer, b"Encrypt")
+    return probe.page_count(), encrypted
+
+
+@contextmanager
+def map_file(path):
+    """Read-only memory map of a file, shared by hashing, probing and extraction
+
+    Slicing and regex scans on the map read straight from the page cache,
+    so large PDFs are never copied whole into a bytes object.
+    """
+    with open(path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            yield b""
+            return
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+
+def probe_file(path):
+    """(page count, encrypted) of a PDF on disk; raises ProbeError when a full parse is needed"""
+    with map_file(path) as data:
+        return probe_pdf(data)
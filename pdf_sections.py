@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Section-Targeted PDF Extraction for Robotics Paper Fetcher
+Extracts only the pages holding the sections an AI task needs
+"""
+
+import re
+
+from pdf_extraction import PDF_AVAILABLE, PAGE_HEADER, map_file
+
+if PDF_AVAILABLE:
+    import PyPDF2
+
+# Checked in order; the first pattern found in a heading names the section
+SECTION_PATTERNS = [
+    ("abstract", r"\babstract\b"),
+    ("references", r"\b(?:references|bibliography)\b"),
+    ("limitations", r"\blimitations?\b"),
+    ("future_work", r"\bfuture (?:work|directions?)\b|\bopen challenges\b"),
+    ("conclusion", r"\bconclu(?:sions?|ding)\b"),
+    ("discussion", r"\bdiscussion\b"),
+    ("introduction", r"\bintrodu\w*\b"),
+    ("related_work", r"\brelated works?\b|\bbackground\b|\bliterature\b|\bstate of the (?:art|practice)\b"),
+    ("experiments", r"\bexperiment\w*\b|\bevaluation\b|\bresults\b|\bcase stud\w*\b|\bbenchmark\w*\b"),
+    ("method", r"\bmethod\w*\b|\bapproach\b|\bframework\b|\balgorithm\w*\b|\bproblem (?:formulation|statement|setting)\b"
+               r"|\bpreliminar\w*\b|\bsystem (?:overview|design)\b|\bmodel\b|\barchitecture\b"),
+    ("appendix", r"\bappendix\b|\backnowledge?ments?\b"),
+]
+
+TASK_SECTIONS = {
+    "summarize": {"abstract", "introduction", "conclusion"},
+    "extract_keywords": {"abstract", "introduction"},
+    "find_methodology": {"method", "experiments"},
+    "identify_gaps": {"limitations", "future_work", "discussion", "conclusion"},
+}
+
+# Sections that sit at the back of a paper and are found by scanning from the end
+TAIL_SECTIONS = {"discussion", "limitations", "future_work", "conclusion", "references", "appendix"}
+FRONT_SECTIONS = {"abstract", "introduction"}
+
+# Pages always extracted for the title and abstract
+FRONT_PAGES = 1
+FRONT_CHARS = 1500
+
+# Numbered headings ("3 Method", "IV. M ETHODOLOGY") and bare all-caps ones ("REFERENCES")
+_HEADING_RE = re.compile(
+    r"^[ \t]*(?:(?:\d{1,2}|[IVX]{1,5})\.?[ \t]+([A-Z][^\n]{2,60}?)|([A-Z][A-Z \-&]{4,40}))[ \t]*$", re.M
+)
+
+
+def classify_heading(title):
+    """Section name for a heading, or None if it is not a recognized section"""
+    # Small caps often extract as "C ONCLUSION"
+    title = re.sub(r"\b([A-Z]) (?=[A-Z])", r"\1", title.strip()).lower()
+    for name, pattern in SECTION_PATTERNS:
+        if re.search(pattern, title):
+            return name
+    return None
+
+
+def text_headings(page_text):
+    """Section names of the headings found in one page of extracted text (None for unrecognized)"""
+    headings = []
+    for match in _HEADING_RE.finditer(page_text):
+        numbered, caps = match.groups()
+        name = classify_heading(numbered or caps)
+        # Unrecognized all-caps lines are usually table or figure captions
+        if numbered or name:
+            headings.append(name)
+    return headings
+
+
+def _label_body(headings):
+    """Name unrecognized top-level sections by position: between the introduction
+    and the experiments they are the method, after the experiments more results"""
+    labelled, seen = [], set()
+    for page, name in headings:
+        if name not in TAIL_SECTIONS and seen & {"conclusion", "references"}:
+            name = "appendix"
+        elif name is None:
+            if "experiments" in seen:
+                name = "experiments"
+            elif seen & {"introduction", "related_work"}:
+                name = "method"
+        if name:
+            seen.add(name)
+        labelled.append((page, name))
+    return labelled
+
+
+def section_pages(headings, page_count, wanted):
+    """Pages covered by the wanted sections, given (first page, name) headings in page order
+
+    A section runs from its heading's page through the page where the next
+    heading starts, since headings usually begin mid-page.
+    """
+    pages = set()
+    for i, (start, name) in enumerate(headings):
+        if name not in wanted:
+            continue
+        end = headings[i + 1][0] if i + 1 < len(headings) else page_count - 1
+        pages.update(range(start, max(start, end) + 1))
+    return pages
+
+
+def outline_headings(reader):
+    """(first page, section name) for each top-level outline entry, or [] without an outline"""
+    headings = []
+    try:
+        outline = reader.outline
+    except Exception:
+        return []
+    for item in outline:
+        if isinstance(item, list):
+            continue  # subsections
+        try:
+            page = reader.get_destination_page_number(item)
+        except Exception:
+            continue
+        if page is not None and page >= 0:
+            headings.append((page, classify_heading(str(item.title))))
+    headings.sort(key=lambda heading: heading[0])
+    # A single entry is usually just the paper title
+    return _label_body(headings) if len(headings) > 1 else []
+
+
+class _PageTexts:
+    """Page text extracted on demand, once per page"""
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.texts = {}
+        self.errors = []
+
+    def __getitem__(self, index):
+        if index not in self.texts:
+            try:
+                self.texts[index] = self.reader.pages[index].extract_text() or ""
+            except Exception as e:
+                self.texts[index] = ""
+                self.errors.append(f"page {index + 1}: {e}")
+        return self.texts[index]
+
+
+def _scan_headings(texts, page_count, wanted):
+    """Find headings from page text, extracting as few pages as the wanted sections allow
+
+    Front and body sections are found scanning forward, stopping once they
+    are passed or the back matter starts; back-matter sections are found
+    scanning backward from the last page.
+    """
+    found = []
+    forward_wanted = wanted - TAIL_SECTIONS
+    last_forward = -1
+    if forward_wanted:
+        seen = set()
+        for page in range(page_count):
+            last_forward = page
+            names = text_headings(texts[page])
+            found.extend((page, name) for name in names)
+            seen.update(name for name in names if name)
+            labels = [name for _, name in _label_body(found)]
+            if seen & TAIL_SECTIONS:
+                break
+            # Past every wanted section once a later heading starts something else
+            if forward_wanted <= set(labels) and labels and labels[-1] not in wanted:
+                break
+
+    tail_wanted = wanted & TAIL_SECTIONS
+    if tail_wanted:
+        tail, seen = [], set()
+        for page in range(page_count - 1, last_forward, -1):
+            names = text_headings(texts[page])
+            tail[:0] = [(page, name) for name in names]
+            seen.update(name for name in names if name)
+            if tail_wanted <= seen or seen & (FRONT_SECTIONS | {"experiments", "method"}):
+                break
+        found.extend(tail)
+    return _label_body(found)
+
+
+def extract_sections(path, task=None, wanted=None, skip_encrypted=True):
+    """Extract the title/abstract and only the sections needed by an AI task
+
+    Section boundaries come from the PDF outline when it has one (no page
+    text needed), otherwise from headings found while scanning pages.
+    Returns a dict with pages, encrypted, text ("--- Page N ---" blocks of
+    the extracted pages only), sections, pages_extracted, source and errors.
+    """
+    wanted = set(wanted or TASK_SECTIONS.get(task, ())) or {"abstract", "introduction"}
+    with map_file(path) as data:
+        reader = PyPDF2.PdfReader(data)
+        encrypted = reader.is_encrypted
+        page_count = len(reader.pages)
+        result = {"pages": page_count, "encrypted": encrypted, "text": None, "sections": [],
+                  "pages_extracted": 0, "source": None, "errors": []}
+        if encrypted and skip_encrypted:
+            return result
+
+        texts = _PageTexts(reader)
+        headings = outline_headings(reader)
+        result["source"] = "outline"
+        if not headings:
+            headings = _scan_headings(texts, page_count, wanted)
+            result["source"] = "headings"
+
+        pages = section_pages(headings, page_count, wanted)
+        if not pages - set(range(FRONT_PAGES)):
+            # No wanted section recognized: better the whole paper than the wrong pages
+            pages = set(range(page_count))
+        if wanted & FRONT_SECTIONS:
+            pages.update(range(min(FRONT_PAGES, page_count)))
+
+        blocks = []
+        if 0 not in pages and page_count:
+            # Title and abstract give the AI its context
+            blocks.append(f"{PAGE_HEADER.format(1)}{texts[0][:FRONT_CHARS]}\n")
+        for page in sorted(pages):
+            blocks.append(f"{PAGE_HEADER.format(page + 1)}{texts[page]}\n")
+
+        result.update(text="".join(blocks), pages_extracted=len(texts.texts), errors=texts.errors,
+                      sections=sorted({name for _, name in headings if name in wanted}))
+        return result
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Supervised PDF Workers for Robotics Paper Fetcher
+Runs extraction in a child process with a wall-clock timeout and memory cap, and quarantines failures
+"""
+
+import os
+import time
+import signal
+import shutil
+import multiprocessing
+from datetime import datetime
+
+from library_layout import library_root, unindex_file
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Base wall-clock budget per document, plus an allowance per page
+EXTRACTION_TIMEOUT = 120
+TIMEOUT_PER_PAGE = 2.0
+# Cap on the anonymous (heap) memory of a worker and the processes it starts; mapped PDF pages do not count
+EXTRACTION_MEMORY_MB = 1024
+POLL_INTERVAL = 0.25
+
+QUARANTINE_DIRNAME = "quarantine"
+
+# Workers start from a clean server process rather than a fork of the (threaded) GUI
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+class ExtractionFailed(Exception):
+    """Raised when a supervised worker times out, exceeds its memory cap or dies"""
+
+    def __init__(self, reason, sha256=None):
+        super().__init__(reason)
+        self.reason = reason
+        self.sha256 = sha256
+
+
+def _anonymous_memory_mb(pid):
+    """Resident anonymous memory of a process in MB (Linux), or None where unavailable"""
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("RssAnon:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _group_pids(pgid):
+    """PIDs of the processes in a process group (Linux), or [] where /proc is unavailable"""
+    pids = []
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return pids
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                # pgrp is the third field after the parenthesized command name
+                fields = f.read().rsplit(")", 1)[1].split()
+            if int(fields[2]) == pgid:
+                pids.append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+    return pids
+
+
+def _group_memory_mb(pid):
+    """Anonymous memory of a worker and every process in its group, or None where unavailable"""
+    sizes = [_anonymous_memory_mb(member) for member in _group_pids(pid) or [pid]]
+    sizes = [size for size in sizes if size is not None]
+    return sum(sizes) if sizes else None
+
+
+def _kill_worker(process):
+    """Kill a worker together with any processes it started (its own session on POSIX)"""
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+    if process.is_alive():
+        process.kill()
+    process.join()
+
+
+def _worker(conn, func, args, memory_mb):
+    if hasattr(os, "setsid"):
+        # A session of its own, so a kill reaches any pool the worker starts (parallel page extraction)
+        os.setsid()
+    if resource is not None and memory_mb:
+        # Backstop for platforms without /proc polling: cap the address space
+        # well above the heap limit so mapped files and libraries still fit
+        limit = (memory_mb * 3 + 1024) * 1024 * 1024
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError):
+            pass
+    try:
+        conn.send(("ok", func(*args)))
+    except MemoryError:
+        conn.send(("error", f"memory limit exceeded ({memory_mb} MB)"))
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def run_supervised(func, args=(), timeout=EXTRACTION_TIMEOUT, memory_mb=EXTRACTION_MEMORY_MB):
+    """Run func(*args) in a child process and return its result
+
+    The child is killed, with any processes it started, when it runs past
+    the timeout or their heaps together grow beyond memory_mb; that, an
+    exception in func or a crash raises ExtractionFailed with the reason.
+    func must be a module-level function and args picklable.
+    """
+    context = multiprocessing.get_context(_START_METHOD)
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_worker, args=(sender, func, args, memory_mb))
+    process.start()
+    sender.close()
+    deadline = time.monotonic() + timeout
+    status = None
+    try:
+        while True:
+            if receiver.poll(POLL_INTERVAL):
+                try:
+                    status, value = receiver.recv()
+                except EOFError:
+                    raise ExtractionFailed(f"worker exited with code {process.exitcode}")
+                break
+            if not process.is_alive():
+                raise ExtractionFailed(f"worker exited with code {process.exitcode}")
+            if time.monotonic() > deadline:
+                raise ExtractionFailed(f"timed out after {timeout:.0f}s")
+            used = _group_memory_mb(process.pid)
+            if used is not None and memory_mb and used > memory_mb:
+                raise ExtractionFailed(f"memory limit exceeded ({used:.0f} MB > {memory_mb} MB)")
+    finally:
+        # A worker that answered is exiting on its own; anything else is killed now,
+        # as is whatever a failed worker left behind in its group
+        process.join(1 if status else 0)
+        if process.is_alive() or status != "ok":
+            _kill_worker(process)
+        receiver.close()
+    if status != "ok":
+        raise ExtractionFailed(value)
+    return value
+
+
+def quarantine_pdf(catalog, pdf_path, reason, quarantine_dir=None, arxiv_id=None, sha256=None):
+    """Move a PDF that failed extraction aside and record why in the catalog; returns its new path"""
+    quarantine_dir = quarantine_dir or os.path.join(library_root(pdf_path), QUARANTINE_DIRNAME)
+    os.makedirs(quarantine_dir, exist_ok=True)
+    stem, extension = os.path.splitext(os.path.basename(pdf_path))
+    # Suffixed so a second failure of the same file name never overwrites the first
+    suffix = sha256[:12] if sha256 else datetime.now().strftime("%Y%m%d%H%M%S")
+    target = os.path.join(quarantine_dir, f"{stem}.{suffix}{extension}")
+    counter = 1
+    while os.path.exists(target):
+        counter += 1
+        target = os.path.join(quarantine_dir, f"{stem}.{suffix}-{counter}{extension}")
+    shutil.move(pdf_path, target)
+    if catalog is not None:
+        unindex_file(catalog, library_root(pdf_path), pdf_path)
+        catalog.execute(
+            "INSERT OR REPLACE INTO quarantine (path, original_path, sha256, arxiv_id, reason, quarantined) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (target, pdf_path, sha256, arxiv_id, reason, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        )
+    return target
+
+
+def quarantine_reason(catalog, arxiv_id):
+    """Why a paper's PDF was quarantined, or None"""
+    rows = catalog.query("SELECT reason FROM quarantine WHERE arxiv_id = ? ORDER BY quarantined DESC",
+                         (arxiv_id,))
+    return rows[0][0] if rows else None
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Query Cache for Robotics Paper Fetcher
+arXiv search result pages kept in the catalog until arXiv's next daily announcement
+"""
+
+import json
+import time
+import hashlib
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+
+import arxiv
+
+try:
+    from zoneinfo import ZoneInfo
+    ARXIV_TIMEZONE = ZoneInfo("America/New_York")
+except Exception:  # no zoneinfo module or no time zone database
+    ARXIV_TIMEZONE = timezone(timedelta(hours=-5))
+
+# New listings appear at 20:00 US Eastern, Sunday to Thursday
+ANNOUNCEMENT_HOUR = 20
+QUIET_WEEKDAYS = (4, 5)  # Friday, Saturday
+# Leading results compared when an expired query is revalidated
+FINGERPRINT_RESULTS = 20
+# Expired pages are kept this long so they can still be revalidated
+STALE_KEEP_SECONDS = 7 * 24 * 3600
+
+
+def next_announcement(now=None):
+    """Time (UTC) of arXiv's next announcement, after which new results can appear"""
+    now = now or datetime.now(timezone.utc)
+    local = now.astimezone(ARXIV_TIMEZONE)
+    candidate = local.replace(hour=ANNOUNCEMENT_HOUR, minute=0, second=0, microsecond=0)
+    while candidate <= local or candidate.weekday() in QUIET_WEEKDAYS:
+        candidate = (candidate + timedelta(days=1)).replace(hour=ANNOUNCEMENT_HOUR)
+    return candidate.astimezone(timezone.utc)
+
+
+def normalize_query(query):
+    """Query text as a cache key: case and spacing do not change arXiv's results"""
+    return " ".join(str(query).split()).lower()
+
+
+def query_key(search, page_size):
+    """Cache key of a search: normalized query, sort order and page size"""
+    parts = [normalize_query(search.query), str(getattr(search.sort_by, "value", search.sort_by)),
+             str(getattr(search.sort_order, "value", search.sort_order)), str(page_size)]
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=12).hexdigest()
+
+
+def fingerprint(entries):
+    """Digest of the leading results' IDs and update times"""
+    leading = [(entry["entry_id"], entry["updated"]) for entry in entries[:FINGERPRINT_RESULTS]]
+    return hashlib.blake2b(json.dumps(leading).encode("utf-8"), digest_size=12).hexdigest()
+
+
+def result_to_dict(result):
+    return {
+        "entry_id": result.entry_id,
+        "updated": result.updated.isoformat(),
+        "published": result.published.isoformat(),
+        "title": result.title,
+        "authors": [author.name for author in result.authors],
+        "summary": result.summary,
+        "comment": result.comment,
+        "journal_ref": result.journal_ref,
+        "doi": result.doi,
+        "primary_category": result.primary_category,
+        "categories": list(result.categories),
+        "links": [{"href": link.href, "title": link.title, "rel": link.rel, "content_type": link.content_type}
+                  for link in result.links],
+    }
+
+
+def result_from_dict(entry):
+    """Rebuild an arxiv.Result (including its PDF link) from a cached entry"""
+    return arxiv.Result(
+        entry_id=entry["entry_id"],
+        updated=datetime.fromisoformat(entry["updated"]),
+        published=datetime.fromisoformat(entry["published"]),
+        title=entry["title"],
+        authors=[arxiv.Result.Author(name) for name in entry["authors"]],
+        summary=entry["summary"],
+        comment=entry["comment"],
+        journal_ref=entry["journal_ref"],
+        doi=entry["doi"],
+        primary_category=entry["primary_category"],
+        categories=entry["categories"],
+        links=[arxiv.Result.Link(**link) for link in entry["links"]],
+    )
+
+
+class QueryCache:
+    """Search result pages stored in the catalog's query_pages table
+
+    A page stays fresh until arXiv's next announcement, since results only
+    change when new listings go out. Once a query expires its first page
+    is fetched again; if the leading results are unchanged, every cached
+    page of the query is revalidated without being fetched, otherwise the
+    query's later pages are dropped and fetched as they are reached.
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.hits = 0
+        self.fetches = 0
+        self.revalidated = 0
+
+    def _load(self, key, offset):
+        rows = self.catalog.query(
+            "SELECT results, fingerprint, expires FROM query_pages WHERE key = ?", (f"{key}:{offset}",)
+        )
+        if not rows:
+            return None
+        page = json.loads(rows[0]["results"])
+        page.update(fingerprint=rows[0]["fingerprint"], expires=rows[0]["expires"])
+        return page
+
+    def _store(self, key, offset, limit, entries, expires):
+        now = time.time()
+        with self.catalog._lock:
+            with self.catalog.conn:
+                self.catalog.conn.execute(
+                    "INSERT OR REPLACE INTO query_pages (key, query_key, page_offset, results, fingerprint, fetched, expires) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (f"{key}:{offset}", key, offset, json.dumps({"limit": limit, "entries": entries}),
+                     fingerprint(entries), now, expires)
+                )
+                self.catalog.conn.execute("DELETE FROM query_pages WHERE expires < ?", (now - STALE_KEEP_SECONDS,))
+
+    def _revalidate(self, key, page, entries, expires):
+        """Extend a query's pages when its leading results are unchanged; otherwise drop them"""
+        if page["fingerprint"] == fingerprint(entries):
+            self.catalog.execute("UPDATE query_pages SET expires = ? WHERE query_key = ?", (expires, key))
+            self.revalidated += 1
+        else:
+            self.catalog.execute("DELETE FROM query_pages WHERE query_key = ?", (key,))
+
+    def results(self, client, search, refresh=False, limiter=None):
+        """Yield a search's results like client.results(search), reading fresh pages from the cache
+
+        refresh=True fetches the first page from the API even while it is
+        fresh and revalidates the query's later pages against it, so they
+        are still read from the cache when the leading results are unchanged.
+        A limiter shared between threads spaces the API requests of
+        concurrent searches; cache hits do not wait for it.
+        """
+        page_size = client.page_size
+        key = query_key(search, page_size)
+        total = search.max_results
+        expires = next_announcement().timestamp()
+        offset = 0
+        while total is None or offset < total:
+            limit = page_size if total is None else min(page_size, total - offset)
+            page = self._load(key, offset)
+            # A page is usable if it holds as many results as asked for, or is the last page
+            usable = page and (page["limit"] >= limit or len(page["entries"]) < page["limit"])
+            if usable and page["expires"] > time.time() and not (refresh and offset == 0):
+                entries = page["entries"][:limit]
+                self.hits += 1
+            else:
+                if limiter:
+                    limiter.wait()
+                entries = [result_to_dict(result) for result in islice(client.results(search, offset=offset), limit)]
+                self.fetches += 1
+                if offset == 0 and page:
+                    self._revalidate(key, page, entries, expires)
+                self._store(key, offset, limit, entries, expires)
+            for entry in entries:
+                yield result_from_dict(entry)
+            if len(entries) < limit:
+                return
+            offset += limit
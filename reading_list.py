@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Reading List Generator for Robotics Paper Fetcher
+Ranks unread papers by similarity to starred papers, recency, local citations and keyword trends
+"""
+
+import os
+import csv
+import heapq
+import math
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from library_catalog import LibraryCatalog
+from semantic_search import SemanticIndex, INDEX_DIRNAME, tokenize, update_library_index
+
+FEATURES = ["similarity", "recency", "citations", "trend"]
+WEIGHTS = np.array([0.4, 0.25, 0.2, 0.15], dtype=np.float32)
+RECENCY_HALF_LIFE_DAYS = 30
+TREND_RECENT_DAYS = 30
+TREND_BASELINE_DAYS = 180
+TREND_TERMS = 50
+
+READING_LIST_MD = "reading_list.md"
+READING_LIST_CSV = "reading_list.csv"
+
+
+def trending_terms(catalog, today=None, k=TREND_TERMS):
+    """Terms whose share of recent abstracts grew most against the preceding baseline window"""
+    today = today or date.today()
+    recent_start = today - timedelta(days=TREND_RECENT_DAYS)
+    baseline_start = recent_start - timedelta(days=TREND_BASELINE_DAYS)
+
+    def term_frequencies(since, until):
+        counts, docs = Counter(), 0
+        for paper in catalog.iter_papers(["title", "abstract"], "published >= ? AND published < ?",
+                                         (since.isoformat(), until.isoformat())):
+            counts.update(set(tokenize(f"{paper['title']} {paper['abstract'] or ''}")))
+            docs += 1
+        return counts, max(docs, 1)
+
+    recent, recent_docs = term_frequencies(recent_start, today + timedelta(days=1))
+    baseline, baseline_docs = term_frequencies(baseline_start, recent_start)
+    scores = {}
+    for term, count in recent.items():
+        if count < 3:
+            continue
+        recent_share = count / recent_docs
+        baseline_share = (baseline.get(term, 0) + 1) / (baseline_docs + 1)
+        scores[term] = recent_share * math.log(recent_share / baseline_share) if recent_share > baseline_share else 0
+    return [(term, score) for term, score in heapq.nlargest(k, scores.items(), key=lambda item: item[1]) if score > 0]
+
+
+def _normalize(values):
+    values = np.nan_to_num(np.asarray(values, dtype=np.float32))
+    span = values.max() - values.min() if len(values) else 0
+    return (values - values.min()) / span if span > 0 else np.zeros_like(values)
+
+
+def compute_features(output_dir, catalog, index, today=None):
+    """Feature matrix (papers x FEATURES) aligned with the semantic index rows, each column in [0, 1]"""
+    today = today or date.today()
+    ids = index.ids
+    vectors = index.vectors
+    n = len(ids)
+
+    starred_rows = [index.row_of[a] for a in catalog.starred_ids() if a in index.row_of]
+    if starred_rows:
+        profile = np.asarray(vectors[starred_rows]).mean(axis=0)
+        profile /= np.linalg.norm(profile) or 1
+        similarity = vectors @ profile
+    else:
+        similarity = np.zeros(n, dtype=np.float32)
+
+    published = {row[0]: row[1] for row in catalog.query("SELECT arxiv_id, published FROM papers")}
+    ages = np.full(n, np.nan, dtype=np.float32)
+    for i, arxiv_id in enumerate(ids):
+        value = published.get(arxiv_id)
+        if value:
+            try:
+                ages[i] = (today - datetime.strptime(value[:10], "%Y-%m-%d").date()).days
+            except ValueError:
+                pass
+    recency = np.exp2(-np.clip(np.nan_to_num(ages, nan=10 * RECENCY_HALF_LIFE_DAYS), 0, None)
+                      / RECENCY_HALF_LIFE_DAYS)
+
+    citations = np.zeros(n, dtype=np.float32)
+    network_path = os.path.join(output_dir, "citation_network.npz")
+    if os.path.exists(network_path):
+        from citation_network import CitationNetwork
+        network = CitationNetwork.load(network_path)
+        degrees = network.in_degree()
+        for i, arxiv_id in enumerate(ids):
+            j = network.index.get(arxiv_id)
+            if j is not None:
+                citations[i] = math.log1p(degrees[j])
+
+    # Project trending term weights into the LSA space: one mat-vec scores every paper
+    trend = np.zeros(n, dtype=np.float32)
+    model = index.model
+    term_weights = np.zeros(len(model.terms), dtype=np.float32)
+    for term, strength in trending_terms(catalog, today):
+        column = model.vocabulary.get(term)
+        if column is not None:
+            term_weights[column] = strength * model.idf[column]
+    if term_weights.any():
+        direction = term_weights @ model.components
+        direction /= np.linalg.norm(direction) or 1
+        trend = vectors @ direction
+
+    return np.column_stack([_normalize(similarity), _normalize(recency),
+                            _normalize(citations), _normalize(trend)]).astype(np.float32)
+
+
+def rank_papers(output_dir, k=50, today=None):
+    """Top-k unread papers with their score and per-signal features"""
+    index = SemanticIndex(os.path.join(output_dir, INDEX_DIRNAME))
+    if index.model is None:
+        update_library_index(output_dir)
+        index = SemanticIndex(os.path.join(output_dir, INDEX_DIRNAME))
+    if index.model is None or not len(index):
+        return []
+
+    with LibraryCatalog.for_library(output_dir) as catalog:
+        features = compute_features(output_dir, catalog, index, today)
+        weights = WEIGHTS.copy()
+        if not catalog.starred_ids():
+            weights[0] = 0
+        weights /= weights.sum()
+        scores = features @ weights
+
+        excluded = set(catalog.read_ids()) | set(catalog.starred_ids())
+        excluded |= {row[0] for row in catalog.query("SELECT arxiv_id FROM duplicates")}
+        candidates = ((score, i) for i, score in enumerate(scores) if index.ids[i] not in excluded)
+        top = heapq.nlargest(k, candidates)
+
+        entries = []
+        for rank, (score, i) in enumerate(top, 1):
+            paper = catalog.get_paper(index.ids[i]) or {"arxiv_id": index.ids[i]}
+            paper.update(rank=rank, score=float(score),
+                         **{name: float(features[i, j]) for j, name in enumerate(FEATURES)})
+            entries.append(paper)
+        return entries
+
+
+def _reasons(entry):
+    labels = {"similarity": "like your starred papers", "recency": "recent",
+              "citations": "cited in your library", "trend": "trending topic"}
+    strong = [labels[name] for name in FEATURES if entry.get(name, 0) >= 0.6]
+    return ", ".join(strong) or "balanced match"
+
+
+def write_reading_list(entries, md_path, csv_path):
+    """Write a ranked reading list as Markdown and CSV"""
+    with open(md_path, "w", encoding="utf-8") as f:
+        f.write("# 📚 Prioritized Reading List\n\n")
+        f.write(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n")
+        for entry in entries:
+            url = entry.get("entry_url") or f"https://arxiv.org/abs/{entry['arxiv_id']}"
+            f.write(f"{entry['rank']}. **[{entry.get('title') or entry['arxiv_id']}]({url})**  \n")
+            f.write(f"   {entry.get('authors') or ''} ({entry.get('published') or 'n.d.'})  \n")
+            f.write(f"   Score {entry['score']:.2f} - {_reasons(entry)}\n\n")
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Rank", "Score", "arXiv_ID", "Title", "Authors", "Published"] +
+                        [name.title() for name in FEATURES])
+        for entry in entries:
+            writer.writerow([entry["rank"], f"{entry['score']:.4f}", entry["arxiv_id"], entry.get("title"),
+                             entry.get("authors"), entry.get("published")] +
+                            [f"{entry[name]:.3f}" for name in FEATURES])
+
+
+def generate_reading_list(output_dir, k=50, today=None):
+    """Rank the library and write reading_list.md / reading_list.csv; returns (md_path, csv_path, entries)"""
+    entries = rank_papers(output_dir, k, today)
+    md_path = os.path.join(output_dir, READING_LIST_MD)
+    csv_path = os.path.join(output_dir, READING_LIST_CSV)
+    write_reading_list(entries, md_path, csv_path)
+    return md_path, csv_path, entries
@@ -5,7 +5,7 @@ A comprehensive tool for researchers with PDF analysis and text extraction
 """
 
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
+from tkinter import ttk, filedialog, messagebox, scrolledtext, simpledialog
 import arxiv
 import os
 import csv
@@ -14,12 +14,22 @@ from datetime import datetime, timedelta
 import webbrowser
 import platform
 
+from library_catalog import LibraryCatalog, record_from_result, parse_arxiv_id
+
 # PDF processing imports
-try:
-    import PyPDF2
-    PDF_PROCESSING_AVAILABLE = True
-except ImportError:
-    PDF_PROCESSING_AVAILABLE = False
+from pdf_extraction import PDF_AVAILABLE as PDF_PROCESSING_AVAILABLE, ExtractionCache, extract_pdf
+from pdf_supervisor import (EXTRACTION_TIMEOUT, EXTRACTION_MEMORY_MB, ExtractionFailed,
+                            run_supervised, quarantine_pdf, quarantine_reason)
+from text_store import open_store, write_text
+from library_layout import LAYOUT_FLAT, ensure_layout, index_file, library_totals, list_library_files, paper_file
+from library_scanner import scan_in_background, scan_library
+from query_cache import QueryCache
+from id_import import ID_BATCH_SIZE, read_id_file, resolve_ids, split_known
+from materialize import summary_template
+from batch_runner import build_search_query, load_saved_queries, run_batch, save_query
+
+# Results per arXiv API request in metadata-only runs (the API allows up to 2000)
+METADATA_PAGE_SIZE = 1000
 
 class EnhancedArxivFetcherGUI:
     def __init__(self, root, colors=None):
@@ -45,6 +55,7 @@ class EnhancedArxivFetcherGUI:
         self.output_dir = tk.StringVar(value="papers")
         self.summary_dir = tk.StringVar(value="summaries")
         self.max_results = tk.IntVar(value=50)
+        self.metadata_only = tk.BooleanVar(value=False)
         self.search_query = tk.StringVar(value="")
         self.date_filter_enabled = tk.BooleanVar(value=False)
         self.start_date = tk.StringVar(value="")
@@ -54,11 +65,18 @@ class EnhancedArxivFetcherGUI:
         self.extract_text = tk.BooleanVar(value=True)
         self.check_encryption = tk.BooleanVar(value=True)
         self.create_txt_files = tk.BooleanVar(value=True)
+        self.parallel_extraction = tk.BooleanVar(value=True)
+        self.compress_text = tk.BooleanVar(value=False)
+        self.watch_library = tk.BooleanVar(value=False)
+        self.library_watcher = None
+        self.harvest_thread = None
+        self.harvest_stop = threading.Event()
         
         # AI Assistant variables
         self.openai_api_key = tk.StringVar()
         self.ai_enabled = tk.BooleanVar()
         self.ai_task = tk.StringVar(value="summarize")
+        self.ai_sections_only = tk.BooleanVar(value=False)
         
         # Categories
         self.categories = {
@@ -74,6 +92,7 @@ class EnhancedArxivFetcherGUI:
         
         self.create_widgets()
         self.is_fetching = False
+        self.duplicate_detector = None
         
     def setup_adaptive_ui(self):
         """Setup elegant modern UI with fixed 1280×720 dimensions"""
@@ -205,9 +224,15 @@ class EnhancedArxivFetcherGUI:
                                 style='Modern.TLabel')
         search_label.pack(anchor="w", pady=(0, 5))
         
-        search_entry = ttk.Entry(search_frame, textvariable=self.search_query,
+        search_row = ttk.Frame(search_frame)
+        search_row.pack(fill="x", pady=(0, 5))
+        
+        search_entry = ttk.Entry(search_row, textvariable=self.search_query,
                                 style='Modern.TEntry', font=('Calibri', 12))
-        search_entry.pack(fill="x", pady=(0, 5))
+        search_entry.pack(side="left", fill="x", expand=True, padx=(0, 10))
+        
+        ttk.Button(search_row, text="💾 Save Query", 
+                   command=self.save_current_query).pack(side="left")
         
         hint_label = ttk.Label(search_frame, 
                               text="[TIP] Research examples: 'robotic manipulation', 'deep reinforcement learning', 'computer vision'", 
@@ -317,6 +342,10 @@ class EnhancedArxivFetcherGUI:
                                  state="readonly", width=15, font=('Calibri', 10))
         task_combo.pack(anchor="w", pady=(2, 0))
         
+        ttk.Checkbutton(task_frame, text="[FAST] AI-only: extract just the sections this task needs (no text files)", 
+                       variable=self.ai_sections_only,
+                       style='Modern.TCheckbutton').pack(anchor="w", pady=(4, 0))
+        
         # Help text
         ttk.Label(ai_frame, text="[TIP] AI requires valid OpenAI API key with available credits", 
                   style='Subtitle.TLabel').pack(anchor="w", pady=(0, 5))
@@ -343,6 +372,18 @@ class EnhancedArxivFetcherGUI:
                        variable=self.create_txt_files,
                        style='Modern.TCheckbutton').grid(row=1, column=0, sticky="w", pady=2)
         
+        ttk.Checkbutton(options_grid, text="[FAST] Split long PDFs across CPU cores", 
+                       variable=self.parallel_extraction,
+                       style='Modern.TCheckbutton').grid(row=1, column=1, sticky="w", padx=(30, 0), pady=2)
+        
+        ttk.Checkbutton(options_grid, text="[SAVE] Compress text and summaries into one pack file", 
+                       variable=self.compress_text,
+                       style='Modern.TCheckbutton').grid(row=2, column=0, sticky="w", pady=2)
+        
+        ttk.Checkbutton(options_grid, text="[WATCH] Auto-ingest PDFs dropped into pdfs/", 
+                       variable=self.watch_library, command=self.toggle_library_watcher,
+                       style='Modern.TCheckbutton').grid(row=2, column=1, sticky="w", padx=(30, 0), pady=2)
+        
         if not PDF_PROCESSING_AVAILABLE:
             warning_frame = ttk.Frame(pdf_frame)
             warning_frame.pack(fill="x", pady=(10, 0))
@@ -371,7 +412,7 @@ class EnhancedArxivFetcherGUI:
         results_row = ttk.Frame(results_frame)
         results_row.pack(fill="x", pady=(5, 0))
         
-        results_spinbox = ttk.Spinbox(results_row, from_=1, to=500, 
+        results_spinbox = ttk.Spinbox(results_row, from_=1, to=10000, 
                                      textvariable=self.max_results, width=8,
                                      style='Modern.TEntry')
         results_spinbox.pack(side="left")
@@ -379,6 +420,10 @@ class EnhancedArxivFetcherGUI:
         ttk.Label(results_row, text="research papers to acquire", 
                  style='Subtitle.TLabel').pack(side="left", padx=(10, 0))
         
+        ttk.Checkbutton(results_row, text="[FAST] Metadata only (download PDFs later)", 
+                       variable=self.metadata_only,
+                       style='Modern.TCheckbutton').pack(side="left", padx=(20, 0))
+        
         # Output directory setting
         output_frame = ttk.Frame(settings_frame)
         output_frame.pack(fill="x")
@@ -435,6 +480,21 @@ class EnhancedArxivFetcherGUI:
         ttk.Button(secondary_frame, text="[VIEW] View Downloaded Papers", 
                    command=self.view_downloaded_papers).pack(side="left", padx=(0, 10))
         
+        ttk.Button(secondary_frame, text="[SEARCH] Find Similar", 
+                   command=self.find_similar_papers).pack(side="left", padx=(0, 10))
+        
+        ttk.Button(secondary_frame, text="[HARVEST] Harvest Metadata", 
+                   command=self.toggle_harvest).pack(side="left", padx=(0, 10))
+        
+        ttk.Button(secondary_frame, text="[PDF] Download PDFs", 
+                   command=self.materialize_pdfs).pack(side="left", padx=(0, 10))
+        
+        ttk.Button(secondary_frame, text="[LIST] Import arXiv IDs", 
+                   command=self.import_id_list).pack(side="left", padx=(0, 10))
+        
+        ttk.Button(secondary_frame, text="[BATCH] Run Saved Queries", 
+                   command=self.run_saved_queries).pack(side="left", padx=(0, 10))
+        
         ttk.Button(secondary_frame, text="ℹ️ About & Help", 
                    command=self.show_about).pack(side="left")
         
@@ -512,63 +572,181 @@ Ready to revolutionize your research workflow! [GO]
         
         threading.Thread(target=install, daemon=True).start()
         
-    def process_pdf(self, pdf_path, paper_id):
-        """Process a downloaded PDF file"""
-        if not PDF_PROCESSING_AVAILABLE:
-            return False
-            
+    def process_pdf(self, pdf_path, paper_id, cache=None, arxiv_id=None):
+        """Process a downloaded PDF file; returns its extraction result, or None on failure
+
+        arxiv_id comes from the result's entry URL: old-style IDs such as
+        cs/0601001 cannot be recovered from a paper_id like 012_0601001v2.
+        """
         try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                
-                # Check encryption
-                if self.check_encryption.get() and pdf_reader.is_encrypted:
-                    self.log_message(f"   [!] PDF {paper_id} is encrypted!")
-                    return False
+            if not PDF_PROCESSING_AVAILABLE:
+                # Page count and encryption still come from the trailer probe
+                return extract_pdf(pdf_path, cache, extract_text=False,
+                                   timeout=EXTRACTION_TIMEOUT, memory_mb=EXTRACTION_MEMORY_MB)
+            
+            # AI-only runs extract just the pages holding the task's sections
+            sections_only = self.ai_enabled.get() and self.ai_sections_only.get()
+            
+            txt_dir = os.path.join(self.output_dir.get(), "extracted_text")
+            txt_path = paper_file(txt_dir, f"{paper_id}_text.txt") if self.create_txt_files.get() else None
+            result = extract_pdf(pdf_path, cache, None if sections_only else txt_path,
+                                 extract_text=self.extract_text.get() and not sections_only,
+                                 skip_encrypted=self.check_encryption.get(),
+                                 workers=None if self.parallel_extraction.get() else 1,
+                                 timeout=EXTRACTION_TIMEOUT, memory_mb=EXTRACTION_MEMORY_MB)
+            
+            # Check encryption
+            if self.check_encryption.get() and result["encrypted"]:
+                self.log_message(f"   [!] PDF {paper_id} is encrypted!")
+                return result
+            
+            if sections_only and self.extract_text.get() and result["pages"]:
+                from pdf_sections import extract_sections
+                sections = run_supervised(extract_sections,
+                                          (pdf_path, self.ai_task.get(), None, self.check_encryption.get()),
+                                          EXTRACTION_TIMEOUT, EXTRACTION_MEMORY_MB)
+                result.update(text=sections["text"], errors=sections["errors"], partial=True)
+                self.log_message(f"   [FAST] Extracted {sections['pages_extracted']}/{sections['pages']} pages "
+                                 f"({', '.join(sections['sections']) or 'whole paper'}, from {sections['source']})")
+            
+            for error in result["errors"]:
+                self.log_message(f"   [!] Error extracting {error}")
+            
+            full_text = result["text"]
+            if full_text and full_text.strip():
+                if result["cached"] and not sections_only:
+                    self.log_message("   [CACHE] Reusing extracted text for unchanged PDF")
+                elif txt_path and not sections_only:
+                    self.log_message(f"   [LOG] Text extracted to {os.path.basename(txt_path)}")
                 
-                # Extract text
-                if self.extract_text.get():
-                    full_text = ""
-                    for page_num, page in enumerate(pdf_reader.pages):
-                        try:
-                            text = page.extract_text()
-                            full_text += f"\n--- Page {page_num + 1} ---\n{text}\n"
-                        except Exception as e:
-                            self.log_message(f"   [!] Error extracting page {page_num + 1}: {e}")
-                    
-                    # Save text file
-                    if self.create_txt_files.get() and full_text.strip():
-                        output_dir = self.output_dir.get()
-                        txt_dir = os.path.join(output_dir, "extracted_text")
-                        os.makedirs(txt_dir, exist_ok=True)
-                        
-                        txt_path = os.path.join(txt_dir, f"{paper_id}_text.txt")
-                        with open(txt_path, 'w', encoding='utf-8', errors='replace') as f:
-                            f.write(full_text)
-                        
-                        self.log_message(f"   [LOG] Text extracted to {os.path.basename(txt_path)}")
-                        
-                        # Process with AI if enabled
-                        if self.ai_enabled.get() and full_text.strip():
-                            # Extract title from the first lines of the PDF text
-                            lines = full_text.split('\n')
-                            paper_title = paper_id  # Fallback
-                            for line in lines[:10]:  # Check first 10 lines for title
-                                if len(line.strip()) > 10 and len(line.strip()) < 200:
-                                    paper_title = line.strip()
-                                    break
-                            self.process_with_ai(paper_title, full_text, paper_id)
+                # Skip AI for content we already hold under another ID
+                if self.ai_enabled.get() and self.duplicate_detector and not sections_only:
+                    match = self.duplicate_detector.check(arxiv_id, full_text, "text")
+                    if match:
+                        self.log_message(f"   [SKIP] Full text duplicates {match[0]} ({match[1]:.0%}), skipping AI analysis")
+                        return result
                 
-                return True
+                # Process with AI if enabled
+                if self.ai_enabled.get():
+                    # Extract title from the first lines of the PDF text
+                    lines = full_text.split('\n')
+                    paper_title = paper_id  # Fallback
+                    for line in lines[:10]:  # Check first 10 lines for title
+                        if len(line.strip()) > 10 and len(line.strip()) < 200:
+                            paper_title = line.strip()
+                            break
+                    self.process_with_ai(paper_title, full_text, paper_id)
+            
+            return result
                 
+        except ExtractionFailed as e:
+            self.quarantine(cache, pdf_path, e, arxiv_id)
+            return None
         except Exception as e:
             self.log_message(f"   [ERR] PDF processing error: {e}")
-            return False
-        
+            return None
+    
+    def quarantine(self, cache, pdf_path, failure, arxiv_id=None):
+        """Move a PDF whose extraction hung, blew its memory cap or crashed out of the library"""
+        try:
+            target = quarantine_pdf(cache.catalog if cache else None, pdf_path, failure.reason,
+                                    os.path.join(self.output_dir.get(), "quarantine"), arxiv_id, failure.sha256)
+            self.log_message(f"   [QUARANTINE] {os.path.basename(pdf_path)}: {failure.reason} -> {os.path.relpath(target, self.output_dir.get())}")
+        except OSError as e:
+            self.log_message(f"   [ERR] Could not quarantine {os.path.basename(pdf_path)}: {e}")
+            
     def browse_output_dir(self):
         directory = filedialog.askdirectory(initialdir=self.output_dir.get())
         if directory:
             self.output_dir.set(directory)
+            if self.library_watcher:
+                # Follow the library to its new folder
+                self.toggle_library_watcher()
+            
+    def toggle_library_watcher(self):
+        """Start or stop watching the library's pdfs/ folder, following the checkbox"""
+        from library_watcher import LibraryWatcher, ingest_pdfs
+        
+        if self.library_watcher:
+            # Not waited on: a batch being ingested could hold up the Tk thread for minutes
+            if self.library_watcher.stop(timeout=0.5):
+                self.log_message("[WATCH] Stopped watching the library")
+            else:
+                self.log_message("[WATCH] Stopping after the current batch of PDFs")
+            self.library_watcher = None
+        if not self.watch_library.get():
+            return
+        
+        output_dir = self.output_dir.get()
+        log = lambda message: self.root.after(0, self.log_message, message)
+        
+        def on_batch(paths, removed):
+            ingested = ingest_pdfs(output_dir, paths, removed, progress_callback=log)
+            if ingested:
+                log(f"[WATCH] Cataloged {ingested} dropped PDFs")
+        
+        self.library_watcher = LibraryWatcher(
+            output_dir, on_batch, on_error=lambda e: log(f"[!] Library watcher: {e}")
+        ).start()
+        self.log_message(f"[WATCH] Watching {os.path.join(output_dir, 'pdfs')} for new PDFs")
+            
+    def toggle_harvest(self):
+        """Harvest metadata for the selected categories in the background; a second click stops it"""
+        from oai_harvest import harvest_metadata
+        
+        if self.harvest_thread and self.harvest_thread.is_alive():
+            self.harvest_stop.set()
+            self.log_message("[HARVEST] Stopping after the current page...")
+            return
+        categories = [code for name, code in self.categories.items() if self.selected_categories[name].get()]
+        if not categories:
+            messagebox.showerror("Error", "Please select at least one category to harvest.")
+            return
+        date_from = date_until = None
+        if self.date_filter_enabled.get():
+            date_from, date_until = self.start_date.get() or None, self.end_date.get() or None
+        
+        output_dir = self.output_dir.get()
+        log = lambda message: self.root.after(0, self.log_message, message)
+        
+        def harvest():
+            try:
+                stored = harvest_metadata(output_dir, categories, date_from, date_until,
+                                          progress_callback=log, should_stop=self.harvest_stop.is_set)
+                log(f"[HARVEST] Stored {stored} records in the catalog")
+            except Exception as e:
+                log(f"[ERR] Harvest failed: {e}")
+        
+        self.harvest_stop.clear()
+        self.log_message(f"[HARVEST] Harvesting {', '.join(categories)} metadata (no PDFs)...")
+        self.harvest_thread = threading.Thread(target=harvest, daemon=True)
+        self.harvest_thread.start()
+            
+    def materialize_pdfs(self):
+        """Download PDFs for starred and top-ranked papers cataloged without one"""
+        from materialize import MIN_SCORE, materialize_papers, select_papers
+        
+        output_dir = self.output_dir.get()
+        log = lambda message: self.root.after(0, self.log_message, message)
+        
+        def download():
+            try:
+                try:
+                    papers = select_papers(output_dir, starred=True, min_score=MIN_SCORE)
+                except ImportError:
+                    log("[!] Install numpy and scipy to rank papers; downloading starred papers only")
+                    papers = select_papers(output_dir, starred=True)
+                if not papers:
+                    log("[PDF] No starred or top-ranked papers are missing a PDF")
+                    return
+                log(f"[PDF] Downloading {len(papers)} PDFs (starred, or ranked {MIN_SCORE:.0%} and above)...")
+                downloaded = materialize_papers(output_dir, papers, progress_callback=log,
+                                                create_txt_files=self.create_txt_files.get())
+                log(f"[SUCCESS] Downloaded {downloaded} PDFs")
+            except Exception as e:
+                log(f"[ERR] PDF download failed: {e}")
+        
+        threading.Thread(target=download, daemon=True).start()
             
     def log_message(self, message):
         """Add message to log area"""
@@ -576,31 +754,54 @@ Ready to revolutionize your research workflow! [GO]
         self.log_text.see(tk.END)
         self.root.update_idletasks()
         
+    def selected_category_codes(self):
+        return [code for name, code in self.categories.items() if self.selected_categories[name].get()]
+        
     def build_query(self):
         """Build arXiv search query based on user inputs"""
-        queries = []
-        
-        # Add category queries
-        selected_cats = [code for name, code in self.categories.items() 
-                        if self.selected_categories[name].get()]
-        if selected_cats:
-            cat_query = " OR ".join([f"cat:{cat}" for cat in selected_cats])
-            queries.append(f"({cat_query})")
-            
-        # Add custom search if provided
-        custom_search = self.search_query.get().strip()
-        if custom_search:
-            queries.append(f'(ti:"{custom_search}" OR abs:"{custom_search}")')
-            
-        return " AND ".join(queries) if queries else "cat:cs.RO"
+        return build_search_query(self.selected_category_codes(), self.search_query.get())
+        
+    def save_current_query(self):
+        """Save the current categories and search terms as a named query for batch runs"""
+        name = simpledialog.askstring("Save Query", "Name for this query (e.g. manipulation, SLAM):", parent=self.root)
+        if not name or not name.strip():
+            return
+        save_query(self.output_dir.get(), {
+            "name": name.strip(),
+            "categories": self.selected_category_codes(),
+            "terms": self.search_query.get().strip(),
+            "max_results": self.max_results.get(),
+        })
+        self.log_message(f"[BATCH] Saved query '{name.strip()}': {self.build_query()}")
+        
+    def run_saved_queries(self):
+        """Run every saved query as one batch job in the background"""
+        output_dir = self.output_dir.get()
+        queries = load_saved_queries(output_dir)
+        if not queries:
+            messagebox.showinfo("Saved Queries", "No saved queries yet. Use 'Save Query' next to the search box.")
+            return
+        download = not self.metadata_only.get()
+        log = lambda message: self.root.after(0, self.log_message, message)
+        
+        def batch():
+            try:
+                stats = run_batch(output_dir, queries, progress_callback=log, download=download)
+                log(f"[SUCCESS] Batch complete: {stats['unique']} unique papers ({stats['new']} new) "
+                    f"from {stats['results']} results, {stats['downloaded']} PDFs downloaded")
+            except Exception as e:
+                log(f"[ERR] Batch run failed: {e}")
+        
+        self.log_message(f"[BATCH] Running {len(queries)} saved queries: {', '.join(q['name'] for q in queries)}")
+        threading.Thread(target=batch, daemon=True).start()
         
-    def start_fetch(self):
-        """Start fetching papers in a separate thread"""
+    def start_fetch(self, id_list=None):
+        """Start fetching papers (found by search, or the given arXiv IDs) in a separate thread"""
         if self.is_fetching:
             return
             
         # Validate inputs
-        if not any(var.get() for var in self.selected_categories.values()) and not self.search_query.get().strip():
+        if id_list is None and not any(var.get() for var in self.selected_categories.values()) and not self.search_query.get().strip():
             messagebox.showerror("Error", "Please select at least one category or enter a search term.")
             return
             
@@ -621,9 +822,26 @@ Ready to revolutionize your research workflow! [GO]
         self.log_text.delete(1.0, tk.END)
         
         # Start fetching in background thread
-        self.fetch_thread = threading.Thread(target=self.fetch_papers, daemon=True)
+        self.fetch_thread = threading.Thread(target=self.fetch_papers, args=(id_list,), daemon=True)
         self.fetch_thread.start()
         
+    def import_id_list(self):
+        """Fetch the papers listed in a file of arXiv IDs, skipping those already cataloged"""
+        if self.is_fetching:
+            return
+        path = filedialog.askopenfilename(title="arXiv ID list",
+                                          filetypes=[("Text, CSV or BibTeX", "*.txt *.csv *.bib"), ("All files", "*.*")])
+        if not path:
+            return
+        ids = read_id_file(path)
+        with LibraryCatalog.for_library(self.output_dir.get()) as catalog:
+            new_ids, known = split_known(catalog, ids)
+        if not new_ids:
+            messagebox.showinfo("Import IDs", f"All {len(ids)} papers in {os.path.basename(path)} are already in the catalog.")
+            return
+        self.start_fetch(id_list=new_ids)
+        self.log_message(f"[LIST] {len(ids)} IDs in {os.path.basename(path)}: {len(new_ids)} new, {known} already cataloged")
+        
     def stop_fetch(self):
         """Stop the fetching process"""
         self.is_fetching = False
@@ -632,8 +850,8 @@ Ready to revolutionize your research workflow! [GO]
         self.progress.stop()
         self.log_message("[ERR] Fetch cancelled by user")
         
-    def fetch_papers(self):
-        """Main fetching logic with enhanced PDF processing"""
+    def fetch_papers(self, id_list=None):
+        """Main fetching logic with enhanced PDF processing; id_list fetches those arXiv IDs instead of searching"""
         try:
             # Create directories
             output_dir = self.output_dir.get()
@@ -650,39 +868,64 @@ Ready to revolutionize your research workflow! [GO]
             else:
                 self.log_message(f"[FOLDER] Created directories: pdfs, summaries")
             
-            # Build query
-            query = self.build_query()
-            self.log_message(f"[SEARCH] Search query: {query}")
-            
-            # Create search
-            search = arxiv.Search(
-                query=query,
-                sort_by=arxiv.SortCriterion.SubmittedDate,
-                max_results=self.max_results.get(),
-            )
+            if id_list is None:
+                # Build query
+                query = self.build_query()
+                self.log_message(f"[SEARCH] Search query: {query}")
+                
+                # Create search
+                search = arxiv.Search(
+                    query=query,
+                    sort_by=arxiv.SortCriterion.SubmittedDate,
+                    max_results=self.max_results.get(),
+                )
+            else:
+                self.log_message(f"[LIST] Resolving {len(id_list)} arXiv IDs, {ID_BATCH_SIZE} per request")
             
             # Initialize CSV
             metadata_file = os.path.join(output_dir, "metadata.csv")
+            metadata_only = self.metadata_only.get()
+            if metadata_only:
+                self.log_message("[FAST] Metadata only: cataloging results without downloading PDFs")
             
             papers_processed = 0
             papers_downloaded = 0
             papers_text_extracted = 0
+            papers_skipped = 0
+            
+            catalog = LibraryCatalog.for_library(output_dir)
+            detector = self.create_duplicate_detector(catalog)
+            cache = ExtractionCache(catalog)
+            if ensure_layout(catalog, output_dir) == LAYOUT_FLAT:
+                self.log_message("[!] Flat library layout; run 'python main.py --migrate-layout' to shard it by arXiv ID")
             
-            with open(metadata_file, mode="w", newline='', encoding="utf-8") as csvfile:
+            store = open_store(output_dir)
+            if self.compress_text.get() and not store.packed:
+                self.log_message("[SAVE] Packing existing text and summaries...")
+                packed = store.pack(progress_callback=self.log_message)
+                self.log_message(f"[SAVE] Packed {packed} files into {os.path.basename(store.pack_path)}")
+            
+            with catalog, open(metadata_file, mode="w", newline='', encoding="utf-8") as csvfile:
                 writer = csv.writer(csvfile)
                 header = ["ID", "Title", "Authors", "Published", "PDF_URL", "arXiv_URL", "Abstract", "Pages", "Encrypted", "Text_Extracted"]
                 writer.writerow(header)
                 
-                # Use newer client method
-                client = arxiv.Client()
-                results = client.results(search)
+                # Use newer client method; metadata-only runs page through results in large requests
+                client = arxiv.Client(page_size=METADATA_PAGE_SIZE) if metadata_only else arxiv.Client()
+                # Result pages seen since arXiv's last announcement come from the catalog, not the API
+                query_cache = QueryCache(catalog)
+                if id_list is None:
+                    results = query_cache.results(client, search)
+                else:
+                    results = resolve_ids(id_list, arxiv.Client(page_size=ID_BATCH_SIZE))
+                pending = []
                 
                 for i, result in enumerate(results, start=1):
                     if not self.is_fetching:
                         break
                         
-                    # Date filtering
-                    if self.date_filter_enabled.get():
+                    # Date filtering (ID lists are taken as given)
+                    if self.date_filter_enabled.get() and id_list is None:
                         paper_date = result.published.date()
                         if self.start_date.get():
                             start = datetime.strptime(self.start_date.get(), "%Y-%m-%d").date()
@@ -693,58 +936,68 @@ Ready to revolutionize your research workflow! [GO]
                             if paper_date > end:
                                 continue
                     
+                    # Skip versions and near-duplicates of papers we already hold
+                    arxiv_id, version = parse_arxiv_id(result.entry_id)
+                    existing = catalog.get_paper(arxiv_id)
+                    if metadata_only:
+                        if existing and existing["paper_id"] and (existing["version"] or 0) >= (version or 0):
+                            papers_skipped += 1
+                            continue
+                    elif self.already_held(catalog, detector, pdf_dir, result):
+                        papers_skipped += 1
+                        continue
+                    
                     papers_processed += 1
-                    self.log_message(f"[PDF] Processing paper {papers_processed}: {result.title[:60]}...")
+                    if not metadata_only:
+                        self.log_message(f"[PDF] Processing paper {papers_processed}: {result.title[:60]}...")
+                    elif papers_processed % 100 == 0:
+                        self.log_message(f"[FAST] Cataloged {papers_processed} papers...")
                     
-                    paper_id = f"{papers_processed:03d}_{result.entry_id.split('/')[-1]}"
+                    # A paper discovered earlier (e.g. by a metadata-only run) keeps its ID, so its summary
+                    # and later PDF line up; a new version of a PDF we hold gets one of its own
+                    paper_id = existing and existing["paper_id"]
+                    if paper_id and not metadata_only and os.path.exists(paper_file(pdf_dir, f"{paper_id}.pdf")):
+                        paper_id = None
+                    paper_id = paper_id or f"{papers_processed:03d}_{result.entry_id.split('/')[-1]}"
                     pdf_filename = f"{paper_id}.pdf"
                     summary_filename = f"{paper_id}_summary.md"
                     
-                    # Download PDF
-                    pdf_path = os.path.join(pdf_dir, pdf_filename)
-                    try:
-                        result.download_pdf(filename=pdf_path)
-                        papers_downloaded += 1
-                        self.log_message(f"   [OK] Downloaded PDF ({papers_downloaded} total)")
-                    except Exception as e:
-                        self.log_message(f"   [ERR] Failed to download PDF: {str(e)[:100]}")
-                        continue
-                    
-                    # Process PDF
                     pdf_info = {"pages": "N/A", "encrypted": "N/A", "text_extracted": False}
-                    if PDF_PROCESSING_AVAILABLE:
+                    if metadata_only:
+                        pdf_status = "Not downloaded"
+                    else:
+                        # Download PDF
+                        pdf_path = paper_file(pdf_dir, pdf_filename)
                         try:
-                            with open(pdf_path, 'rb') as file:
-                                pdf_reader = PyPDF2.PdfReader(file)
-                                pdf_info["pages"] = len(pdf_reader.pages)
-                                pdf_info["encrypted"] = pdf_reader.is_encrypted
-                                
-                                if self.process_pdf(pdf_path, paper_id):
-                                    pdf_info["text_extracted"] = True
-                                    papers_text_extracted += 1
+                            os.makedirs(os.path.dirname(pdf_path), exist_ok=True)
+                            result.download_pdf(filename=pdf_path)
+                            index_file(catalog, output_dir, pdf_path)
+                            papers_downloaded += 1
+                            self.log_message(f"   [OK] Downloaded PDF ({papers_downloaded} total)")
                         except Exception as e:
-                            self.log_message(f"   [!] PDF analysis failed: {str(e)[:50]}")
+                            self.log_message(f"   [ERR] Failed to download PDF: {str(e)[:100]}")
+                            continue
+                        
+                        # Process PDF
+                        extraction = self.process_pdf(pdf_path, paper_id, cache, arxiv_id)
+                        if extraction:
+                            pdf_info["pages"] = extraction["pages"] if extraction["pages"] is not None else "N/A"
+                            pdf_info["encrypted"] = extraction["encrypted"]
+                            if extraction["text"] and not extraction.get("partial"):
+                                pdf_info["text_extracted"] = True
+                                papers_text_extracted += 1
+                        else:
+                            self.log_message(f"   [!] PDF analysis failed")
+                        pdf_status = 'Encrypted' if pdf_info['encrypted'] else 'Not encrypted'
                     
                     # Create enhanced summary template
-                    summary_path = os.path.join(summary_dir, summary_filename)
-                    with open(summary_path, "w", encoding="utf-8") as f:
-                        f.write(f"# {result.title}\n\n")
-                        f.write(f"**Authors:** {', '.join([a.name for a in result.authors])}\n\n")
-                        f.write(f"**Published:** {result.published.strftime('%Y-%m-%d')}\n\n")
-                        f.write(f"**arXiv URL:** {result.entry_id}\n\n")
-                        f.write(f"**Categories:** {', '.join(result.categories)}\n\n")
-                        f.write(f"**Pages:** {pdf_info['pages']}\n\n")
-                        f.write(f"**PDF Status:** {'Encrypted' if pdf_info['encrypted'] else 'Not encrypted'}\n\n")
-                        f.write("## [LIST] Abstract\n\n")
-                        f.write(f"{result.summary}\n\n")
-                        f.write("## [SEARCH] Summary\n\n...\n\n")
-                        f.write("## [BRAIN] What I Learned\n\n...\n\n")
-                        f.write("## 🔬 How It Can Be Improved\n\n...\n\n")
-                        f.write("## 🧪 Ideas for Extension\n\n...\n")
+                    record = record_from_result(result, paper_id, pdf_info)
+                    write_text(paper_file(summary_dir, summary_filename),
+                               summary_template(record, pdf_info['pages'], pdf_status))
                     
                     # Write to CSV
                     writer.writerow([
-                        papers_processed,
+                        paper_id,
                         result.title,
                         ", ".join([a.name for a in result.authors]),
                         result.published.strftime('%Y-%m-%d'),
@@ -755,19 +1008,96 @@ Ready to revolutionize your research workflow! [GO]
                         pdf_info['encrypted'],
                         pdf_info['text_extracted']
                     ])
+                    if metadata_only:
+                        # Written in batches: discovery runs catalog thousands of papers
+                        pending.append(record)
+                        if len(pending) >= METADATA_PAGE_SIZE:
+                            catalog.upsert_papers(pending)
+                            pending = []
+                    else:
+                        catalog.upsert_paper(record)
+                    catalog.record_version(record["arxiv_id"], record["version"], paper_id)
+                    if detector:
+                        detector.add(record["arxiv_id"], f"{result.title} {result.summary}")
                     
-                    self.log_message(f"   [OK] Created enhanced summary template")
+                    if not metadata_only:
+                        self.log_message(f"   [OK] Created enhanced summary template")
+                
+                catalog.upsert_papers(pending)
+                if query_cache.hits:
+                    self.log_message(f"[CACHE] {query_cache.hits} result pages from the query cache, "
+                                     f"{query_cache.fetches} fetched from arXiv")
                     
             self.log_message(f"[SUCCESS] Completed! Downloaded {papers_downloaded} papers, processed {papers_processed} total")
+            if metadata_only:
+                self.log_message("[FAST] Star papers or use 'Download PDFs' to fetch the ones worth reading")
+            if papers_skipped:
+                self.log_message(f"[SKIP] Skipped {papers_skipped} papers already in the library")
             if PDF_PROCESSING_AVAILABLE:
                 self.log_message(f"[LOG] Text extracted from {papers_text_extracted} papers")
             self.log_message(f"[STATS] Metadata saved to: {metadata_file}")
             
+            try:
+                from semantic_search import update_library_index
+                indexed = update_library_index(output_dir, progress_callback=self.log_message)
+                if indexed:
+                    self.log_message(f"[SEARCH] Semantic index updated with {indexed} papers")
+            except ImportError:
+                pass
+            
+            if store.packed:
+                # Rewritten summaries leave dead frames; this is a no-op until they pass COMPACT_GARBAGE_SHARE
+                reclaimed = store.compact()
+                if reclaimed:
+                    self.log_message(f"[SAVE] Compacted {os.path.basename(store.pack_path)}, reclaimed {reclaimed / 1e6:.1f} MB")
+            
         except Exception as e:
             self.log_message(f"[ERR] Error: {str(e)}")
         finally:
             self.is_fetching = False
+            self.duplicate_detector = None
             self.root.after(0, self._fetch_complete)
+    
+    def create_duplicate_detector(self, catalog):
+        """Set up near-duplicate detection for a fetch run (needs numpy)"""
+        try:
+            from near_duplicates import DuplicateDetector
+        except ImportError:
+            self.log_message("[!] Install numpy for duplicate detection: pip install numpy")
+            return None
+        
+        detector = DuplicateDetector(catalog)
+        backfilled = detector.index_library("meta")
+        if backfilled:
+            self.log_message(f"[SEARCH] Indexed {backfilled} existing papers for duplicate detection")
+        self.duplicate_detector = detector
+        return detector
+    
+    def already_held(self, catalog, detector, pdf_dir, result):
+        """True when this result (or a newer version / near-duplicate of it) is already in the library"""
+        arxiv_id, version = parse_arxiv_id(result.entry_id)
+        reason = quarantine_reason(catalog, arxiv_id)
+        if reason:
+            self.log_message(f"[SKIP] {arxiv_id} is quarantined ({reason})")
+            return True
+        existing = catalog.get_paper(arxiv_id)
+        if existing and existing["paper_id"] and os.path.exists(paper_file(pdf_dir, f"{existing['paper_id']}.pdf")):
+            if (existing["version"] or 0) >= (version or 0):
+                self.log_message(f"[SKIP] {arxiv_id} already held as {existing['paper_id']}")
+                return True
+            self.log_message(f"[NEW] {arxiv_id} v{version} supersedes held v{existing['version']}")
+            return False
+        
+        if detector:
+            match = detector.find(arxiv_id, f"{result.title} {result.summary}")
+            if match:
+                held = catalog.get_paper(match[0])
+                if held and held["paper_id"] and os.path.exists(paper_file(pdf_dir, f"{held['paper_id']}.pdf")):
+                    detector.link(arxiv_id, match[0], match[1], "meta")
+                    catalog.upsert_paper(record_from_result(result))
+                    self.log_message(f"[SKIP] {arxiv_id} duplicates held {match[0]} ({match[1]:.0%})")
+                    return True
+        return False
             
     def _fetch_complete(self):
         """Called when fetch completes to update UI"""
@@ -784,55 +1114,67 @@ Ready to revolutionize your research workflow! [GO]
             
         def analyze():
             self.log_message("[SEARCH] Analyzing existing PDFs...")
-            pdf_files = [f for f in os.listdir(pdf_dir) if f.endswith('.pdf')]
-            
-            if not pdf_files:
-                self.log_message("[ERR] No PDF files found")
-                return
-                
             encrypted_count = 0
             total_pages = 0
+            cache_hits = 0
             
-            for pdf_file in pdf_files:
-                pdf_path = os.path.join(pdf_dir, pdf_file)
-                self.log_message(f"   [PDF] Analyzing {pdf_file}")
+            with LibraryCatalog.for_library(self.output_dir.get()) as catalog:
+                # Pick up PDFs added or removed outside the app since the last scan
+                scan_library(catalog, self.output_dir.get())
+                pdf_files = list_library_files(catalog, self.output_dir.get())
+                if not pdf_files:
+                    self.log_message("[ERR] No PDF files found")
+                    return
                 
-                if PDF_PROCESSING_AVAILABLE:
+                cache = ExtractionCache(catalog)
+                for pdf_path, file_size in pdf_files:
+                    pdf_file = os.path.basename(pdf_path)
+                    self.log_message(f"   [PDF] Analyzing {pdf_file}")
+                    
+                    # Trailer probe; PyPDF2 is only needed for malformed files
                     try:
-                        with open(pdf_path, 'rb') as file:
-                            pdf_reader = PyPDF2.PdfReader(file)
-                            is_encrypted = pdf_reader.is_encrypted
-                            pages = len(pdf_reader.pages)
-                            
-                            if is_encrypted:
-                                encrypted_count += 1
-                                self.log_message(f"     [LOCK] Encrypted, {pages} pages")
-                            else:
-                                total_pages += pages
-                                self.log_message(f"     [OK] Not encrypted, {pages} pages")
+                        facts = extract_pdf(pdf_path, cache, extract_text=False,
+                                            timeout=EXTRACTION_TIMEOUT, memory_mb=EXTRACTION_MEMORY_MB)
+                        cache_hits += facts["cached"]
+                        pages = facts["pages"]
+                        
+                        if pages is None:
+                            self.log_message(f"     [ERR] Error: {facts['errors'][0][:50] if facts['errors'] else 'unreadable'}")
+                        elif facts["encrypted"]:
+                            encrypted_count += 1
+                            self.log_message(f"     [LOCK] Encrypted, {pages} pages")
+                        else:
+                            total_pages += pages
+                            self.log_message(f"     [OK] Not encrypted, {pages} pages")
                                 
+                    except ExtractionFailed as e:
+                        # The file stem is the paper_id; old-style arXiv IDs only survive in the catalog row
+                        row = catalog.query("SELECT arxiv_id FROM papers WHERE paper_id = ?",
+                                            (os.path.splitext(pdf_file)[0],))
+                        self.quarantine(cache, pdf_path, e, row[0][0] if row else parse_arxiv_id(pdf_file)[0])
                     except Exception as e:
-                        self.log_message(f"     [ERR] Error: {str(e)[:50]}")
-                else:
-                    file_size = os.path.getsize(pdf_path) / (1024*1024)
-                    self.log_message(f"     [STATS] Size: {file_size:.2f} MB")
+                        self.log_message(f"     [ERR] Error: {str(e)[:50]} ({file_size / (1024*1024):.2f} MB)")
             
             self.log_message(f"[STATS] Analysis complete: {len(pdf_files)} files, {encrypted_count} encrypted")
-            if PDF_PROCESSING_AVAILABLE:
-                self.log_message(f"📖 Total pages analyzed: {total_pages}")
+            self.log_message(f"📖 Total pages analyzed: {total_pages}")
+            self.log_message(f"[CACHE] {cache_hits} of {len(pdf_files)} PDFs unchanged since last analysis")
         
         threading.Thread(target=analyze, daemon=True).start()
         
+    def open_path(self, path):
+        """Open a file or folder with the system's default application"""
+        if platform.system() == 'Windows':
+            os.startfile(path)
+        elif platform.system() == 'Darwin':  # macOS
+            os.system(f'open "{path}"')
+        else:  # Linux and others
+            os.system(f'xdg-open "{path}"')
+    
     def open_output_folder(self):
         """Open the output folder in file manager"""
         output_dir = self.output_dir.get()
         if os.path.exists(output_dir):
-            if platform.system() == 'Windows':
-                os.startfile(output_dir)
-            elif platform.system() == 'Darwin':  # macOS
-                os.system(f'open "{output_dir}"')
-            else:  # Linux and others
-                os.system(f'xdg-open "{output_dir}"')
+            self.open_path(output_dir)
         else:
             messagebox.showwarning("Warning", f"Directory {output_dir} does not exist yet.")
     
@@ -841,27 +1183,37 @@ Ready to revolutionize your research workflow! [GO]
         try:
             # Import here to avoid dependency issues if not installed
             from research_dashboard import open_research_dashboard
-            
-            # Get current papers data (you can enhance this to read from metadata.csv)
-            papers_data = []
-            if os.path.exists("papers/metadata.csv"):
-                try:
-                    import pandas as pd
-                    df = pd.read_csv("papers/metadata.csv")
-                    papers_data = df.to_dict('records')
-                except:
-                    pass
-            
-            dashboard = open_research_dashboard(self.root, papers_data)
-            if dashboard:
-                self.log_message("[STATS] Research dashboard opened successfully")
         except ImportError:
             messagebox.showinfo("Research Dashboard", 
                                "[STATS] Research Dashboard requires additional packages:\n\n"
                                "pip install matplotlib seaborn pandas\n\n"
                                "Install these packages to unlock advanced analytics!")
-        except Exception as e:
-            self.log_message(f"[ERR] Could not open research dashboard: {e}")
+            return
+        
+        output_dir = self.output_dir.get()
+        
+        def show(papers_data):
+            try:
+                dashboard = open_research_dashboard(self.root, papers_data, output_dir)
+                if dashboard:
+                    self.log_message("[STATS] Research dashboard opened successfully")
+            except Exception as e:
+                self.log_message(f"[ERR] Could not open research dashboard: {e}")
+        
+        def load():
+            # A stale snapshot is rebuilt here, off the Tk thread; the memory-mapped table is passed on as is
+            papers_data = None
+            try:
+                from library_snapshot import load_library_frame, load_library_table
+                papers_data = load_library_table(output_dir)
+                if papers_data is None:
+                    papers_data = load_library_frame(output_dir)
+            except Exception as e:
+                self.root.after(0, self.log_message, f"[!] Could not load library data: {str(e)[:80]}")
+            self.root.after(0, show, papers_data)
+        
+        self.log_message("[STATS] Loading library data for the dashboard...")
+        threading.Thread(target=load, daemon=True).start()
     
     def process_with_ai(self, paper_title, paper_text, paper_id):
         """Process paper with AI assistant"""
@@ -940,14 +1292,15 @@ Highlight:
             ai_dir = os.path.join(self.output_dir.get(), "ai_analysis")
             os.makedirs(ai_dir, exist_ok=True)
             
-            ai_file = os.path.join(ai_dir, f"{paper_id}_ai_{task}.md")
-            with open(ai_file, 'w', encoding='utf-8') as f:
-                f.write(f"# AI Analysis: {task.replace('_', ' ').title()}\n\n")
-                f.write(f"**Paper:** {paper_title}\n\n")
-                f.write(f"**Analysis Type:** {task}\n\n")
-                f.write(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-                f.write("## AI Analysis\n\n")
-                f.write(ai_analysis)
+            ai_file = paper_file(ai_dir, f"{paper_id}_ai_{task}.md")
+            write_text(ai_file, "".join([
+                f"# AI Analysis: {task.replace('_', ' ').title()}\n\n",
+                f"**Paper:** {paper_title}\n\n",
+                f"**Analysis Type:** {task}\n\n",
+                f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n",
+                "## AI Analysis\n\n",
+                ai_analysis,
+            ]))
             
             self.log_message(f"   [AI] AI analysis saved: {os.path.basename(ai_file)}")
             
@@ -1004,27 +1357,94 @@ Transform your research workflow today!"""
         
         messagebox.showinfo("About", about_text)
 
+    def find_similar_papers(self):
+        """Search the offline semantic index by arXiv ID or free text"""
+        try:
+            from semantic_search import find_similar, update_library_index
+        except ImportError:
+            messagebox.showinfo("Find Similar", "[SEARCH] Similarity search requires numpy and scipy:\n\npip install numpy scipy")
+            return
+        
+        window = tk.Toplevel(self.root)
+        window.title("🔎 Find Similar Papers")
+        window.geometry("800x500")
+        
+        main_frame = ttk.Frame(window, padding="15")
+        main_frame.pack(fill="both", expand=True)
+        
+        ttk.Label(main_frame, text="[TARGET] arXiv ID or description:", 
+                 style='Modern.TLabel').pack(anchor="w")
+        
+        query_row = ttk.Frame(main_frame)
+        query_row.pack(fill="x", pady=(5, 10))
+        
+        query_var = tk.StringVar()
+        query_entry = ttk.Entry(query_row, textvariable=query_var, font=('Calibri', 12))
+        query_entry.pack(side="left", fill="x", expand=True, padx=(0, 10))
+        
+        results_list = tk.Listbox(main_frame, font=('Calibri', 10))
+        results_list.pack(fill="both", expand=True)
+        
+        status_var = tk.StringVar(value="[TIP] Example: 2506.19146 or 'tactile dexterous grasping'")
+        ttk.Label(main_frame, textvariable=status_var, style='Subtitle.TLabel').pack(anchor="w", pady=(5, 0))
+        
+        output_dir = self.output_dir.get()
+        
+        def show(results):
+            results_list.delete(0, tk.END)
+            for paper, score in results:
+                results_list.insert(tk.END, f"[{score:.2f}] {paper['arxiv_id']}  {(paper.get('title') or '')[:90]}")
+            status_var.set(f"[OK] {len(results)} similar papers" if results else "[!] No matches - is the index built?")
+        
+        def search(event=None):
+            query = query_var.get().strip()
+            if not query:
+                return
+            status_var.set("[PROC] Searching...")
+            
+            def run():
+                try:
+                    if not os.path.exists(os.path.join(output_dir, "semantic_index")):
+                        update_library_index(output_dir)
+                    results = find_similar(output_dir, query, k=25)
+                except Exception as e:
+                    window.after(0, status_var.set, f"[ERR] Search failed: {str(e)[:80]}")
+                    return
+                window.after(0, show, results)
+            
+            threading.Thread(target=run, daemon=True).start()
+        
+        ttk.Button(query_row, text="[SEARCH] Search", command=search).pack(side="left")
+        query_entry.bind("<Return>", search)
+        query_entry.focus_set()
+    
     def view_downloaded_papers(self):
-        """Show a summary of downloaded papers"""
+        """Show the downloaded papers in a sortable, filterable list"""
+        from paper_list import PaperListModel, VirtualPaperList
+        
         output_dir = self.output_dir.get()
         pdf_dir = os.path.join(output_dir, "pdfs")
-        metadata_file = os.path.join(output_dir, "metadata.csv")
         
         if not os.path.exists(pdf_dir):
             messagebox.showinfo("No Papers", "No papers have been downloaded yet.\nUse '[GO] Fetch & Process Papers' to download research papers.")
             return
-            
-        pdf_files = [f for f in os.listdir(pdf_dir) if f.endswith('.pdf')]
         
-        if not pdf_files:
+        catalog = LibraryCatalog.for_library(output_dir)
+        # Totals come from the directory index; the disk is only scanned in the background
+        indexed = catalog.get_meta("files_indexed") is not None
+        total_papers, total_bytes = library_totals(catalog, output_dir) if indexed else (0, 0)
+        
+        if indexed and not total_papers and not catalog.count():
+            catalog.close()
             messagebox.showinfo("No Papers", "PDF directory exists but no papers found.")
             return
             
         # Create summary window
         summary_window = tk.Toplevel(self.root)
         summary_window.title("📚 Downloaded Research Papers")
-        summary_window.geometry("800x600")
+        summary_window.geometry("1000x600")
         summary_window.configure(bg='#F8F9FA')
+        summary_window.bind("<Destroy>", lambda e: catalog.close() if e.widget is summary_window else None)
         
         # Main frame
         main_frame = ttk.Frame(summary_window, padding="15")
@@ -1040,53 +1460,52 @@ Transform your research workflow today!"""
         stats_frame = ttk.Frame(main_frame)
         stats_frame.pack(fill="x", pady=(0, 15))
         
-        # Calculate basic stats
-        total_papers = len(pdf_files)
-        total_size = sum(os.path.getsize(os.path.join(pdf_dir, f)) for f in pdf_files) / (1024*1024)
+        def stats_text(papers, size, note=""):
+            return f"📊 Total Papers: {papers} | 💾 Total Size: {size / (1024*1024):.1f} MB | 📁 Location: {output_dir}{note}"
         
-        stats_text = f"📊 Total Papers: {total_papers} | 💾 Total Size: {total_size:.1f} MB | 📁 Location: {output_dir}"
-        ttk.Label(stats_frame, text=stats_text, style='Subtitle.TLabel').pack()
+        stats_label = ttk.Label(stats_frame, style='Subtitle.TLabel',
+                                text=stats_text(total_papers, total_bytes, " | 🔄 Checking disk..." if indexed else "")
+                                if indexed else f"🔄 Scanning {output_dir}...")
+        stats_label.pack()
         
         # Papers list
         papers_frame = ttk.LabelFrame(main_frame, text="📋 Paper List", padding="10")
         papers_frame.pack(fill="both", expand=True, pady=(0, 15))
         
-        # Scrollable text area
-        papers_text = scrolledtext.ScrolledText(papers_frame, 
-                                               height=20, 
-                                               font=('Calibri', 10),
-                                               wrap=tk.WORD)
-        papers_text.pack(fill="both", expand=True)
-        
-        # Load and display paper information
-        papers_info = "📋 Downloaded Research Papers:\n\n"
+        filter_row = ttk.Frame(papers_frame)
+        filter_row.pack(fill="x", pady=(0, 8))
+        ttk.Label(filter_row, text="🔍 Filter:").pack(side="left", padx=(0, 8))
+        filter_text = tk.StringVar()
+        filter_entry = ttk.Entry(filter_row, textvariable=filter_text, width=50)
+        filter_entry.pack(side="left", fill="x", expand=True)
+        shown_label = ttk.Label(filter_row, text="")
+        shown_label.pack(side="right", padx=(8, 0))
+        
+        def open_paper(row):
+            if row.get("path") and os.path.exists(row["path"]):
+                self.open_path(row["path"])
+            else:
+                self.log_message(f"[!] No PDF on disk for {row['arxiv_id'] or row['title']}")
         
-        if os.path.exists(metadata_file):
-            try:
-                with open(metadata_file, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                    if len(lines) > 1:  # Skip header
-                        for i, line in enumerate(lines[1:], 1):
-                            parts = line.strip().split(',', 6)  # Split on first 6 commas
-                            if len(parts) >= 3:
-                                paper_id = parts[0]
-                                title = parts[1].strip('"')
-                                authors = parts[2].strip('"')
-                                papers_info += f"📄 Paper {paper_id}: {title[:80]}{'...' if len(title) > 80 else ''}\n"
-                                papers_info += f"   👥 Authors: {authors[:60]}{'...' if len(authors) > 60 else ''}\n"
-                                papers_info += f"   📁 File: {pdf_files[i-1] if i-1 < len(pdf_files) else 'N/A'}\n\n"
-            except Exception as e:
-                papers_info += f"⚠️ Could not read metadata: {e}\n\n"
+        # Only the rows on screen exist as Treeview items; the rest stay in the catalog
+        paper_list = VirtualPaperList(papers_frame, PaperListModel(catalog, output_dir), on_open=open_paper,
+                                      on_change=lambda shown: shown_label.config(text=f"{shown} shown"))
+        paper_list.pack(fill="both", expand=True)
+        filter_text.trace_add("write", lambda *args: paper_list.filter_later(filter_text.get()))
+        filter_entry.focus_set()
         
-        # If no metadata, just list PDF files
-        if "Paper 1:" not in papers_info:
-            papers_info += "📋 PDF Files Found:\n\n"
-            for i, pdf_file in enumerate(sorted(pdf_files), 1):
-                file_size = os.path.getsize(os.path.join(pdf_dir, pdf_file)) / (1024*1024)
-                papers_info += f"📄 {i:02d}. {pdf_file}\n"
-                papers_info += f"    💾 Size: {file_size:.2f} MB\n\n"
+        def scan_done(stats):
+            if not summary_window.winfo_exists():
+                return
+            if "error" in stats:
+                stats_label.config(text=stats_text(total_papers, total_bytes, " | [!] Scan failed"))
+                self.log_message(f"[!] Library scan failed: {stats['error'][:80]}")
+                return
+            stats_label.config(text=stats_text(stats["papers"], stats["bytes"]))
+            if stats["changed"] or stats["removed"]:
+                paper_list.reload()
         
-        papers_text.insert("1.0", papers_info)
+        scan_in_background(output_dir, lambda stats: self.root.after(0, scan_done, stats))
         
         # Action buttons
         button_frame = ttk.Frame(main_frame)
@@ -1099,7 +1518,7 @@ Transform your research workflow today!"""
                   command=self.open_research_dashboard).pack(side="left", padx=(0, 10))
         
         ttk.Button(button_frame, text="🔄 Refresh List", 
-                  command=lambda: self.view_downloaded_papers()).pack(side="left", padx=(0, 10))
+                  command=paper_list.reload).pack(side="left", padx=(0, 10))
         
         ttk.Button(button_frame, text="❌ Close", 
                   command=summary_window.destroy).pack(side="right")
@@ -1108,7 +1527,7 @@ Transform your research workflow today!"""
         summary_window.transient(self.root)
         summary_window.grab_set()
         
-        self.log_message(f"📚 Viewing {total_papers} downloaded papers")
+        self.log_message(f"📚 Viewing {total_papers} downloaded papers" if indexed else "📚 Viewing downloaded papers")
 
 def ensure_emoji_display(root):
     """Ensure proper emoji display on all platforms"""
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Research Daemon for Robotics Paper Fetcher
+Runs the library's saved queries on a cron-like schedule, fetching only what was submitted since the last run
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from batch_runner import MAX_WORKERS, RateLimiter, load_saved_queries, run_batch
+from library_catalog import LibraryCatalog
+from query_cache import ARXIV_TIMEZONE
+
+# Five minutes after arXiv's 20:00 US Eastern announcement, Sunday to Thursday
+DEFAULT_SCHEDULE = "5 20 * * 0-4"
+# Longest single sleep, so a suspended machine or clock change is noticed
+MAX_SLEEP_SECONDS = 900
+WATERMARK_PREFIX = "watermark:"
+
+_FIELDS = (("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 7))
+
+
+def _parse_field(text, low, high):
+    values = set()
+    for part in text.split(","):
+        spec, _, step = part.partition("/")
+        if spec == "*":
+            start, end = low, high
+        elif "-" in spec:
+            start, end = (int(value) for value in spec.split("-", 1))
+        else:
+            start = end = int(spec)
+        if not low <= start <= end <= high:
+            raise ValueError(f"{part!r} is outside {low}-{high}")
+        values.update(range(start, end + 1, int(step) if step else 1))
+    return values
+
+
+class CronSchedule:
+    """A five-field cron expression (minute hour day month weekday), read in arXiv's time zone
+
+    Fields take *, numbers, ranges, lists and /steps; weekday 0 and 7 are
+    Sunday. As in cron, a run matches either day field when both are set.
+    """
+
+    def __init__(self, expression=DEFAULT_SCHEDULE, tz=ARXIV_TIMEZONE):
+        fields = expression.split()
+        if len(fields) != len(_FIELDS):
+            raise ValueError(f"Expected 5 schedule fields, got {len(fields)}: {expression!r}")
+        self.expression = expression
+        self.tz = tz
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            _parse_field(text, low, high) for text, (_, low, high) in zip(fields, _FIELDS))
+        self.weekdays = {day % 7 for day in weekdays}
+        self._any_day, self._any_weekday = fields[2] == "*", fields[4] == "*"
+
+    def _day_matches(self, day):
+        if day.month not in self.months:
+            return False
+        by_date = day.day in self.days
+        by_weekday = (day.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return by_date and by_weekday
+        return by_date or by_weekday
+
+    def next_after(self, now=None):
+        """First scheduled time (UTC) strictly after now"""
+        local = (now or datetime.now(timezone.utc)).astimezone(self.tz)
+        day = local.date()
+        # Four years covers any valid day-of-month/month combination, including 29 February
+        for _ in range(4 * 366):
+            if self._day_matches(day):
+                for hour in sorted(self.hours):
+                    for minute in sorted(self.minutes):
+                        candidate = datetime(day.year, day.month, day.day, hour, minute, tzinfo=self.tz)
+                        if candidate > local:
+                            return candidate.astimezone(timezone.utc)
+            day += timedelta(days=1)
+        raise ValueError(f"Schedule {self.expression!r} never runs")
+
+
+def load_watermarks(catalog):
+    """Newest submission time seen per saved query: {query name: ISO time}"""
+    rows = catalog.query("SELECT key, value FROM catalog_meta WHERE key LIKE ?", (WATERMARK_PREFIX + "%",))
+    return {row[0][len(WATERMARK_PREFIX):]: row[1] for row in rows}
+
+
+class ResearchDaemon:
+    """Long-running scheduler for a library's saved queries
+
+    Each run reads saved_queries.json afresh (so edits apply without a
+    restart) and asks arXiv only for papers submitted after each query's
+    watermark (however many that is), which is advanced once the run's
+    papers are cataloged. A query without a watermark is backfilled up to
+    its max_results. The worker threads, their API connections and the
+    rate limiter live as long as the daemon, and it sleeps on an event
+    between runs.
+    """
+
+    def __init__(self, output_dir, schedule=DEFAULT_SCHEDULE, download=True, progress_callback=None):
+        self.output_dir = output_dir
+        self.schedule = CronSchedule(schedule) if isinstance(schedule, str) else schedule
+        self.download = download
+        self.log = progress_callback or (lambda message: None)
+        self.limiter = RateLimiter()
+        self.pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="research-daemon")
+        self.runs = 0
+        self._stop = threading.Event()
+
+    def run_once(self):
+        """Run every saved query incrementally; returns the batch counts, or None with no saved queries"""
+        queries = load_saved_queries(self.output_dir)
+        if not queries:
+            self.log(f"[DAEMON] No saved queries in {self.output_dir}")
+            return None
+        with LibraryCatalog.for_library(self.output_dir) as catalog:
+            watermarks = load_watermarks(catalog)
+        # Every run follows an announcement, so the first page is always fetched; later pages
+        # come from the cache when it shows the leading results unchanged
+        stats = run_batch(self.output_dir, queries, progress_callback=self.log, should_stop=self._stop.is_set,
+                          download=self.download, pool=self.pool, limiter=self.limiter,
+                          watermarks=watermarks, refresh=True)
+        if self._stop.is_set():
+            # Results are read newest first, so a cut-short run must not move the watermarks past unread papers
+            return stats
+        with LibraryCatalog.for_library(self.output_dir) as catalog:
+            for name, submitted in stats["watermarks"].items():
+                if submitted > watermarks.get(name, ""):
+                    catalog.set_meta(WATERMARK_PREFIX + name, submitted)
+        self.runs += 1
+        self.log(f"[DAEMON] Run {self.runs}: {stats['new']} new papers, {stats['downloaded']} PDFs downloaded")
+        return stats
+
+    def run_forever(self):
+        """Run on schedule until stop() is called"""
+        try:
+            while not self._stop.is_set():
+                due = self.schedule.next_after()
+                self.log(f"[DAEMON] Next run at {due.astimezone(self.schedule.tz):%Y-%m-%d %H:%M %Z}")
+                while not self._stop.is_set():
+                    remaining = (due - datetime.now(timezone.utc)).total_seconds()
+                    if remaining <= 0:
+                        break
+                    self._stop.wait(min(remaining, MAX_SLEEP_SECONDS))
+                if self._stop.is_set():
+                    break
+                try:
+                    self.run_once()
+                except Exception as e:
+                    # A failed run (network, API) is retried at the next scheduled time
+                    self.log(f"[ERR] Scheduled run failed: {e}")
+        finally:
+            self.pool.shutdown(wait=True)
+
+    def stop(self):
+        self._stop.set()
@@ -5,7 +5,7 @@ Advanced analytics and visualization for research management
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
@@ -15,15 +15,18 @@ import os
 import json
 from collections import Counter, defaultdict
 import re
+import threading
 
 # Set style for better plots
 plt.style.use('seaborn-v0_8-whitegrid')
 sns.set_palette("husl")
 
 class ResearchDashboard:
-    def __init__(self, parent, papers_data=None):
+    def __init__(self, parent, papers_data=None, library_dir="papers"):
         self.parent = parent
-        self.papers_data = papers_data or []
+        # A pyarrow Table or DataFrame; only its length is read, so rows are never copied
+        self.papers_data = papers_data if papers_data is not None else []
+        self.library_dir = library_dir
         self.setup_dashboard()
     
     def setup_dashboard(self):
@@ -145,6 +148,25 @@ class ResearchDashboard:
         export_options_frame = ttk.LabelFrame(export_frame, text="📋 Export Options", padding="20")
         export_options_frame.pack(fill="x", padx=20, pady=20)
         
+        # Export filters
+        filter_frame = ttk.Frame(export_options_frame)
+        filter_frame.pack(fill="x", pady=(0, 10))
+        
+        self.export_query = tk.StringVar()
+        self.export_category = tk.StringVar()
+        self.export_since = tk.StringVar()
+        self.export_until = tk.StringVar()
+        
+        ttk.Label(filter_frame, text="🔍 Query:").pack(side="left")
+        ttk.Entry(filter_frame, textvariable=self.export_query, width=25).pack(side="left", padx=(5, 15))
+        ttk.Label(filter_frame, text="📚 Category:").pack(side="left")
+        ttk.Combobox(filter_frame, textvariable=self.export_category, width=8,
+                     values=["", "cs.RO", "cs.AI", "cs.LG", "cs.CV", "eess.SY", "cs.HC", "cs.CL"]).pack(side="left", padx=(5, 15))
+        ttk.Label(filter_frame, text="📅 From:").pack(side="left")
+        ttk.Entry(filter_frame, textvariable=self.export_since, width=11).pack(side="left", padx=(5, 10))
+        ttk.Label(filter_frame, text="To:").pack(side="left")
+        ttk.Entry(filter_frame, textvariable=self.export_until, width=11).pack(side="left", padx=(5, 0))
+        
         # Bibliography export
         bib_frame = ttk.Frame(export_options_frame)
         bib_frame.pack(fill="x", pady=10)
@@ -169,8 +191,15 @@ class ResearchDashboard:
         
         ttk.Button(data_buttons_frame, text="📈 Excel Report", command=self.export_excel).pack(side="left", padx=(0, 10))
         ttk.Button(data_buttons_frame, text="📊 CSV Data", command=self.export_csv).pack(side="left", padx=(0, 10))
+        ttk.Button(data_buttons_frame, text="🗃️ Parquet Snapshot", command=self.export_parquet).pack(side="left", padx=(0, 10))
         ttk.Button(data_buttons_frame, text="📑 Research Summary", command=self.export_summary).pack(side="left", padx=(0, 10))
         
+        # Export progress
+        self.export_status = tk.StringVar(value="")
+        self.export_progress = ttk.Progressbar(export_options_frame, mode='determinate', maximum=100)
+        self.export_progress.pack(fill="x", pady=(10, 2))
+        ttk.Label(export_options_frame, textvariable=self.export_status, foreground="gray").pack(anchor="w")
+        
         # Sharing options
         sharing_frame = ttk.LabelFrame(export_frame, text="🤝 Sharing & Collaboration", padding="20")
         sharing_frame.pack(fill="x", padx=20, pady=10)
@@ -201,34 +230,29 @@ class ResearchDashboard:
     
     def count_recent_papers(self):
         """Count papers from the last 30 days"""
-        if not self.papers_data:
+        if not len(self.papers_data):
             return 0
         
         thirty_days_ago = datetime.now() - timedelta(days=30)
-        recent_count = 0
-        
-        for paper in self.papers_data:
-            # This would need to be adapted based on your data structure
-            # Assuming papers have a 'date' or 'published' field
-            recent_count += 1  # Placeholder
+        # This would need to be adapted based on your data structure
+        # Assuming papers have a 'date' or 'published' field
+        recent_count = len(self.papers_data)  # Placeholder
         
-        return min(recent_count, len(self.papers_data))
+        return recent_count
     
     def count_categories(self):
         """Count unique categories in papers"""
-        if not self.papers_data:
+        if not len(self.papers_data):
             return 0
         
-        categories = set()
-        for paper in self.papers_data:
-            # Extract categories from paper metadata
-            categories.add("Robotics")  # Placeholder
+        # Extract categories from paper metadata
+        categories = {"Robotics"}  # Placeholder
         
         return max(1, len(categories))
     
     def avg_pages(self):
         """Calculate average pages per paper"""
-        if not self.papers_data:
+        if not len(self.papers_data):
             return 0
         
         # This would calculate based on actual PDF page counts
@@ -306,51 +330,220 @@ class ResearchDashboard:
         ]
     
     def create_evolution_chart(self, parent):
-        """Create research evolution visualization"""
-        evolution_text = """
-📊 Research Evolution Analysis
-
-🔹 Emerging Trends (2024):
-  • Transformer architectures in robotics
-  • Multi-modal learning approaches
-  • Sim-to-real transfer methods
-
-🔹 Growing Areas:
-  • Embodied AI and robotics
-  • Few-shot learning applications
-  • Sustainable robotics research
-
-🔹 Established Fields:
-  • Classical computer vision
-  • Traditional control theory
-  • Statistical machine learning
-        """
+        """Create research evolution visualization from per-paper topic weights"""
+        self.evolution_frame = parent
+        self.render_topic_evolution()
+    
+    def render_topic_evolution(self):
+        """Draw topic share over time, or offer to compute topics if none are stored yet"""
+        for child in self.evolution_frame.winfo_children():
+            child.destroy()
+        
+        try:
+            from library_catalog import LibraryCatalog
+            from topic_model import topic_labels, topics_over_time, rising_topics
+            with LibraryCatalog.for_library(self.library_dir) as catalog:
+                labels = topic_labels(catalog)
+                timeline = topics_over_time(catalog)
+        except ImportError:
+            ttk.Label(self.evolution_frame, text="Topic modeling requires numpy and scipy:\npip install numpy scipy",
+                      foreground="gray").pack(pady=20)
+            return
+        
+        controls = ttk.Frame(self.evolution_frame)
+        controls.pack(fill="x")
+        self.topic_status = tk.StringVar()
+        ttk.Button(controls, text="🔄 Refresh Topics", command=self.refresh_topics).pack(side="left")
+        ttk.Label(controls, textvariable=self.topic_status, foreground="gray").pack(side="left", padx=(10, 0))
+        
+        if not labels or not timeline:
+            self.topic_status.set("No topics yet - click Refresh Topics to model the library")
+            return
+        
+        rising = rising_topics(timeline, labels, k=3)
+        if rising:
+            self.topic_status.set("🔹 Rising: " + "; ".join(label for change, label in rising if change > 0))
+        
+        # Stack the most prominent topics; fold the rest into "Other"
+        periods = sorted(timeline)
+        totals = {topic: sum(timeline[p].get(topic, 0) for p in periods) for topic in labels}
+        shown = sorted(totals, key=totals.get, reverse=True)[:8]
+        series = [[timeline[p].get(topic, 0) for p in periods] for topic in shown]
+        other = [max(0, 1 - sum(values)) for values in zip(*series)]
+        
+        fig, ax = plt.subplots(figsize=(10, 3.5))
+        ax.stackplot(range(len(periods)), *series, other,
+                     labels=[labels[t] for t in shown] + ["Other"], alpha=0.85)
+        ax.set_xticks(range(len(periods)))
+        ax.set_xticklabels(periods, rotation=45, fontsize=8)
+        ax.set_ylim(0, 1)
+        ax.set_ylabel('Topic Share')
+        ax.set_title('📊 Research Topics Over Time', fontsize=12, fontweight='bold')
+        ax.legend(loc='upper left', bbox_to_anchor=(1.01, 1), fontsize=8)
+        fig.tight_layout()
+        
+        canvas = FigureCanvasTkAgg(fig, self.evolution_frame)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill="both", expand=True)
+    
+    def refresh_topics(self):
+        """Refine (or fit) the topic model in the background, then redraw"""
+        from topic_model import refresh_topics
+        
+        self.topic_status.set("🔄 Modeling topics...")
         
-        text_widget = tk.Text(parent, wrap=tk.WORD, height=12, font=('Segoe UI', 10))
-        text_widget.pack(fill="both", expand=True, padx=10, pady=10)
-        text_widget.insert(tk.END, evolution_text)
-        text_widget.config(state=tk.DISABLED)
+        def report(message):
+            self.dashboard_window.after(0, self.topic_status.set, f"🔄 {message}")
+        
+        def run():
+            try:
+                refresh_topics(self.library_dir, progress_callback=report)
+            except Exception as e:
+                self.dashboard_window.after(0, self.topic_status.set, f"❌ Topic refresh failed: {e}")
+                return
+            self.dashboard_window.after(0, self.render_topic_evolution)
+        
+        threading.Thread(target=run, daemon=True).start()
     
     # Export methods
     def export_bibtex(self):
         """Export papers as BibTeX format"""
-        messagebox.showinfo("Export", "📄 BibTeX export feature coming soon!\nWill generate properly formatted citations.")
+        self.run_bibliography_export("bibtex")
     
     def export_endnote(self):
         """Export papers for EndNote"""
-        messagebox.showinfo("Export", "📋 EndNote export feature coming soon!\nWill create .enw files for import.")
+        self.run_bibliography_export("endnote")
     
     def export_ris(self):
         """Export papers in RIS format"""
-        messagebox.showinfo("Export", "🔗 RIS export feature coming soon!\nCompatible with most reference managers.")
+        self.run_bibliography_export("ris")
+    
+    def get_export_filters(self):
+        """Read the export filter fields; raises ValueError on a malformed date"""
+        filters = {
+            "query": self.export_query.get().strip() or None,
+            "category": self.export_category.get().strip() or None,
+        }
+        for key, var in (("since", self.export_since), ("until", self.export_until)):
+            value = var.get().strip()
+            if value:
+                datetime.strptime(value, "%Y-%m-%d")
+            filters[key] = value or None
+        return filters
+    
+    def update_export_progress(self, done, total):
+        """Update the export progress bar (called on the Tk thread)"""
+        self.export_progress["value"] = 100 * done / total if total else 100
+        self.export_status.set(f"📤 Exported {done}/{total} papers...")
+    
+    def run_bibliography_export(self, fmt):
+        """Stream the filtered catalog to a bibliography file in a background thread"""
+        from bib_export import EXPORT_FORMATS, export_library
+        
+        try:
+            filters = self.get_export_filters()
+        except ValueError:
+            messagebox.showerror("Export", "Invalid date format. Please use YYYY-MM-DD.")
+            return
+        
+        info = EXPORT_FORMATS[fmt]
+        path = filedialog.asksaveasfilename(parent=self.dashboard_window,
+                                            defaultextension=info["extension"],
+                                            initialfile=f"research_library{info['extension']}",
+                                            filetypes=[(info["label"], f"*{info['extension']}")])
+        if not path:
+            return
+        
+        self.export_progress["value"] = 0
+        self.export_status.set(f"📤 Exporting {info['label']}...")
+        
+        def report(done, total):
+            self.dashboard_window.after(0, self.update_export_progress, done, total)
+        
+        def export():
+            try:
+                count = export_library(self.library_dir, path, fmt, progress_callback=report, **filters)
+            except Exception as e:
+                self.dashboard_window.after(0, self.export_status.set, f"❌ Export failed: {e}")
+                return
+            self.dashboard_window.after(0, self.export_status.set,
+                                        f"✅ Exported {count} papers to {os.path.basename(path)}")
+        
+        threading.Thread(target=export, daemon=True).start()
+    
+    def run_data_export(self, label, extension, write):
+        """Ask for a destination and run write(path) -> row count in a background thread"""
+        path = filedialog.asksaveasfilename(parent=self.dashboard_window,
+                                            defaultextension=extension,
+                                            initialfile=f"research_library{extension}",
+                                            filetypes=[(label, f"*{extension}")])
+        if not path:
+            return
+        
+        self.export_progress.config(mode='indeterminate')
+        self.export_progress.start()
+        self.export_status.set(f"📤 Exporting {label}...")
+        
+        def finish(message):
+            self.export_progress.stop()
+            self.export_progress.config(mode='determinate')
+            self.export_progress["value"] = 100
+            self.export_status.set(message)
+        
+        def export():
+            try:
+                count = write(path)
+            except Exception as e:
+                self.dashboard_window.after(0, finish, f"❌ Export failed: {e}")
+                return
+            self.dashboard_window.after(0, finish, f"✅ Exported {count} papers to {os.path.basename(path)}")
+        
+        threading.Thread(target=export, daemon=True).start()
     
     def export_excel(self):
         """Export comprehensive Excel report"""
-        messagebox.showinfo("Export", "📈 Excel report feature coming soon!\nWill include analytics and paper details.")
+        from library_snapshot import load_library_frame
+        
+        def write(path):
+            df = load_library_frame(self.library_dir)
+            for column in ("authors", "categories"):
+                if column in df.columns:
+                    df[column] = df[column].map(lambda v: ", ".join(v) if v is not None and not isinstance(v, str) else v)
+            with pd.ExcelWriter(path) as writer:
+                df.to_excel(writer, sheet_name="Papers", index=False)
+                if "primary_category" in df.columns:
+                    df["primary_category"].value_counts().rename_axis("Category").to_frame("Papers") \
+                        .to_excel(writer, sheet_name="Categories")
+            return len(df)
+        
+        self.run_data_export("Excel", ".xlsx", write)
     
     def export_csv(self):
         """Export raw data as CSV"""
-        messagebox.showinfo("Export", "📊 CSV export feature coming soon!\nMachine-readable research data.")
+        from library_catalog import LibraryCatalog
+        from library_snapshot import export_csv
+        
+        def write(path):
+            with LibraryCatalog.for_library(self.library_dir) as catalog:
+                return export_csv(catalog, path)
+        
+        self.run_data_export("CSV", ".csv", write)
+    
+    def export_parquet(self):
+        """Export a columnar Parquet snapshot of the full library"""
+        from library_catalog import LibraryCatalog
+        from library_snapshot import ARROW_AVAILABLE, write_snapshot
+        
+        if not ARROW_AVAILABLE:
+            messagebox.showerror("Missing Dependencies", "Parquet export requires pyarrow:\n\npip install pyarrow")
+            return
+        
+        def write(path):
+            with LibraryCatalog.for_library(self.library_dir) as catalog:
+                return write_snapshot(catalog, os.path.join(self.library_dir, "extracted_text"),
+                                      parquet_path=path)
+        
+        self.run_data_export("Parquet", ".parquet", write)
     
     def export_summary(self):
         """Export research summary report"""
@@ -358,20 +551,155 @@ class ResearchDashboard:
     
     def generate_reading_list(self):
         """Generate prioritized reading list"""
-        messagebox.showinfo("Sharing", "📤 Reading list generation coming soon!\nPrioritized by relevance and impact.")
+        try:
+            from reading_list import generate_reading_list
+        except ImportError as e:
+            messagebox.showerror("Missing Dependencies",
+                               f"Reading lists require numpy and scipy:\n\npip install numpy scipy\n\nError: {e}")
+            return
+        
+        self.export_status.set("📤 Ranking unread papers...")
+        
+        def build():
+            try:
+                md_path, csv_path, entries = generate_reading_list(self.library_dir)
+            except Exception as e:
+                self.dashboard_window.after(0, self.export_status.set, f"❌ Reading list failed: {e}")
+                return
+            self.dashboard_window.after(0, self.export_status.set,
+                                        f"✅ Reading list saved to {os.path.basename(md_path)} and {os.path.basename(csv_path)}")
+            self.dashboard_window.after(0, self.show_reading_list, entries)
+        
+        threading.Thread(target=build, daemon=True).start()
+    
+    def show_reading_list(self, entries):
+        """Show the ranked reading list with star / mark-read actions"""
+        from library_catalog import LibraryCatalog
+        
+        window = tk.Toplevel(self.dashboard_window)
+        window.title("📤 Prioritized Reading List")
+        window.geometry("900x600")
+        
+        ttk.Label(window, text="⭐ Star papers you like to steer future lists; ✅ mark papers read to drop them",
+                  foreground="gray").pack(anchor="w", padx=20, pady=(15, 5))
+        
+        listbox = tk.Listbox(window, font=('Segoe UI', 10), selectmode=tk.EXTENDED)
+        listbox.pack(fill="both", expand=True, padx=20, pady=10)
+        for entry in entries:
+            listbox.insert(tk.END, f"{entry['rank']:3d}. [{entry['score']:.2f}] {(entry.get('title') or entry['arxiv_id'])[:90]}")
+        if not entries:
+            listbox.insert(tk.END, "No unread papers to rank yet")
+        
+        def mark(**status):
+            selected = [entries[i]["arxiv_id"] for i in listbox.curselection() if i < len(entries)]
+            with LibraryCatalog.for_library(self.library_dir) as catalog:
+                for arxiv_id in selected:
+                    catalog.set_reading_status(arxiv_id, **status)
+            for i in listbox.curselection():
+                listbox.itemconfig(i, foreground="gray")
+        
+        button_frame = ttk.Frame(window)
+        button_frame.pack(fill="x", padx=20, pady=(0, 15))
+        ttk.Button(button_frame, text="⭐ Star", command=lambda: mark(starred=True)).pack(side="left", padx=(0, 10))
+        ttk.Button(button_frame, text="✅ Mark Read", command=lambda: mark(read=True)).pack(side="left", padx=(0, 10))
+        ttk.Button(button_frame, text="🔄 Regenerate", command=lambda: (window.destroy(), self.generate_reading_list())).pack(side="left", padx=(0, 10))
+        ttk.Button(button_frame, text="❌ Close", command=window.destroy).pack(side="right")
     
     def create_citation_network(self):
-        """Create citation network visualization"""
-        messagebox.showinfo("Sharing", "🔗 Citation network feature coming soon!\nVisualize paper relationships.")
+        """Build the local citation network in the background and show the results"""
+        try:
+            from citation_network import build_library_network
+        except ImportError as e:
+            messagebox.showerror("Missing Dependencies",
+                               f"Citation network requires numpy and scipy:\n\n"
+                               f"pip install numpy scipy\n\nError: {e}")
+            return
+
+        progress_window = tk.Toplevel(self.dashboard_window)
+        progress_window.title("🔗 Citation Network")
+        status_var = tk.StringVar(value="🔍 Parsing reference sections...")
+        ttk.Label(progress_window, textvariable=status_var, padding="20").pack()
+
+        def report(done, total):
+            self.dashboard_window.after(0, status_var.set, f"🔍 Parsed {done}/{total} papers...")
+
+        def build():
+            try:
+                network = build_library_network(self.library_dir, progress_callback=report)
+            except Exception as e:
+                self.dashboard_window.after(0, progress_window.destroy)
+                self.dashboard_window.after(0, messagebox.showerror, "Citation Network",
+                                            f"Could not build citation network:\n{e}")
+                return
+            self.dashboard_window.after(0, progress_window.destroy)
+            self.dashboard_window.after(0, self.show_citation_network, network)
+
+        threading.Thread(target=build, daemon=True).start()
+
+    def show_citation_network(self, network):
+        """Display most-cited papers, co-citations and export options"""
+        window = tk.Toplevel(self.dashboard_window)
+        window.title("🔗 Citation Network")
+        window.geometry("900x600")
+
+        ttk.Label(window, text=f"📊 {len(network)} papers | 🔗 {network.edge_count} local citations",
+                  font=('Segoe UI', 11, 'bold')).pack(anchor="w", padx=20, pady=(15, 5))
+
+        lists_frame = ttk.Frame(window)
+        lists_frame.pack(fill="both", expand=True, padx=20, pady=10)
+
+        cited_frame = ttk.LabelFrame(lists_frame, text="🏆 Most Cited in Library", padding="10")
+        cited_frame.pack(side="left", fill="both", expand=True, padx=(0, 10))
+        cited_listbox = tk.Listbox(cited_frame, font=('Segoe UI', 10))
+        cited_listbox.pack(fill="both", expand=True)
+
+        cocited_frame = ttk.LabelFrame(lists_frame, text="🤝 Frequently Co-cited", padding="10")
+        cocited_frame.pack(side="left", fill="both", expand=True)
+        cocited_listbox = tk.Listbox(cocited_frame, font=('Segoe UI', 10))
+        cocited_listbox.pack(fill="both", expand=True)
+
+        top_cited = network.most_cited(50)
+        for arxiv_id, count in top_cited:
+            cited_listbox.insert(tk.END, f"({count}) {network.titles.get(arxiv_id, arxiv_id)[:70]}")
+        if not top_cited:
+            cited_listbox.insert(tk.END, "No citations between library papers found yet")
+
+        def show_cocited(event):
+            selection = cited_listbox.curselection()
+            if not selection or selection[0] >= len(top_cited):
+                return
+            cocited_listbox.delete(0, tk.END)
+            for arxiv_id, count in network.co_citation(top_cited[selection[0]][0], k=25):
+                cocited_listbox.insert(tk.END, f"({count}) {network.titles.get(arxiv_id, arxiv_id)[:70]}")
+
+        cited_listbox.bind("<<ListboxSelect>>", show_cocited)
+
+        def export(kind):
+            extension = ".graphml" if kind == "graphml" else ".json"
+            path = filedialog.asksaveasfilename(parent=window, defaultextension=extension,
+                                                initialfile=f"citation_network{extension}")
+            if not path:
+                return
+            if kind == "graphml":
+                network.export_graphml(path)
+            else:
+                network.export_json(path)
+            messagebox.showinfo("Export", f"🔗 Citation network exported to:\n{path}", parent=window)
+
+        button_frame = ttk.Frame(window)
+        button_frame.pack(fill="x", padx=20, pady=(0, 15))
+        ttk.Button(button_frame, text="📤 Export GraphML", command=lambda: export("graphml")).pack(side="left", padx=(0, 10))
+        ttk.Button(button_frame, text="📤 Export JSON", command=lambda: export("json")).pack(side="left", padx=(0, 10))
+        ttk.Button(button_frame, text="❌ Close", command=window.destroy).pack(side="right")
     
     def create_portfolio(self):
         """Create research portfolio"""
         messagebox.showinfo("Sharing", "📋 Research portfolio feature coming soon!\nProfessional research summary.")
 
-def open_research_dashboard(parent, papers_data=None):
+def open_research_dashboard(parent, papers_data=None, library_dir="papers"):
     """Open the research dashboard window"""
     try:
-        dashboard = ResearchDashboard(parent, papers_data)
+        dashboard = ResearchDashboard(parent, papers_data, library_dir)
         return dashboard
     except ImportError as e:
         messagebox.showerror("Missing Dependencies", 
@@ -7,28 +7,45 @@ import os
 import sys
 from pathlib import Path
 
-def check_pdf_properties(pdf_path):
-    """Check PDF properties including encryption status"""
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf_probe import ProbeError, probe_file
+
+def check_pdf_properties(pdf_path, sample_text=True):
+    """Check PDF properties including encryption status
+    
+    Page count and encryption come from the trailer probe; PyPDF2 is only
+    loaded for the text sample or when the file is malformed.
+    """
+    info = {
+        'file': os.path.basename(pdf_path),
+        'size_mb': round(os.path.getsize(pdf_path) / (1024*1024), 2),
+        'can_extract_text': False,
+        'sample_text': 'Skipped (fast mode)'
+    }
+    try:
+        pages, is_encrypted = probe_file(pdf_path)
+        info['encrypted'] = is_encrypted
+        info['num_pages'] = pages if not is_encrypted else 'N/A (encrypted)'
+        if not sample_text:
+            return info
+    except ProbeError:
+        pass
+    
     try:
         import PyPDF2
         
         with open(pdf_path, 'rb') as file:
             pdf_reader = PyPDF2.PdfReader(file)
             
-            # Check if encrypted
-            is_encrypted = pdf_reader.is_encrypted
-            
-            # Get basic info
-            info = {
-                'file': os.path.basename(pdf_path),
-                'size_mb': round(os.path.getsize(pdf_path) / (1024*1024), 2),
-                'encrypted': is_encrypted,
-                'num_pages': len(pdf_reader.pages) if not is_encrypted else 'N/A (encrypted)',
-                'can_extract_text': False
-            }
+            # Only a malformed file needs the full page tree
+            if 'encrypted' not in info:
+                info['encrypted'] = pdf_reader.is_encrypted
+                info['num_pages'] = len(pdf_reader.pages) if not pdf_reader.is_encrypted else 'N/A (encrypted)'
             
             # Try to extract text from first page (if not encrypted)
-            if not is_encrypted:
+            if not info['encrypted']:
                 try:
                     first_page = pdf_reader.pages[0]
                     text = first_page.extract_text()
@@ -43,25 +60,20 @@ def check_pdf_properties(pdf_path):
             return info
             
     except ImportError:
-        return {
-            'file': os.path.basename(pdf_path),
-            'size_mb': round(os.path.getsize(pdf_path) / (1024*1024), 2),
-            'encrypted': 'Unknown (PyPDF2 not installed)',
-            'num_pages': 'Unknown',
-            'can_extract_text': False,
-            'sample_text': 'Install PyPDF2 to analyze PDFs'
-        }
+        info.setdefault('encrypted', 'Unknown (PyPDF2 not installed)')
+        info.setdefault('num_pages', 'Unknown')
+        info['sample_text'] = 'Install PyPDF2 to analyze PDFs'
+        return info
     except Exception as e:
-        return {
-            'file': os.path.basename(pdf_path),
-            'size_mb': round(os.path.getsize(pdf_path) / (1024*1024), 2),
+        info.update({
             'encrypted': f'Error: {str(e)}',
             'num_pages': 'Error',
             'can_extract_text': False,
             'sample_text': f'Analysis failed: {str(e)}'
-        }
+        })
+        return info
 
-def analyze_pdfs_in_directory(directory):
+def analyze_pdfs_in_directory(directory, sample_text=True):
     """Analyze all PDFs in a directory"""
     pdf_files = list(Path(directory).glob("*.pdf"))
     
@@ -75,7 +87,7 @@ def analyze_pdfs_in_directory(directory):
     
     for pdf_file in pdf_files:
         print(f"🔍 Analyzing: {pdf_file.name}")
-        info = check_pdf_properties(pdf_file)
+        info = check_pdf_properties(pdf_file, sample_text)
         results.append(info)
         
         # Print results
@@ -89,20 +101,26 @@ def analyze_pdfs_in_directory(directory):
     return results
 
 def main():
+    # --fast: page count and encryption only, read from the trailer (no PyPDF2 needed)
+    fast = "--fast" in sys.argv[1:]
+    
     # Check if PyPDF2 is installed
     try:
         import PyPDF2
         print("✅ PyPDF2 is available for PDF analysis")
     except ImportError:
-        print("❌ PyPDF2 not installed. Installing...")
-        import subprocess
-        subprocess.run([sys.executable, "-m", "pip", "install", "PyPDF2"])
-        print("✅ PyPDF2 installed successfully")
+        if fast:
+            print("ℹ️  PyPDF2 not installed; fast mode does not need it")
+        else:
+            print("❌ PyPDF2 not installed. Installing...")
+            import subprocess
+            subprocess.run([sys.executable, "-m", "pip", "install", "PyPDF2"])
+            print("✅ PyPDF2 installed successfully")
     
     # Analyze PDFs in papers/pdfs directory
     pdf_dir = "papers/pdfs"
     if os.path.exists(pdf_dir):
-        results = analyze_pdfs_in_directory(pdf_dir)
+        results = analyze_pdfs_in_directory(pdf_dir, sample_text=not fast)
         
         # Summary
         encrypted_count = sum(1 for r in results if r['encrypted'] is True)
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Semantic Similarity Search for Robotics Paper Fetcher
+Offline LSA index (TF-IDF + truncated SVD) stored as a memory-mapped float32 matrix
+"""
+
+import os
+import json
+import math
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+from library_catalog import LibraryCatalog, normalize_title, parse_arxiv_id
+from library_layout import paper_file
+from text_store import read_text
+
+INDEX_DIRNAME = "semantic_index"
+DIMENSIONS = 256
+MAX_FEATURES = 50000
+MIN_DOC_FREQ = 2
+MAX_TEXT_CHARS = 20000
+# Below this many papers an SVD basis is not meaningful
+MIN_FIT_DOCS = 20
+# Refit the basis once the library has grown this much since the last fit
+REFIT_GROWTH = 2.0
+
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being
+below between both but by can did do does doing down during each few for from further had has
+have having he her here hers herself him himself his how i if in into is it its itself just me
+more most my myself no nor not now of off on once only or other our ours ourselves out over own
+same she should so some such than that the their theirs them themselves then there these they
+this those through to too under until up very was we were what when where which while who whom
+why will with you your yours yourself yourselves also however using used use based via et al
+paper propose proposed show results method approach fig figure table section page
+""".split())
+
+
+def tokenize(text):
+    return [t for t in normalize_title(text).split() if len(t) > 2 and t not in STOPWORDS and not t.isdigit()]
+
+
+def paper_document(paper, text_dir=None):
+    """Text indexed for a paper: title, abstract and the start of its extracted text"""
+    parts = [paper.get("title") or "", paper.get("abstract") or ""]
+    if text_dir and paper.get("paper_id"):
+        text = read_text(paper_file(text_dir, f"{paper['paper_id']}_text.txt"), MAX_TEXT_CHARS)
+        if text:
+            parts.append(text)
+    return " ".join(parts)
+
+
+def _text_flags(papers):
+    return np.array([1 if p.get("text_extracted") else 0 for p in papers], dtype=np.uint8)
+
+
+class LsaModel:
+    """Vocabulary, IDF weights and SVD term projection"""
+
+    def __init__(self, terms, idf, components):
+        self.terms = list(terms)
+        self.vocabulary = {term: i for i, term in enumerate(self.terms)}
+        self.idf = np.asarray(idf, dtype=np.float32)
+        self.components = np.asarray(components, dtype=np.float32)  # (n_terms, dims)
+
+    @classmethod
+    def fit(cls, documents, dimensions=DIMENSIONS, max_features=MAX_FEATURES, seed=0):
+        """Fit TF-IDF + randomized truncated SVD on an iterable of token lists"""
+        doc_freq = Counter()
+        token_docs = []
+        for tokens in documents:
+            token_docs.append(tokens)
+            doc_freq.update(set(tokens))
+        terms = [t for t, df in doc_freq.most_common(max_features) if df >= MIN_DOC_FREQ]
+        if not terms:
+            terms = [t for t, _ in doc_freq.most_common(max_features)]
+        n_docs = len(token_docs)
+        idf = np.array([math.log((1 + n_docs) / (1 + doc_freq[t])) + 1 for t in terms], dtype=np.float32)
+        model = cls(terms, idf, np.zeros((len(terms), 0), dtype=np.float32))
+        matrix = model.tfidf(token_docs)
+        model.components = _randomized_svd_components(matrix, min(dimensions, min(matrix.shape) - 1), seed)
+        return model
+
+    def tfidf(self, token_docs):
+        """L2-normalized sublinear TF-IDF rows as a CSR matrix"""
+        indptr, indices, data = [0], [], []
+        for tokens in token_docs:
+            counts = Counter(self.vocabulary[t] for t in tokens if t in self.vocabulary)
+            indices.extend(counts.keys())
+            data.extend(1.0 + math.log(c) for c in counts.values())
+            indptr.append(len(indices))
+        matrix = sparse.csr_matrix(
+            (np.array(data, dtype=np.float32), np.array(indices, dtype=np.int32), np.array(indptr)),
+            shape=(len(token_docs), len(self.terms))
+        )
+        matrix = matrix.multiply(self.idf).tocsr()
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sparse.diags(1 / norms).dot(matrix).tocsr().astype(np.float32)
+
+    def embed(self, token_docs):
+        """Project documents into the LSA space; rows are unit length"""
+        vectors = np.asarray(self.tfidf(token_docs) @ self.components, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return vectors / norms
+
+    def save(self, path):
+        np.savez(path, terms=np.array(self.terms, dtype=str), idf=self.idf, components=self.components)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data["terms"].tolist(), data["idf"], data["components"])
+
+
+def _randomized_svd_components(matrix, k, seed, oversample=10, power_iterations=3):
+    """Top-k right singular vectors of a sparse matrix (Halko et al. range finder)"""
+    if k <= 0:
+        return np.zeros((matrix.shape[1], 0), dtype=np.float32)
+    rng = np.random.RandomState(seed)
+    omega = rng.standard_normal((matrix.shape[1], k + oversample)).astype(np.float32)
+    q, _ = np.linalg.qr(matrix @ omega)
+    for _ in range(power_iterations):
+        q, _ = np.linalg.qr(matrix.T @ q)
+        q, _ = np.linalg.qr(matrix @ q)
+    b = np.asarray((matrix.T @ q).T)
+    _, _, vt = np.linalg.svd(b, full_matrices=False)
+    return vt[:k].T.astype(np.float32)
+
+
+class SemanticIndex:
+    """Memory-mapped document vectors with cosine top-k search
+
+    Layout of the index directory:
+        model.npz     vocabulary, IDF and SVD components
+        vectors.f32   row-major float32 matrix, one unit vector per paper
+        ids.txt       arXiv ID of each row
+        text.u8       one byte per row, 1 when the paper's extracted text was indexed
+        meta.json     row count, dimensions and fit size
+    """
+
+    def __init__(self, index_dir):
+        self.index_dir = index_dir
+        self.model = None
+        self.ids = []
+        self.row_of = {}
+        self.has_text = np.zeros(0, dtype=np.uint8)
+        self.meta = {}
+        self._vectors = None
+        if os.path.exists(self._path("meta.json")):
+            self._load()
+
+    def _path(self, name):
+        return os.path.join(self.index_dir, name)
+
+    def _load(self):
+        with open(self._path("meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.model = LsaModel.load(self._path("model.npz"))
+        with open(self._path("ids.txt"), "r", encoding="utf-8") as f:
+            self.ids = [line.strip() for line in f][:self.meta["rows"]]
+        self.row_of = {arxiv_id: i for i, arxiv_id in enumerate(self.ids)}
+        # Indexes written before text.u8 existed read as indexed without text
+        has_text = np.zeros(len(self.ids), dtype=np.uint8)
+        if os.path.exists(self._path("text.u8")):
+            flags = np.fromfile(self._path("text.u8"), dtype=np.uint8)[:len(self.ids)]
+            has_text[:len(flags)] = flags
+        self.has_text = has_text
+        self._vectors = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def vectors(self):
+        if self._vectors is None:
+            if not self.ids:
+                return np.zeros((0, self.meta.get("dimensions", 0)), dtype=np.float32)
+            self._vectors = np.memmap(self._path("vectors.f32"), dtype=np.float32, mode="r",
+                                      shape=(len(self.ids), self.meta["dimensions"]))
+        return self._vectors
+
+    def fit(self, papers, text_dir=None):
+        """Fit the basis on papers (dicts with arxiv_id/title/abstract/paper_id) and rewrite the index"""
+        papers = [p for p in papers if p.get("arxiv_id")]
+        token_docs = [tokenize(paper_document(p, text_dir)) for p in papers]
+        self.model = LsaModel.fit(token_docs)
+        os.makedirs(self.index_dir, exist_ok=True)
+        self.model.save(self._path("model.npz"))
+        vectors = self.model.embed(token_docs) if token_docs else np.zeros((0, 0), np.float32)
+        vectors.astype(np.float32).tofile(self._path("vectors.f32"))
+        with open(self._path("ids.txt"), "w", encoding="utf-8") as f:
+            f.writelines(f"{p['arxiv_id']}\n" for p in papers)
+        self._write_text_flags(_text_flags(papers))
+        self.meta = {"rows": len(papers), "dimensions": int(self.model.components.shape[1]),
+                     "fitted_rows": len(papers)}
+        self._write_meta()
+        self._load()
+        return len(papers)
+
+    def add(self, papers, text_dir=None):
+        """Fold new papers into the existing basis and append their vectors"""
+        papers = [p for p in papers if p.get("arxiv_id") and p["arxiv_id"] not in self.row_of]
+        if not papers or self.model is None:
+            return 0
+        vectors = self.model.embed([tokenize(paper_document(p, text_dir)) for p in papers])
+        # Append vectors before ids so a crash never leaves ids without rows
+        with open(self._path("vectors.f32"), "ab") as f:
+            f.write(vectors.astype(np.float32).tobytes())
+        with open(self._path("ids.txt"), "a", encoding="utf-8") as f:
+            f.writelines(f"{p['arxiv_id']}\n" for p in papers)
+        self._write_text_flags(np.concatenate([self.has_text, _text_flags(papers)]))
+        self.meta["rows"] = len(self.ids) + len(papers)
+        self._write_meta()
+        self._load()
+        return len(papers)
+
+    def refresh(self, papers, text_dir=None):
+        """Re-embed indexed papers whose text was extracted after they were indexed
+
+        Their rows are overwritten in place, so row order and ids.txt are
+        unchanged. Papers need a text_extracted field.
+        """
+        rows = [(self.row_of[p["arxiv_id"]], p) for p in papers
+                if p.get("text_extracted") and p.get("arxiv_id") in self.row_of
+                and not self.has_text[self.row_of[p["arxiv_id"]]]]
+        if not rows or self.model is None:
+            return 0
+        vectors = self.model.embed([tokenize(paper_document(p, text_dir)) for _, p in rows]).astype(np.float32)
+        self._vectors = None
+        row_bytes = self.meta["dimensions"] * vectors.itemsize
+        with open(self._path("vectors.f32"), "r+b") as f:
+            for (row, _), vector in zip(rows, vectors):
+                f.seek(row * row_bytes)
+                f.write(vector.tobytes())
+        has_text = self.has_text.copy()
+        has_text[[row for row, _ in rows]] = 1
+        self._write_text_flags(has_text)
+        self.has_text = has_text
+        return len(rows)
+
+    def _write_text_flags(self, flags):
+        tmp_path = self._path("text.u8.tmp")
+        np.asarray(flags, dtype=np.uint8).tofile(tmp_path)
+        os.replace(tmp_path, self._path("text.u8"))
+
+    def _write_meta(self):
+        tmp_path = self._path("meta.json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp_path, self._path("meta.json"))
+
+    def search_vector(self, query_vector, k=10, exclude=None):
+        """Top-k (arxiv_id, cosine) for a unit query vector"""
+        if not self.ids:
+            return []
+        scores = self.vectors @ query_vector
+        if exclude is not None:
+            scores[exclude] = -np.inf
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        # Papers sharing nothing with the query score 0 and are not matches
+        return [(self.ids[i], float(scores[i])) for i in top if np.isfinite(scores[i]) and scores[i] > 0]
+
+    def search(self, text, k=10):
+        """Papers most similar to a free-text query"""
+        if self.model is None:
+            return []
+        query_vector = self.model.embed([tokenize(text)])[0]
+        # No query term is in the vocabulary
+        if not query_vector.any():
+            return []
+        return self.search_vector(query_vector, k)
+
+    def similar_to(self, arxiv_id, k=10):
+        """Papers most similar to a paper already in the index"""
+        row = self.row_of.get(arxiv_id)
+        if row is None:
+            return []
+        return self.search_vector(np.array(self.vectors[row]), k, exclude=row)
+
+
+def update_library_index(output_dir, progress_callback=None):
+    """Bring a library's semantic index up to date with its catalog
+
+    Fits the basis on first use (or after the library has grown
+    REFIT_GROWTH times since the last fit), otherwise folds in the papers
+    that are missing and re-embeds those whose text was extracted after
+    they were indexed. Returns the number of papers (re)indexed.
+    """
+    index = SemanticIndex(os.path.join(output_dir, INDEX_DIRNAME))
+    text_dir = os.path.join(output_dir, "extracted_text")
+    columns = ["arxiv_id", "paper_id", "title", "abstract", "text_extracted"]
+    with LibraryCatalog.for_library(output_dir) as catalog:
+        total = catalog.count()
+        if total < MIN_FIT_DOCS:
+            return 0
+        fitted = index.meta.get("fitted_rows", 0)
+        if index.model is None or total >= fitted * REFIT_GROWTH:
+            if progress_callback:
+                progress_callback(f"Fitting semantic index on {total} papers")
+            return index.fit(catalog.iter_papers(columns), text_dir)
+
+        added, batch, stale = 0, [], []
+        for paper in catalog.iter_papers(columns):
+            row = index.row_of.get(paper["arxiv_id"])
+            if row is None:
+                batch.append(paper)
+            elif paper["text_extracted"] and not index.has_text[row]:
+                stale.append(paper)
+            if len(batch) >= 1000:
+                added += index.add(batch, text_dir)
+                batch = []
+            if len(stale) >= 1000:
+                added += index.refresh(stale, text_dir)
+                stale = []
+        added += index.add(batch, text_dir)
+        added += index.refresh(stale, text_dir)
+        return added
+
+
+def find_similar(output_dir, query, k=10):
+    """Resolve a query (arXiv ID/URL or free text) against a library; returns [(paper, score)]"""
+    index = SemanticIndex(os.path.join(output_dir, INDEX_DIRNAME))
+    arxiv_id, _ = parse_arxiv_id(query)
+    if arxiv_id and arxiv_id in index.row_of:
+        hits = index.similar_to(arxiv_id, k)
+    else:
+        hits = index.search(query, k)
+    with LibraryCatalog.for_library(output_dir) as catalog:
+        return [(catalog.get_paper(hit_id) or {"arxiv_id": hit_id}, score) for hit_id, score in hits]
@@ -41,8 +41,9 @@ setup(
     install_requires=requirements,
     extras_require={
         "ai": ["openai>=0.27.0"],
-        "analytics": ["matplotlib>=3.5.0", "seaborn>=0.11.0", "pandas>=1.3.0"],
+        "analytics": ["matplotlib>=3.5.0", "seaborn>=0.11.0", "pandas>=1.3.0", "scipy>=1.7.0", "pyarrow>=8.0.0"],
         "pdf": ["PyPDF2>=2.0.0"],
+        "compression": ["zstandard>=0.18.0"],
         "dev": ["pytest>=6.0", "black>=22.0", "flake8>=4.0"],
     },
     entry_points={
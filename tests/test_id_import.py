@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for reading arXiv ID lists (id_import.read_id_file)
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("arxiv")
+from id_import import read_id_file
+
+BIBTEX = """
+@inproceedings{smith2019grasp,
+  title = {Learning to Grasp},
+  booktitle = {ICRA},
+  pages = {1234--5678},
+  year = {2019},
+  doi = {10.1109/ICRA.2019.8793485},
+  note = {pages 1234.5678}
+}
+
+@article{lee2025tactile,
+  title = {Tactile Policies},
+  journal = {arXiv preprint arXiv:2506.19146},
+  doi = {10.48550/arXiv.2506.19146},
+  year = {2025}
+}
+
+@misc{chen2024,
+  title = {Dexterous Hands},
+  eprint = {2403.01234v2},
+  archivePrefix = {arXiv},
+  primaryClass = {cs.RO},
+  doi = {10.1016/j.robot.2023.104512},
+  url = {https://arxiv.org/abs/2403.01234v2}
+}
+
+@article{old2006,
+  title = {Classic},
+  eprint = {cs/0601001},
+  journal = {Robotica},
+  pages = {1201.1250}
+}
+"""
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_bibtex_reads_named_ids_and_skips_dois(tmp_path):
+    ids = read_id_file(write(tmp_path, "refs.bib", BIBTEX))
+    assert ids == ["2506.19146", "2403.01234v2", "cs/0601001"]
+
+
+def test_plain_list_and_urls(tmp_path):
+    text = "2506.19146v1\nhttps://arxiv.org/abs/2401.00001\narXiv:2312.12345\ncs.RO/0601001v3\n2506.19146v2\n"
+    ids = read_id_file(write(tmp_path, "ids.txt", text))
+    assert ids == ["2506.19146v1", "2401.00001", "2312.12345", "cs.RO/0601001v3"]
+
+
+def test_csv_skips_dois_invalid_months_and_longer_numbers(tmp_path):
+    text = ("id,doi,pages\n"
+            "2506.19146,10.1109/ICRA.2019.8793485,1234.5678\n"
+            "2401.00002v1,10.48550/arXiv.2401.00002,12345.67890\n"
+            "2413.00001,,2506.191467\n")
+    ids = read_id_file(write(tmp_path, "export.csv", text))
+    assert ids == ["2506.19146", "2401.00002v1"]
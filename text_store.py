@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Compressed Text Store for Robotics Paper Fetcher
+Extracted text, summaries and AI notes packed as compressed frames in one file with an offset index
+"""
+
+import os
+import lzma
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from library_catalog import CATALOG_FILENAME, LibraryCatalog
+from library_layout import index_file, library_root, unindex_file, walk_folder
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+PACK_FILENAME = "text_store.pack"
+LOCK_FILENAME = "text_store.pack.lock"
+# Library folders whose files the store holds; each file is one frame
+PACKED_DIRS = ("extracted_text", "summaries", "ai_analysis")
+PACKED_EXTENSIONS = (".txt", ".md")
+ZSTD_LEVEL = 10
+LZMA_PRESET = 6
+# Rewrite the pack once superseded frames take up this share of it
+COMPACT_GARBAGE_SHARE = 0.3
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def _compress(raw):
+    if ZSTD_AVAILABLE:
+        return "zstd", zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    return "xz", lzma.compress(raw, preset=LZMA_PRESET)
+
+
+def _decompress(codec, frame, limit=None):
+    """Decompressed bytes of a frame, stopping after limit bytes when given"""
+    if codec == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise ImportError("zstandard is required to read this text store: pip install zstandard")
+        if limit is None:
+            return zstandard.ZstdDecompressor().decompress(frame)
+        with zstandard.ZstdDecompressor().stream_reader(frame) as reader:
+            return reader.read(limit)
+    if codec == "xz":
+        return lzma.LZMADecompressor().decompress(frame, -1 if limit is None else limit)
+    raise ValueError(f"unknown text store codec: {codec}")
+
+
+class TextStore:
+    """Library text files, either plain on disk or packed into compressed frames
+
+    Every frame is compressed on its own, so one paper's text is read with a
+    single seek. The catalog's text_store table maps each file's path
+    (relative to the library) to its frame; paths without a frame are read
+    from disk, so a library can be packed gradually. Appends and compaction
+    hold an exclusive lock on text_store.pack.lock and reads a shared one,
+    so the GUI, the watcher and the CLI can share a pack.
+    """
+
+    def __init__(self, output_dir, catalog=None):
+        self.output_dir = output_dir
+        self.pack_path = os.path.join(output_dir, PACK_FILENAME)
+        self.lock_path = os.path.join(output_dir, LOCK_FILENAME)
+        self.catalog = catalog or LibraryCatalog(os.path.join(output_dir, CATALOG_FILENAME))
+        self.packed = self.catalog.get_meta("text_store") == "pack"
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _pack_lock(self, exclusive=True):
+        """Lock the pack against other threads and, where flock exists, other processes"""
+        with open(self.lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            if not exclusive:
+                yield
+                return
+            with self._lock:
+                yield
+
+    def key(self, path):
+        return os.path.relpath(os.path.abspath(path), os.path.abspath(self.output_dir)).replace(os.sep, "/")
+
+    def _frame(self, path):
+        if not self.packed:
+            return None
+        rows = self.catalog.query(
+            "SELECT frame_offset, frame_length, codec, size FROM text_store WHERE key = ?", (self.key(path),)
+        )
+        return rows[0] if rows else None
+
+    def exists(self, path):
+        return self._frame(path) is not None or os.path.exists(path)
+
+    def size(self, path):
+        """Uncompressed size in bytes, or None when the file is not stored"""
+        frame = self._frame(path)
+        if frame is not None:
+            return frame["size"]
+        try:
+            return os.stat(path).st_size
+        except OSError:
+            return None
+
+    def read(self, path, max_chars=None):
+        """Text of a stored file (at most max_chars characters), or None when it is not stored"""
+        frame = None
+        if self.packed:
+            # A compaction moves frames, so the offset is looked up and read under one lock
+            with self._pack_lock(exclusive=False):
+                frame = self._frame(path)
+                if frame is not None:
+                    with open(self.pack_path, "rb") as f:
+                        f.seek(frame["frame_offset"])
+                        data = f.read(frame["frame_length"])
+        if frame is None:
+            try:
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    return f.read(max_chars if max_chars is not None else -1)
+            except OSError:
+                return None
+        # A UTF-8 character is at most four bytes
+        limit = max_chars * 4 if max_chars is not None else None
+        text = _decompress(frame["codec"], data, limit).decode("utf-8", errors="replace")
+        return text[:max_chars] if max_chars is not None else text
+
+    def write(self, path, text):
+        """Store a file's text: appended to the pack when packing is enabled, otherwise on disk"""
+        # Read on every write: another process (main.py --pack-text, --unpack-text) may have switched modes
+        self.packed = self.catalog.get_meta("text_store") == "pack"
+        if not self.packed:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8", errors="replace") as f:
+                f.write(text)
+            index_file(self.catalog, self.output_dir, path)
+            return
+        raw = text.encode("utf-8", errors="replace")
+        codec, data = _compress(raw)
+        with self._pack_lock():
+            with open(self.pack_path, "ab") as f:
+                f.write(data)
+                # Where the frame actually landed: appends go to the end as it is at write time
+                offset = f.tell() - len(data)
+            # The index row is written after the frame, so a crash leaves only unreferenced bytes
+            self.catalog.execute(
+                "INSERT OR REPLACE INTO text_store (key, frame_offset, frame_length, codec, size, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.key(path), offset, len(data), codec, len(raw), datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            )
+        if os.path.exists(path):
+            # A stale plain copy would only waste space
+            os.remove(path)
+            unindex_file(self.catalog, self.output_dir, path)
+
+    def library_files(self):
+        """Plain text files in the packed folders"""
+        for dirname in PACKED_DIRS:
+            for entry in sorted(walk_folder(os.path.join(self.output_dir, dirname)), key=lambda e: e.name):
+                if entry.name.endswith(PACKED_EXTENSIONS):
+                    yield entry.path
+
+    def pack(self, progress_callback=None):
+        """Enable packing and move every plain text file into the pack; returns the number moved"""
+        self.catalog.set_meta("text_store", "pack")
+        self.packed = True
+        moved = 0
+        for path in list(self.library_files()):
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                self.write(path, f.read())
+            moved += 1
+            if progress_callback and moved % 500 == 0:
+                progress_callback(f"Packed {moved} text files")
+        return moved
+
+    def unpack(self, progress_callback=None):
+        """Write every packed file back to disk and disable packing; returns the number restored"""
+        keys = [row["key"] for row in self.catalog.query("SELECT key FROM text_store ORDER BY frame_offset")]
+        for done, key in enumerate(keys, start=1):
+            path = os.path.join(self.output_dir, *key.split("/"))
+            text = self.read(path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8", errors="replace") as f:
+                f.write(text)
+            index_file(self.catalog, self.output_dir, path)
+            if progress_callback and done % 500 == 0:
+                progress_callback(f"Restored {done}/{len(keys)} text files")
+        with self._pack_lock():
+            self.catalog.execute("DELETE FROM text_store")
+            self.catalog.set_meta("text_store", "plain")
+            self.packed = False
+            if os.path.exists(self.pack_path):
+                os.remove(self.pack_path)
+        return len(keys)
+
+    def garbage_share(self):
+        """Share of the pack taken by frames that were since rewritten"""
+        try:
+            total = os.path.getsize(self.pack_path)
+        except OSError:
+            return 0.0
+        live = self.catalog.query("SELECT COALESCE(SUM(frame_length), 0) FROM text_store")[0][0]
+        return (total - live) / total if total else 0.0
+
+    def compact(self, force=False):
+        """Rewrite the pack with live frames only; returns the bytes reclaimed"""
+        if not os.path.exists(self.pack_path) or (not force and self.garbage_share() < COMPACT_GARBAGE_SHARE):
+            return 0
+        with self._pack_lock():
+            before = os.path.getsize(self.pack_path)
+            rows = self.catalog.query(
+                "SELECT key, frame_offset, frame_length FROM text_store ORDER BY frame_offset"
+            )
+            temp_path = self.pack_path + ".tmp"
+            moves, offset = [], 0
+            with open(self.pack_path, "rb") as src, open(temp_path, "wb") as dst:
+                for row in rows:
+                    src.seek(row["frame_offset"])
+                    dst.write(src.read(row["frame_length"]))
+                    moves.append((offset, row["key"]))
+                    offset += row["frame_length"]
+                dst.flush()
+                os.fsync(dst.fileno())
+            with self.catalog._lock:
+                with self.catalog.conn:
+                    self.catalog.conn.executemany(
+                        "UPDATE text_store SET frame_offset = ? WHERE key = ?", moves
+                    )
+                    # Swapped before the offsets commit; a failed swap rolls them back
+                    os.replace(temp_path, self.pack_path)
+        return before - offset
+
+
+def open_store(output_dir):
+    """The text store of a library, shared by every caller in this process"""
+    # Keyed by process too: a forked worker must not reuse its parent's SQLite connection
+    key = (os.getpid(), os.path.abspath(output_dir))
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = TextStore(output_dir)
+        return _stores[key]
+
+
+def _store_for(path):
+    output_dir = library_root(path)
+    # Libraries without a catalog cannot have packed text
+    if not os.path.exists(os.path.join(output_dir, CATALOG_FILENAME)):
+        return None
+    return open_store(output_dir)
+
+
+def read_text(path, max_chars=None):
+    """Text of a library file, from the pack or from disk; None when it does not exist"""
+    store = _store_for(path)
+    if store is None:
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                return f.read(max_chars if max_chars is not None else -1)
+        except OSError:
+            return None
+    return store.read(path, max_chars)
+
+
+def write_text(path, text):
+    """Write a library text file, into the pack when the library has packing enabled"""
+    store = _store_for(path)
+    if store is None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8", errors="replace") as f:
+            f.write(text)
+        return
+    store.write(path, text)
+
+
+def text_exists(path):
+    store = _store_for(path)
+    return store.exists(path) if store else os.path.exists(path)
+
+
+def text_size(path):
+    """Uncompressed size in bytes of a library text file, or None"""
+    store = _store_for(path)
+    if store is not None:
+        return store.size(path)
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return None
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Topic Modeling for Robotics Paper Fetcher
+Online (minibatch) NMF on TF-IDF with per-paper topic weights stored in the library catalog
+"""
+
+import os
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+
+from library_catalog import LibraryCatalog
+from semantic_search import LsaModel, tokenize, paper_document
+
+MODEL_FILENAME = "topic_model.npz"
+N_TOPICS = 20
+MAX_FEATURES = 20000
+MIN_DOC_FREQ = 3
+MAX_DOC_SHARE = 0.5
+BATCH_SIZE = 2048
+FIT_PASSES = 3
+# Topic weights below this share of a paper are not stored
+MIN_TOPIC_SHARE = 0.05
+MAX_TOPICS_PER_PAPER = 3
+EPSILON = 1e-9
+
+
+class TopicModel:
+    """NMF topics (n_topics x n_terms) with online sufficient statistics
+
+    Follows the online dictionary-learning scheme: for each minibatch X the
+    document weights W are solved with the topics H fixed, then the
+    running statistics A = sum W^T X and B = sum W^T W drive a
+    multiplicative update of H. Refreshing with new papers therefore only
+    touches the new minibatches.
+    """
+
+    def __init__(self, terms, idf, components, stats_a=None, stats_b=None, n_seen=0):
+        self.vectorizer = LsaModel(terms, idf, np.zeros((len(terms), 0), dtype=np.float32))
+        self.components = np.asarray(components, dtype=np.float32)
+        n_topics = self.components.shape[0]
+        self.stats_a = np.zeros_like(self.components) if stats_a is None else np.asarray(stats_a, dtype=np.float32)
+        self.stats_b = np.zeros((n_topics, n_topics), np.float32) if stats_b is None else np.asarray(stats_b, dtype=np.float32)
+        self.n_seen = int(n_seen)
+
+    @property
+    def terms(self):
+        return self.vectorizer.terms
+
+    @property
+    def n_topics(self):
+        return self.components.shape[0]
+
+    @classmethod
+    def initialize(cls, token_docs, n_topics=N_TOPICS, seed=0):
+        """Choose the vocabulary from a corpus sample and draw random non-negative topics"""
+        doc_freq = Counter()
+        for tokens in token_docs:
+            doc_freq.update(set(tokens))
+        max_df = max(MIN_DOC_FREQ, int(MAX_DOC_SHARE * len(token_docs)))
+        terms = [t for t, df in doc_freq.most_common() if MIN_DOC_FREQ <= df <= max_df][:MAX_FEATURES]
+        n_docs = len(token_docs)
+        idf = np.array([np.log((1 + n_docs) / (1 + doc_freq[t])) + 1 for t in terms], dtype=np.float32)
+        rng = np.random.RandomState(seed)
+        components = rng.random_sample((n_topics, len(terms))).astype(np.float32) + 0.1
+        return cls(terms, idf, components)
+
+    def tfidf(self, token_docs):
+        return self.vectorizer.tfidf(token_docs)
+
+    def transform(self, matrix, iterations=30):
+        """Document-topic weights for a TF-IDF matrix with the topics held fixed"""
+        h = self.components
+        hht = h @ h.T
+        xht = np.asarray(matrix @ h.T)
+        w = np.full((matrix.shape[0], self.n_topics), 1.0 / self.n_topics, dtype=np.float32)
+        for _ in range(iterations):
+            w *= xht / (w @ hht + EPSILON)
+        return w
+
+    def partial_fit(self, matrix, inner_iterations=5):
+        """Update topics from one minibatch; returns the minibatch's document weights"""
+        w = self.transform(matrix)
+        self.stats_a += np.asarray((matrix.T @ w).T, dtype=np.float32)
+        self.stats_b += w.T @ w
+        for _ in range(inner_iterations):
+            self.components *= self.stats_a / (self.stats_b @ self.components + EPSILON)
+        self.n_seen += matrix.shape[0]
+        return w
+
+    def fit(self, token_docs, passes=FIT_PASSES, batch_size=BATCH_SIZE, progress_callback=None):
+        """Full fit: several passes of minibatch updates, statistics reset each pass"""
+        for epoch in range(passes):
+            self.stats_a[:] = 0
+            self.stats_b[:] = 0
+            self.n_seen = 0
+            for start in range(0, len(token_docs), batch_size):
+                self.partial_fit(self.tfidf(token_docs[start:start + batch_size]))
+            if progress_callback:
+                progress_callback(f"Topic pass {epoch + 1}/{passes} done")
+
+    def top_terms(self, topic, n=8):
+        order = np.argsort(-self.components[topic])[:n]
+        return [self.terms[i] for i in order]
+
+    def label(self, topic):
+        return " / ".join(self.top_terms(topic, 3))
+
+    def save(self, path):
+        np.savez(path, terms=np.array(self.terms, dtype=str), idf=self.vectorizer.idf,
+                 components=self.components, stats_a=self.stats_a, stats_b=self.stats_b,
+                 n_seen=np.array(self.n_seen))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data["terms"].tolist(), data["idf"], data["components"],
+                       data["stats_a"], data["stats_b"], int(data["n_seen"]))
+
+
+def _paper_topic_rows(arxiv_ids, weights):
+    shares = weights / (weights.sum(axis=1, keepdims=True) + EPSILON)
+    rows = []
+    for arxiv_id, share in zip(arxiv_ids, shares):
+        for topic in np.argsort(-share)[:MAX_TOPICS_PER_PAPER]:
+            if share[topic] >= MIN_TOPIC_SHARE:
+                rows.append((arxiv_id, int(topic), float(share[topic])))
+    return rows
+
+
+def _store_topics(catalog, model, arxiv_ids, weights, last_rowid, replace_all=False):
+    """Write topic weights and labels, and mark papers up to last_rowid as processed"""
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with catalog._lock:
+        with catalog.conn:
+            if replace_all:
+                catalog.conn.execute("DELETE FROM paper_topics")
+            else:
+                catalog.conn.executemany("DELETE FROM paper_topics WHERE arxiv_id = ?",
+                                         [(a,) for a in arxiv_ids])
+            catalog.conn.executemany(
+                "INSERT OR REPLACE INTO paper_topics (arxiv_id, topic, weight) VALUES (?, ?, ?)",
+                _paper_topic_rows(arxiv_ids, weights)
+            )
+            catalog.conn.executemany(
+                "INSERT OR REPLACE INTO topics (topic, label, top_terms, updated) VALUES (?, ?, ?, ?)",
+                [(t, model.label(t), ", ".join(model.top_terms(t)), now) for t in range(model.n_topics)]
+            )
+            # Papers with all-zero weights get no paper_topics rows, so progress is tracked by rowid
+            catalog.conn.execute(
+                "INSERT OR REPLACE INTO catalog_meta (key, value) VALUES ('topics_rowid', ?)", (str(last_rowid),)
+            )
+
+
+def refresh_topics(output_dir, n_topics=N_TOPICS, refit=False, progress_callback=None):
+    """Fit topics on first use (or when refit=True), otherwise refine them with new papers only
+
+    Returns the number of papers whose topic weights were written.
+    """
+    model_path = os.path.join(output_dir, MODEL_FILENAME)
+    text_dir = os.path.join(output_dir, "extracted_text")
+    columns = ["arxiv_id", "paper_id", "title", "abstract"]
+
+    with LibraryCatalog.for_library(output_dir) as catalog:
+        if refit or not os.path.exists(model_path):
+            # Read first: a paper added while fitting is then picked up by the next refresh
+            last_rowid = catalog.query("SELECT COALESCE(MAX(rowid), 0) FROM papers")[0][0]
+            papers = list(catalog.iter_papers(columns))
+            if len(papers) < n_topics:
+                return 0
+            if progress_callback:
+                progress_callback(f"Tokenizing {len(papers)} papers")
+            token_docs = [tokenize(paper_document(p, text_dir)) for p in papers]
+            model = TopicModel.initialize(token_docs, n_topics)
+            model.fit(token_docs, progress_callback=progress_callback)
+            # Final weights for every paper against the converged topics
+            arxiv_ids = [p["arxiv_id"] for p in papers]
+            weights = np.vstack([model.transform(model.tfidf(token_docs[i:i + BATCH_SIZE]))
+                                 for i in range(0, len(token_docs), BATCH_SIZE)])
+            model.save(model_path)
+            _store_topics(catalog, model, arxiv_ids, weights, last_rowid, replace_all=True)
+            return len(arxiv_ids)
+
+        model = TopicModel.load(model_path)
+        done = catalog.get_meta("topics_rowid")
+        if done is None:
+            # Models fitted before progress was recorded: papers without weights are the new ones
+            where, params = "NOT EXISTS (SELECT 1 FROM paper_topics pt WHERE pt.arxiv_id = p.arxiv_id)", ()
+        else:
+            where, params = "p.rowid > ?", (int(done),)
+        new_papers = [dict(row) for row in catalog.query(
+            f"SELECT p.rowid AS rowid, p.arxiv_id, p.paper_id, p.title, p.abstract FROM papers p "
+            f"WHERE {where} ORDER BY p.rowid", params
+        )]
+        updated = 0
+        for start in range(0, len(new_papers), BATCH_SIZE):
+            batch = new_papers[start:start + BATCH_SIZE]
+            weights = model.partial_fit(model.tfidf([tokenize(paper_document(p, text_dir)) for p in batch]))
+            _store_topics(catalog, model, [p["arxiv_id"] for p in batch], weights, batch[-1]["rowid"])
+            updated += len(batch)
+            if progress_callback:
+                progress_callback(f"Refined topics with {updated}/{len(new_papers)} new papers")
+        if updated:
+            model.save(model_path)
+        return updated
+
+
+def topic_labels(catalog):
+    return {row["topic"]: row["label"] for row in catalog.query("SELECT topic, label FROM topics")}
+
+
+def topics_over_time(catalog, period_chars=7):
+    """Topic share per period (YYYY-MM by default) as {period: {topic: share}}"""
+    rows = catalog.query(
+        f"SELECT substr(p.published, 1, {int(period_chars)}) AS period, pt.topic, SUM(pt.weight) AS weight "
+        "FROM paper_topics pt JOIN papers p ON p.arxiv_id = pt.arxiv_id "
+        "WHERE p.published IS NOT NULL GROUP BY period, pt.topic ORDER BY period"
+    )
+    timeline = {}
+    for row in rows:
+        timeline.setdefault(row["period"], {})[row["topic"]] = row["weight"]
+    for period, weights in timeline.items():
+        total = sum(weights.values()) or 1
+        timeline[period] = {topic: weight / total for topic, weight in weights.items()}
+    return timeline
+
+
+def rising_topics(timeline, labels, k=5):
+    """Topics whose share grew most between the first and second half of the timeline"""
+    periods = sorted(timeline)
+    if len(periods) < 2:
+        return []
+    half = len(periods) // 2
+    early, late = periods[:half], periods[half:]
+    changes = []
+    for topic, label in labels.items():
+        before = sum(timeline[p].get(topic, 0) for p in early) / len(early)
+        after = sum(timeline[p].get(topic, 0) for p in late) / len(late)
+        changes.append((after - before, label))
+    changes.sort(reverse=True)
+    return changes[:k]